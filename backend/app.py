@@ -3,6 +3,7 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from limits.storage import storage_from_string
 import os
 
 # Import configuration
@@ -10,12 +11,23 @@ from config import config
 
 # Import services
 from services.logger import setup_logger
-from services.database import init_db, check_db_connection
+from services.database import (
+    init_db, check_db_connection, get_pool_stats, get_replica_stats, reset_pools_after_fork
+)
+from services.query_stats import init_query_stats
 from services.email_service import init_mail, check_email_config
+from services.email_templates import init_templates
+from services.dashboard import init_dashboard
+from services.data_versions import init_data_versions
+from services.events import init_events
+from services.password_hashing import init_password_hashing, get_hashing_stats
 from services.admin_init import initialize_admin
 
 # Import utilities
+from utils.decorators import admin_required, jwt_required_custom
 from utils.error_handlers import register_error_handlers
+from utils.json_provider import ClaimsJSONProvider
+from commands import register_commands
 
 # Import blueprints
 from blueprints.auth import auth_bp
@@ -25,6 +37,7 @@ from blueprints.computers import computers_bp
 from blueprints.reports import reports_bp
 from blueprints.accessories import accessories_bp
 from blueprints.uploads import uploads_bp
+from blueprints.events import events_bp
 
 
 def create_app(config_name='development'):
@@ -39,6 +52,9 @@ def create_app(config_name='development'):
     """
     app = Flask(__name__)
     
+    # Fast JSON encoding (orjson when installed) with raw JSON passthrough
+    app.json = ClaimsJSONProvider(app)
+    
     # Load configuration
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
@@ -66,15 +82,28 @@ def create_app(config_name='development'):
     )
     logger.info('Rate limiting initialized')
     
-    # Initialize database
+    # Initialize database and query instrumentation
     init_db(app)
+    init_query_stats(app)
     
     # Initialize email service
     init_mail(app)
+    init_templates(app)
+    
+    # Initialize shared data versions (ETags), dashboard snapshot and change feed
+    init_data_versions(app)
+    init_dashboard(app)
+    init_events(app)
+    
+    # Initialize password hashing executor
+    init_password_hashing(app)
     
     # Register error handlers
     register_error_handlers(app)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(users_bp)
@@ -83,6 +112,7 @@ def create_app(config_name='development'):
     app.register_blueprint(reports_bp)
     app.register_blueprint(accessories_bp)
     app.register_blueprint(uploads_bp)
+    app.register_blueprint(events_bp)
     logger.info('All blueprints registered')
     
     # Health check endpoint for Docker/Kubernetes
@@ -91,6 +121,21 @@ def create_app(config_name='development'):
         """Simple health check endpoint for container orchestration."""
         return {'status': 'healthy', 'service': 'claims-backend'}, 200
     
+    # Internal statistics (replica error reasons included) are admin only
+    @app.route('/health/db')
+    @jwt_required_custom
+    @admin_required
+    def db_pool_health():
+        """Live database connection pool and read replica statistics."""
+        return {'status': 'healthy', 'pool': get_pool_stats(), 'replica': get_replica_stats()}, 200
+    
+    @app.route('/health/hashing')
+    @jwt_required_custom
+    @admin_required
+    def hashing_health():
+        """Password hashing executor statistics for this worker."""
+        return {'status': 'healthy', 'hashing': get_hashing_stats()}, 200
+    
     # Startup checks
     with app.app_context():
         # Check database connection
@@ -121,6 +166,30 @@ def create_app(config_name='development'):
     return app
 
 
+def init_worker(app):
+    """
+    Set up per-process resources again in a worker forked from a master
+    that preloaded the app (see gunicorn.conf.py).
+    
+    Everything else is fork-safe already: the dashboard refresher, change
+    feed, data version mappings and hashing pool start lazily per process,
+    and Flask-Mail opens a new SMTP connection for every send.
+    
+    Args:
+        app: Flask application instance created in the master
+    """
+    # Database pools: drop the master's (disposed) connections and locks
+    reset_pools_after_fork()
+    
+    # Rate limiter storage: its client connections and expiry timer
+    # belong to the master. Flask-Limiter has no public hook to rebuild it.
+    for limiter in app.extensions.get('limiter', ()):
+        limiter._storage = storage_from_string(
+            limiter._storage_uri or app.config['RATELIMIT_STORAGE_URL'], **limiter._storage_options
+        )
+        limiter._limiter = type(limiter._limiter)(limiter._storage)
+
+
 # For backward compatibility, create app instance
 # This allows running with: python app_new.py
 if __name__ == '__main__':
@@ -0,0 +1,335 @@
+"""
+ASGI Entry Point for CLAIMS Backend
+Async read path for the heavy inventory and dashboard endpoints.
+
+/get_data, /get_computers and /get_computer_statuses are served by
+coroutines on an aiomysql pool (services.async_database), so a slow MySQL
+read only suspends its own request instead of blocking a worker. /events
+is served by a coroutine too, so open dashboards cost no threads. Every
+other route is the Flask app from wsgi.py, mounted as WSGI and run in a
+thread pool, so config, JWT auth, CORS and error responses are shared.
+The async handlers first run the Flask app's before_request hooks for the
+route they replace, so Flask-Limiter's limits apply to them as well. The async handlers reuse the Flask endpoints' query builders,
+field sets, ETags and JSON provider, so their responses are the same.
+
+Run with uvicorn (one event loop per worker process):
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+or under gunicorn:
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker --workers 4
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import generate_etag, parse_etags, quote_etag
+from app import create_app
+from blueprints.computers import computers_query, part_statuses_query
+from services import async_database
+from services.dashboard import (
+    LAB_COUNTS_QUERY, PART_COUNTS_QUERY, TOTALS_QUERY, assemble_dashboard_data,
+    read_dashboard_snapshot, serialize_dashboard, start_refresher
+)
+from services.data_versions import compute_etag
+from services.events import RESYNC_EVENT, format_event, get_broadcaster
+from services.logger import get_logger
+from utils.decorators import jwt_required_custom
+from utils.fieldsets import FieldSetError
+from utils.pagination import ListQueryError
+from utils.responses import database_error_response, error_response
+
+logger = get_logger(__name__)
+
+# Create application instance
+# Environment can be set via FLASK_ENV environment variable
+config_name = os.getenv('FLASK_ENV', 'production')
+flask_app = create_app(config_name)
+
+
+def _args(request):
+    """Request args as the MultiDict the Flask query builders expect."""
+    return MultiDict(request.query_params.multi_items())
+
+
+def _flask_response(build):
+    """
+    Convert a response built with the Flask helpers (jsonify, utils.responses).
+
+    Args:
+        build: Callable returning (flask Response, status code)
+
+    Returns:
+        Response
+    """
+    with flask_app.app_context():
+        response, status = build()
+    return Response(response.get_data(), status_code=status, headers=dict(response.headers))
+
+
+def _flask_request(request):
+    """
+    Flask request context mirroring a Starlette request, for the Flask-side
+    checks (JWT auth) the async handlers share.
+    """
+    return flask_app.test_request_context(
+        request.url.path,
+        method=request.method,
+        query_string=request.scope['query_string'].decode('latin-1'),
+        headers=list(request.headers.items()),
+        environ_base={'REMOTE_ADDR': request.client.host if request.client else None}
+    )
+
+
+def _to_starlette(response):
+    """Convert a Flask response."""
+    return Response(response.get_data(), status_code=response.status_code, headers=dict(response.headers))
+
+
+def _flask_checks(request):
+    """
+    Run the Flask app's before_request hooks (rate limits) for the Flask
+    route an async handler stands in for.
+
+    Returns:
+        Response: The response a hook answered with (e.g. 429), or None
+    """
+    with _flask_request(request):
+        try:
+            rv = flask_app.preprocess_request()
+        except Exception as e:
+            rv = flask_app.handle_user_exception(e)
+        if rv is None:
+            return None
+        return _to_starlette(flask_app.make_response(rv))
+
+
+def _authenticate(request):
+    """
+    Verify the request's JWT as jwt_required_custom does.
+
+    Returns:
+        Response: The 401 response, or None if the token is valid
+    """
+    with _flask_request(request):
+        denied = jwt_required_custom(lambda: None)()
+        if denied is None:
+            return None
+        return _to_starlette(flask_app.make_response(denied))
+
+
+def _table_etag(request, tables):
+    """ETag of a table-versioned response, as utils.decorators.conditional_on."""
+    return compute_etag(tables, variant=request.scope['query_string'].decode('latin-1'))
+
+
+def _not_modified(request, etag):
+    return parse_etags(request.headers.get('if-none-match')).contains(etag)
+
+
+def _cache_headers(etag):
+    # Always revalidate, so clients never use a stale copy
+    return {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+
+
+async def _stream_json_array(batches, serialize):
+    """
+    Async counterpart of utils.responses.stream_json_array.
+
+    The first batch is fetched before returning, so errors in running the
+    query still produce a normal error response.
+
+    Args:
+        batches: Async iterator of row lists (async_database.stream_query)
+        serialize: Function turning a row into a JSON-serializable item
+
+    Returns:
+        StreamingResponse: application/json array
+    """
+    try:
+        first = await anext(batches, None)
+    except Exception:
+        await batches.aclose()
+        raise
+    dumps = flask_app.json.dumps
+
+    async def generate():
+        try:
+            yield '['
+            separator = ''
+            batch = first
+            while batch is not None:
+                items = [serialize(row) for row in batch]
+                if items:
+                    # Encode the batch as one array and drop its brackets
+                    yield separator + dumps(items)[1:-1]
+                    separator = ','
+                batch = await anext(batches, None)
+            yield ']\n'
+        except Exception as e:
+            logger.error(f'Streaming response aborted: {str(e)}')
+            raise
+        finally:
+            await batches.aclose()
+
+    return StreamingResponse(generate(), media_type=flask_app.json.mimetype)
+
+
+async def _stream_table_query(request, tables, build_query, label, message):
+    """
+    Serve a streamed, ETag-conditional read of a query built from the args.
+
+    Args:
+        request: Starlette request
+        tables: Tables the response depends on
+        build_query: Query builder shared with the Flask endpoint
+        label: Endpoint name for error logs
+        message: Error message for database errors
+    """
+    rejected = _flask_checks(request)
+    if rejected is not None:
+        return rejected
+
+    etag = _table_etag(request, tables)
+    if etag is not None and _not_modified(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+
+    try:
+        query, params, selection = build_query(_args(request))
+        response = await _stream_json_array(
+            async_database.stream_query(query, params), selection.serialize
+        )
+    except (FieldSetError, ListQueryError) as e:
+        return _flask_response(lambda: error_response(str(e), 400))
+    except Exception as e:
+        logger.error(f'{label} error: {str(e)}')
+        return _flask_response(lambda: database_error_response(e, message))
+
+    if etag is not None:
+        response.headers.update(_cache_headers(etag))
+    return response
+
+
+async def get_computers(request):
+    """Async /get_computers (see blueprints.computers.get_computers)."""
+    return await _stream_table_query(request, ('computers', 'laboratories'), computers_query,
+                                     'Get computers', "Failed to get computers")
+
+
+async def get_computer_statuses(request):
+    """Async /get_computer_statuses (see blueprints.computers.get_computer_statuses)."""
+    return await _stream_table_query(request, ('computer_parts',), part_statuses_query,
+                                     'Get computer statuses', "Failed to get computer statuses")
+
+
+async def get_data(request):
+    """
+    Async /get_data (see blueprints.reports.get_data).
+    Served from the shared snapshot when available; otherwise the dashboard
+    queries run on one async connection, in one snapshot transaction so the
+    totals and counts agree.
+    """
+    rejected = _flask_checks(request)
+    if rejected is not None:
+        return rejected
+
+    try:
+        payload = read_dashboard_snapshot()
+        if payload is None:
+            totals, part_counts, lab_counts = await async_database.fetch_consistent(
+                TOTALS_QUERY, PART_COUNTS_QUERY, LAB_COUNTS_QUERY
+            )
+            payload = serialize_dashboard(flask_app, assemble_dashboard_data(totals[0], part_counts, lab_counts))
+    except Exception as e:
+        logger.error(f'Get data error: {str(e)}')
+        return _flask_response(lambda: database_error_response(e, "Failed to get data"))
+
+    # The snapshot can lag behind table versions, so tag the content itself
+    etag = generate_etag(payload)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return Response(payload, media_type='application/json', headers=_cache_headers(etag))
+
+
+async def events(request):
+    """
+    Async /events (see blueprints.events.events).
+    Waits for events on the event loop, so open streams hold no threads and
+    are not limited by EVENTS_MAX_SUBSCRIBERS.
+    """
+    rejected = _flask_checks(request) or _authenticate(request)
+    if rejected is not None:
+        return rejected
+
+    broadcaster = get_broadcaster()
+    if broadcaster is None:
+        return _flask_response(lambda: error_response("Event stream unavailable", 503))
+
+    subscription = broadcaster.subscribe(loop=asyncio.get_running_loop())
+    heartbeat = flask_app.config['EVENTS_HEARTBEAT_INTERVAL']
+    logger.debug(f'Event stream opened ({broadcaster.subscriber_count} subscribers)')
+
+    def close():
+        if broadcaster.unsubscribe(subscription):
+            logger.debug('Event stream closed')
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    item = await subscription.get(heartbeat)
+                except asyncio.TimeoutError:
+                    # Keepalive comment; also detects closed connections
+                    yield ": keepalive\n\n"
+                    continue
+
+                if item is None:
+                    yield RESYNC_EVENT
+                    return
+
+                yield format_event(*item)
+        finally:
+            close()
+
+    # Runs after the response ends, including when the client left before
+    # the generator started
+    return StreamingResponse(stream(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    }, background=BackgroundTask(close))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await async_database.init_async_db(flask_app)
+    # Normally started by the first Flask request; async-only traffic needs it too
+    start_refresher(flask_app)
+    try:
+        yield
+    finally:
+        await async_database.close_async_db()
+
+
+# Preflight (OPTIONS) requests fall through to the Flask routes and Flask-CORS
+cors = [Middleware(
+    CORSMiddleware,
+    allow_origins=flask_app.config['CORS_ORIGINS'],
+    allow_credentials=True
+)]
+
+app = Starlette(
+    routes=[
+        Route('/get_data', get_data, methods=['GET'], middleware=cors),
+        Route('/get_computers', get_computers, methods=['GET'], middleware=cors),
+        Route('/get_computer_statuses', get_computer_statuses, methods=['GET'], middleware=cors),
+        Route('/events', events, methods=['GET'], middleware=cors),
+        Mount('/', app=WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])),
+    ],
+    lifespan=lifespan
+)
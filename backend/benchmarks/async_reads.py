@@ -0,0 +1,182 @@
+"""
+Sync versus async read path benchmark for CLAIMS backend.
+Throughput and p99 latency of slow reads as concurrent clients grow.
+
+Each client sends requests back to back (closed loop) for --duration
+seconds; the table shows requests/s, p50 and p99 per concurrency level.
+
+By default it runs against two built-in servers whose read endpoint waits
+--db-latency ms for a simulated MySQL query, then returns a small array:
+
+- sync:  WSGI app whose handlers block while waiting, with at most
+         --sync-capacity requests in flight (gunicorn sync workers, or
+         workers x threads for gthread)
+- async: Starlette app under uvicorn whose handlers await the wait, as
+         the asgi.py endpoints await aiomysql
+
+Use --sync-url/--async-url to load real deployments instead, e.g.
+gunicorn wsgi:app and uvicorn asgi:app against the same database.
+
+Run from the backend directory:
+    python -m benchmarks.async_reads --clients 8 32 128 --db-latency 50
+    python -m benchmarks.async_reads --sync-url http://localhost:5000 \\
+        --async-url http://localhost:5001 --path /get_computers
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from werkzeug.serving import WSGIRequestHandler, make_server
+from werkzeug.wrappers import Response
+
+ITEMS = json.dumps([{'id': i, 'name': f'PC-{i:03d}', 'lab_id': i % 5} for i in range(50)])
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_sync_server(latency, capacity):
+    """Blocking WSGI server admitting `capacity` requests at a time."""
+    slots = threading.BoundedSemaphore(capacity)
+
+    def app(environ, start_response):
+        with slots:
+            time.sleep(latency)
+            response = Response(ITEMS, mimetype='application/json')
+        return response(environ, start_response)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server.shutdown
+
+
+def start_async_server(latency):
+    """Starlette app under uvicorn, awaiting the simulated query."""
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import Response as AsyncResponse
+    from starlette.routing import Route
+
+    async def read(request):
+        await asyncio.sleep(latency)
+        return AsyncResponse(ITEMS, media_type='application/json')
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        Starlette(routes=[Route('/read', read)]),
+        host='127.0.0.1', port=port, log_level='warning', access_log=False, backlog=4096
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+        thread.join()
+    return f'http://127.0.0.1:{port}', stop
+
+
+def call(url, headers):
+    """Return (status, seconds) for one request."""
+    req = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, time.perf_counter() - started
+
+
+def run_load(url, clients, duration, headers):
+    """Closed-loop load; returns (requests/s, latencies of successes, errors)."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            status, seconds = call(url, headers)
+            with lock:
+                if status == 200:
+                    latencies.append(seconds)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--db-latency', type=float, default=50, help='simulated query time (ms)')
+    parser.add_argument('--sync-capacity', type=int, default=4,
+                        help='requests the built-in sync server handles at once')
+    parser.add_argument('--sync-url', help='base URL of a running sync (wsgi.py) deployment')
+    parser.add_argument('--async-url', help='base URL of a running async (asgi.py) deployment')
+    parser.add_argument('--path', default='/get_computers', help='endpoint to load with --*-url')
+    parser.add_argument('--token', help='Bearer token sent with every request')
+    args = parser.parse_args()
+
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    stops = []
+    if args.sync_url or args.async_url:
+        targets = [(label, url.rstrip('/') + args.path)
+                   for label, url in (('sync', args.sync_url), ('async', args.async_url)) if url]
+        print(f'{args.path}, {args.duration:g}s per level')
+    else:
+        latency = args.db_latency / 1000
+        sync_url, stop = start_sync_server(latency, args.sync_capacity)
+        stops.append(stop)
+        async_url, stop = start_async_server(latency)
+        stops.append(stop)
+        targets = [('sync', sync_url + '/read'), ('async', async_url + '/read')]
+        print(f'simulated {args.db_latency:g}ms query, sync capacity {args.sync_capacity}, '
+              f'{args.duration:g}s per level')
+
+    try:
+        print(f'{"variant":<7} {"clients":>7} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8} {"errors":>6}')
+        for clients in args.clients:
+            for label, url in targets:
+                rate, latencies, errors = run_load(url, clients, args.duration, headers)
+                print(f'{label:<7} {clients:>7} {rate:>8.1f} {percentile(latencies, 50) * 1000:>8.1f} '
+                      f'{percentile(latencies, 99) * 1000:>8.1f} {errors:>6}')
+    finally:
+        for stop in stops:
+            stop()
+
+
+if __name__ == '__main__':
+    main()
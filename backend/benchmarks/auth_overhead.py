@@ -0,0 +1,97 @@
+"""
+Auth decorator overhead benchmark for CLAIMS backend.
+Per-request cost of the JWT decorator stack on a protected endpoint.
+
+- legacy:    the previous decorators, each calling verify_jwt_in_request()
+             (and get_jwt()) again, so a stacked endpoint verifies 2x
+- principal: utils.decorators, verifying once per request and checking
+             roles against the cached principal's bitmask
+
+Each iteration builds a fresh request context with a signed token and
+calls the decorated view directly, so only auth work is measured.
+
+Run from the backend directory:
+    python -m benchmarks.auth_overhead --iterations 20000
+"""
+import argparse
+import time
+from functools import wraps
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt, verify_jwt_in_request
+from utils.decorators import jwt_required_custom, role_required
+
+
+def legacy_jwt_required(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            verify_jwt_in_request()
+            return fn(*args, **kwargs)
+        except Exception as e:
+            return {"error": str(e)}, 401
+    return wrapper
+
+
+def legacy_role_required(*allowed_roles):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                verify_jwt_in_request()
+                if get_jwt().get('role', '') not in allowed_roles:
+                    return {"message": "Access denied"}, 403
+                return fn(*args, **kwargs)
+            except Exception as e:
+                return {"error": str(e)}, 403
+        return wrapper
+    return decorator
+
+
+def view():
+    return 'ok'
+
+
+def timed(app, headers, fn, iterations):
+    """Average microseconds per request."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with app.test_request_context('/bench', headers=headers):
+            fn()
+    return (time.perf_counter() - started) * 1e6 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-of-sufficient-length'
+    JWTManager(app)
+    with app.app_context():
+        token = create_access_token(identity='bench-user', additional_claims={
+            'role': 'technician', 'name': 'Bench', 'email': 'bench@example.com', 'year': '2025'
+        })
+    headers = {'Authorization': f'Bearer {token}'}
+
+    variants = {
+        'baseline': view,
+        'legacy jwt': legacy_jwt_required(view),
+        'legacy jwt+role': legacy_jwt_required(legacy_role_required('admin', 'technician', 'itsd')(view)),
+        'principal jwt': jwt_required_custom(view),
+        'principal jwt+role': jwt_required_custom(role_required('admin', 'technician', 'itsd')(view)),
+    }
+
+    for fn in variants.values():
+        timed(app, headers, fn, 100)  # warm up
+
+    baseline = timed(app, headers, variants.pop('baseline'), args.iterations)
+    print(f'{args.iterations} requests; request context alone {baseline:.1f}us')
+    print(f'{"decorators":<20} {"total us":>9} {"auth us":>9}')
+    for label, fn in variants.items():
+        total = timed(app, headers, fn, args.iterations)
+        print(f'{label:<20} {total:>9.1f} {total - baseline:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+SMTP throughput benchmark for CLAIMS backend.
+Compares one-connection-per-message send_email with SMTPBatchSender.
+
+Runs against a built-in local SMTP sink by default; --connect-delay makes
+the sink stall on every new connection to approximate the TCP/TLS setup
+cost of a real server. Use --smtp host:port to target another sink
+(e.g. `python -m aiosmtpd -n -l localhost:8025`).
+
+Run from the backend directory:
+    python -m benchmarks.email_throughput --messages 200 --connect-delay 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from flask import Flask
+from flask_mail import Message
+from services.email_service import SMTPBatchSender, init_mail, mail
+
+
+class SMTPSink:
+    """
+    Minimal SMTP server that accepts and discards every message.
+
+    Args:
+        connect_delay: Seconds to wait before greeting each new connection
+    """
+
+    def __init__(self, connect_delay=0.0):
+        self.connect_delay = connect_delay
+        self.connections = 0
+        self.messages = 0
+        self.port = None
+        self._ready = threading.Event()
+
+    def start(self):
+        """Start serving on an ephemeral localhost port in a daemon thread."""
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        writer.write(b'220 sink ESMTP\r\n')
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line[:4].upper()
+            if command == b'EHLO':
+                writer.write(b'250-sink\r\n250 8BITMIME\r\n')
+            elif command == b'DATA':
+                writer.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                await writer.drain()
+                while (await reader.readline()) not in (b'.\r\n', b''):
+                    pass
+                self.messages += 1
+                writer.write(b'250 OK\r\n')
+            elif command == b'QUIT':
+                writer.write(b'221 Bye\r\n')
+                await writer.drain()
+                break
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                writer.write(b'250 OK\r\n')
+            await writer.drain()
+        writer.close()
+
+
+def make_messages(count):
+    return [
+        Message(subject=f'Benchmark {i}', recipients=[f'user{i}@example.com'], body='Lab report summary\n' * 20)
+        for i in range(count)
+    ]
+
+
+def report(label, latencies, elapsed, connections):
+    latencies_ms = sorted(t * 1000 for t in latencies)
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(
+        f'{label:<10} {len(latencies) / elapsed:>9.1f} msg/s   '
+        f'latency avg {statistics.mean(latencies_ms):6.2f}ms  p95 {p95:6.2f}ms  '
+        f'max {latencies_ms[-1]:6.2f}ms   connections {connections}'
+    )
+
+
+def bench_single(messages):
+    """One connection (and handshake) per message, as send_email does."""
+    latencies = []
+    started = time.perf_counter()
+    for msg in messages:
+        t0 = time.perf_counter()
+        mail.send(msg)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+def bench_batched(messages, max_per_connection, max_per_second):
+    """All messages over long-lived connections."""
+    latencies = []
+    started = time.perf_counter()
+    with SMTPBatchSender(max_per_connection=max_per_connection, max_per_second=max_per_second) as sender:
+        for msg in messages:
+            t0 = time.perf_counter()
+            sender.send(msg)
+            latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started, sender.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--connect-delay', type=float, default=0.0,
+                        help='seconds the built-in sink stalls per new connection')
+    parser.add_argument('--smtp', help='host:port of an external SMTP sink')
+    parser.add_argument('--max-per-connection', type=int, default=100)
+    parser.add_argument('--max-per-second', type=float, default=0)
+    args = parser.parse_args()
+
+    sink = None
+    if args.smtp:
+        host, port = args.smtp.rsplit(':', 1)
+    else:
+        sink = SMTPSink(args.connect_delay).start()
+        host, port = '127.0.0.1', sink.port
+
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER=host, MAIL_PORT=int(port), MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+        MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_DEFAULT_SENDER='bench@example.com'
+    )
+    init_mail(app)
+
+    with app.app_context():
+        print(f'{args.messages} messages to {host}:{port}')
+        latencies, elapsed = bench_single(make_messages(args.messages))
+        report('single', latencies, elapsed, args.messages)
+
+        latencies, elapsed, connections = bench_batched(
+            make_messages(args.messages), args.max_per_connection, args.max_per_second
+        )
+        report('batched', latencies, elapsed, connections)
+
+    if sink is not None:
+        print(f'sink received {sink.messages} messages over {sink.connections} connections')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+JSON encoding benchmark for CLAIMS backend.
+Build + encode cost of a large /get_computers response.
+
+- stdlib decode: Flask's default provider, specs/other_parts decoded with
+                 json.loads and re-encoded (the previous get_computers)
+- stdlib raw:    ClaimsJSONProvider without orjson, columns spliced as RawJSON
+- orjson decode: ClaimsJSONProvider, columns decoded and re-encoded
+- orjson raw:    ClaimsJSONProvider, columns spliced as RawJSON (current)
+
+Time is the average over --repeat runs; peak memory is measured with
+tracemalloc in a separate run.
+
+Run from the backend directory:
+    python -m benchmarks.json_encode --computers 10000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import ClaimsJSONProvider, raw_json
+import utils.json_provider as json_provider
+
+PARTS = ('cpu', 'gpu', 'ram', 'storage', 'motherboard', 'psu', 'monitor', 'keyboard', 'mouse')
+
+
+def make_rows(count):
+    """Rows as selected by get_computers: id, name, lab name, lab id, specs, other_parts."""
+    rows = []
+    for i in range(count):
+        specs = {part: {'name': f'{part.upper()} model {i % 97}', 'serial': f'SN{i:08d}{part[:2].upper()}'} for part in PARTS}
+        other = {'ups': {'name': 'APC Back-UPS 650', 'serial': f'UPS{i:07d}'}}
+        rows.append((f'{i:08x}-0000-4000-8000-000000000000', f'PC-{i:05d}', f'Lab {i % 25}', i % 25,
+                     json.dumps(specs), json.dumps(other)))
+    return rows
+
+
+def build(rows, wrap):
+    return [
+        {
+            "id": comp_id, "pc_name": name, "name": name, "lab_name": lab_name, "lab_id": lab_id,
+            "specs": wrap(specs), "other_parts": wrap(other_parts)
+        }
+        for comp_id, name, lab_name, lab_id, specs, other_parts in rows
+    ]
+
+
+def decode(value):
+    return json.loads(value) if value else {}
+
+
+def measure(app, provider, rows, wrap, use_orjson, repeat):
+    """Return (avg ms, response bytes, peak MiB) for building and encoding one response."""
+    app.json = provider
+    saved = json_provider.orjson
+    if not use_orjson:
+        json_provider.orjson = None
+    try:
+        with app.app_context():
+            def run():
+                return app.json.response(build(rows, wrap))
+
+            size = len(run().get_data())
+            started = time.perf_counter()
+            for _ in range(repeat):
+                run()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        json_provider.orjson = saved
+    return elapsed_ms, size, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--computers', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    rows = make_rows(args.computers)
+
+    variants = [
+        ('stdlib decode', DefaultJSONProvider(app), decode, False),
+        ('stdlib raw', ClaimsJSONProvider(app), raw_json, False),
+    ]
+    if json_provider.orjson is not None:
+        variants += [
+            ('orjson decode', ClaimsJSONProvider(app), decode, True),
+            ('orjson raw', ClaimsJSONProvider(app), raw_json, True),
+        ]
+    else:
+        print('orjson not installed; only stdlib variants run')
+
+    native = json_provider._FRAGMENT is not None
+    print(f'{args.computers} computers, {args.repeat} runs (RawJSON via {"orjson.Fragment" if native else "placeholders"})')
+    print(f'{"variant":<15} {"ms":>9} {"MiB out":>8} {"peak MiB":>9}')
+    for label, provider, wrap, use_orjson in variants:
+        elapsed_ms, size, peak = measure(app, provider, rows, wrap, use_orjson, args.repeat)
+        print(f'{label:<15} {elapsed_ms:>9.1f} {size / 2 ** 20:>8.2f} {peak:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
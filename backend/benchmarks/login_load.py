@@ -0,0 +1,180 @@
+"""
+Login storm load test for CLAIMS backend.
+Dashboard read latency while logins arrive at a fixed rate.
+
+Logins are fired open-loop (a new one every 60/rate seconds, whether or
+not earlier ones have finished) while --readers threads poll the dashboard
+in a closed loop. Reports p50/p99 for both, plus 503 rejections from the
+hashing executor's admission control.
+
+By default it runs against a built-in app that serves /login (a real
+pbkdf2 verification through services.password_hashing) and a cheap
+/get_data, once hashing inline and once through the process pool. Use
+--url to load a running backend instead (needs a real account):
+
+Run from the backend directory:
+    python -m benchmarks.login_load --rate 200 --duration 30
+    python -m benchmarks.login_load --url http://localhost:5000 --email a@b.c --password secret
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+from services.password_hashing import (
+    HashingExecutor, PasswordHashingBusyError, hash_password, verify_password
+)
+import services.password_hashing as password_hashing
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def call(url, body=None):
+    """Return (status, seconds) for one request."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, time.perf_counter() - started
+
+
+def create_bench_app(stored_hash):
+    """Minimal app with the login and dashboard hot paths."""
+    app = Flask(__name__)
+    payload = {'users': [{'id': i, 'name': f'User {i}'} for i in range(200)]}
+
+    @app.route('/login', methods=['POST'])
+    def login():
+        try:
+            valid = verify_password(stored_hash, request.json['data']['password'])
+        except PasswordHashingBusyError:
+            return jsonify({'msg': 'busy'}), 503, {'Retry-After': '2'}
+        return jsonify({'msg': 'ok' if valid else 'invalid'}), 200 if valid else 401
+
+    @app.route('/get_data')
+    def get_data():
+        return jsonify(payload)
+
+    return app
+
+
+def run_load(base_url, email, password, rate, duration, readers):
+    """
+    Drive logins and dashboard reads against base_url.
+
+    Returns:
+        dict: Latencies and status counts for 'login' and 'dashboard'
+    """
+    results = {'login': ([], {}), 'dashboard': ([], {})}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def record(kind, status, seconds):
+        latencies, statuses = results[kind]
+        with lock:
+            latencies.append(seconds)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def login():
+        record('login', *call(f'{base_url}/login', {'data': {'email': email, 'password': password}}))
+
+    def reader():
+        while not stop.is_set():
+            record('dashboard', *call(f'{base_url}/get_data'))
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+
+    interval = 60.0 / rate
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        started = time.monotonic()
+        next_at = started
+        while next_at - started < duration:
+            pool.submit(login)
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+        stop.set()
+
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def report(label, results):
+    print(label)
+    for kind, (latencies, statuses) in results.items():
+        ms = [t * 1000 for t in latencies]
+        counts = ' '.join(f'{status}:{count}' for status, count in sorted(statuses.items()))
+        print(
+            f'  {kind:<10} n={len(ms):<6} p50 {percentile(ms, 50):8.1f}ms  '
+            f'p99 {percentile(ms, 99):8.1f}ms  max {max(ms, default=0):8.1f}ms   [{counts}]'
+        )
+
+
+def run_builtin(args):
+    password_hashing._executor = HashingExecutor(workers=0)
+    stored_hash = hash_password('bench-password')
+
+    for label, workers in (('inline hashing', 0), (f'process pool ({args.workers} workers)', args.workers)):
+        executor = HashingExecutor(workers=workers, queue_size=args.queue_size, timeout=10)
+        password_hashing._executor = executor
+        if workers:
+            executor.run(len, '')  # start the pool before measuring
+
+        server = make_server('127.0.0.1', 0, create_bench_app(stored_hash), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            results = run_load(
+                f'http://127.0.0.1:{server.server_port}', 'bench@example.com', 'bench-password',
+                args.rate, args.duration, args.readers
+            )
+        finally:
+            server.shutdown()
+            executor.shutdown()
+
+        report(label, results)
+        stats = executor.stats()
+        print(f'  hashing    avg {stats["latency_ms"]["avg"]:.1f}ms  max {stats["latency_ms"]["max"]:.1f}ms  '
+              f'rejected {stats["rejected"]}  timeouts {stats["timeouts"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rate', type=float, default=200, help='logins per minute')
+    parser.add_argument('--duration', type=float, default=30, help='seconds')
+    parser.add_argument('--readers', type=int, default=4, help='concurrent dashboard pollers')
+    parser.add_argument('--workers', type=int, default=2, help='hashing processes (built-in app)')
+    parser.add_argument('--queue-size', type=int, default=8, help='hashing queue size (built-in app)')
+    parser.add_argument('--url', help='base URL of a running backend')
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+
+    print(f'{args.rate:g} logins/min for {args.duration:g}s, {args.readers} dashboard readers')
+    if args.url:
+        report(args.url, run_load(args.url.rstrip('/'), args.email, args.password,
+                                  args.rate, args.duration, args.readers))
+    else:
+        run_builtin(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Streaming response memory benchmark for CLAIMS backend.
+Peak memory of a /get_computers response, buffered versus streamed.
+
+- buffered: fetchall() rows -> list of dicts -> one encoded body (the
+            previous get_computers: three copies of the fleet)
+- streamed: fetchmany() batches -> stream_json_array, consumed chunk by
+            chunk as the WSGI server would
+
+Rows come from a synthetic unbuffered cursor that generates them on
+demand, so the numbers isolate the application's own memory use.
+Peak memory is measured with tracemalloc.
+
+Run from the backend directory:
+    python -m benchmarks.stream_memory --computers 10000 50000 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from flask import Flask
+from werkzeug.datastructures import MultiDict
+from utils.fieldsets import Field, FieldSet
+from utils.json_provider import ClaimsJSONProvider, raw_json
+from utils.responses import stream_json_array
+
+FIELDS = FieldSet({
+    'id': Field(['c.id']),
+    'pc_name': Field(['c.name']),
+    'name': Field(['c.name']),
+    'lab_name': Field(['l.name']),
+    'lab_id': Field(['c.lab_id']),
+    'specs': Field(['c.specs'], raw_json),
+    'other_parts': Field(['c.other_parts'], raw_json),
+})
+SELECTION = FIELDS.select(MultiDict())
+
+SPECS = json.dumps({part: {'name': f'{part.upper()} model 42', 'serial': f'SN0000{part[:2].upper()}'}
+                    for part in ('cpu', 'gpu', 'ram', 'storage', 'motherboard', 'psu', 'monitor')})
+
+
+class SyntheticCursor:
+    """Unbuffered cursor stand-in producing `count` computer rows on demand."""
+
+    def __init__(self, count):
+        self.count = count
+        self.position = 0
+
+    def _row(self, i):
+        return (f'{i:08x}-0000-4000-8000-000000000000', f'PC-{i:06d}', f'Lab {i % 25}', i % 25, SPECS, None)
+
+    def fetchmany(self, size):
+        end = min(self.count, self.position + size)
+        rows = [self._row(i) for i in range(self.position, end)]
+        self.position = end
+        return rows
+
+    def fetchall(self):
+        return self.fetchmany(self.count - self.position)
+
+
+def batches(cursor, size):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+def buffered(app, count, batch_size):
+    rows = SyntheticCursor(count).fetchall()
+    response = app.json.response([SELECTION.serialize(row) for row in rows])
+    return len(response.get_data())
+
+
+def streamed(app, count, batch_size):
+    with app.test_request_context('/get_computers'):
+        response = stream_json_array(batches(SyntheticCursor(count), batch_size), SELECTION.serialize)
+        size = 0
+        for chunk in response.response:
+            size += len(chunk)
+        response.close()
+    return size
+
+
+def measure(fn, app, count, batch_size):
+    with app.app_context():
+        started = time.perf_counter()
+        size = fn(app, count, batch_size)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        fn(app, count, batch_size)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed * 1000, size, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--computers', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.json = ClaimsJSONProvider(app)
+
+    print(f'{"computers":>9} {"variant":<9} {"ms":>8} {"MiB out":>8} {"peak MiB":>9}')
+    for count in args.computers:
+        for label, fn in (('buffered', buffered), ('streamed', streamed)):
+            elapsed_ms, size, peak = measure(fn, app, count, args.batch_size)
+            print(f'{count:>9} {label:<9} {elapsed_ms:>8.1f} {size / 2 ** 20:>8.2f} {peak:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
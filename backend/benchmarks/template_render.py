@@ -0,0 +1,87 @@
+"""
+Email template rendering benchmark for CLAIMS backend.
+Per-render cost of the old per-call Environment versus the shared,
+cached environment in services.email_templates.
+
+- per-call: new Environment + loader on every render (the old send_email)
+- cached:   shared environment, template compiled once
+- batch:    render_email_batch over all contexts
+- cold:     new process-like environment whose bytecode comes from the
+            FileSystemBytecodeCache instead of being compiled
+
+Run from the backend directory:
+    python -m benchmarks.template_render --rows 1 100 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+from jinja2 import Environment, FileSystemLoader
+from services.email_templates import DEFAULT_TEMPLATE_DIR, create_environment, render_email_batch
+import services.email_templates as email_templates
+
+
+def make_context(rows):
+    return {
+        'title': 'Weekly summary',
+        'name': 'Benchmark User',
+        'position': 'admin',
+        'generated_at': '2025-01-01 00:00:00',
+        'summary': [
+            {'pc': f'PC-{i}', 'lab': f'Lab {i % 12}', 'status': 'damaged', 'notes': 'Cracked screen, needs replacement'}
+            for i in range(rows)
+        ]
+    }
+
+
+def timed(fn, iterations):
+    """Average milliseconds per call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 100, 5000])
+    parser.add_argument('--template', default='report.html')
+    parser.add_argument('--batch', type=int, default=20, help='contexts per batch render')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='claims-jinja-')
+    email_templates._env = create_environment(cache_dir=cache_dir)
+    shared = email_templates.get_environment()
+
+    print(f'{"rows":>6} {"per-call":>10} {"cached":>10} {"batch/msg":>10} {"cold+cache":>11} {"cold":>8}  (ms; cold columns = load only)')
+    for rows in args.rows:
+        context = make_context(rows)
+        iterations = max(3, min(500, 20000 // (rows + 10)))
+
+        def per_call():
+            # The original send_email code path
+            env = Environment(loader=FileSystemLoader(DEFAULT_TEMPLATE_DIR))
+            env.get_template(args.template).render(context)
+
+        def cached():
+            shared.get_template(args.template).render(context)
+
+        def cold_with_bytecode_cache():
+            create_environment(cache_dir=cache_dir).get_template(args.template)
+
+        def cold():
+            create_environment().get_template(args.template)
+
+        contexts = [context] * args.batch
+        batch = timed(lambda: render_email_batch(args.template, contexts), max(1, iterations // args.batch)) / args.batch
+
+        print(
+            f'{rows:>6} {timed(per_call, iterations):>10.3f} {timed(cached, iterations):>10.3f} '
+            f'{batch:>10.3f} {timed(cold_with_bytecode_cache, 50):>11.3f} {timed(cold, 50):>8.3f}'
+        )
+
+    print(f'bytecode cache: {cache_dir} ({len(os.listdir(cache_dir))} files)')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,40 +3,66 @@ Accessories blueprint for CLAIMS backend.
 Handles laboratory accessories management.
 """
 from flask import Blueprint, request, jsonify
+from services.data_versions import bump_versions
 from services.database import execute_query
 from services.logger import get_logger
 from utils.responses import success_response, error_response, database_error_response
-from utils.decorators import jwt_required_custom, role_required, admin_required
+from utils.decorators import jwt_required_custom, role_required, admin_required, conditional_on
+from utils.fieldsets import Field, FieldSet, FieldSetError
+from utils.pagination import Filter, ListQuery, ListQueryError, int_value, list_response
 
 logger = get_logger(__name__)
 
 accessories_bp = Blueprint('accessories', __name__, url_prefix='')
 
+ACCESSORY_FIELDS = FieldSet({
+    'id': Field(['id']),
+    'name': Field(['name']),
+    'quantity': Field(['quantity']),
+    'lab_id': Field(['lab_id']),
+    'lab_name': Field(['lab_name']),
+    'notes': Field(['notes']),
+})
+
+ACCESSORY_LIST = ListQuery(
+    columns=['id', 'name', 'quantity', 'lab_id', 'lab_name', 'notes'],
+    from_clause='accessories',
+    id_column='id',
+    sort_keys={'id': 'id', 'name': 'name'},
+    default_sort='id',
+    filters={'lab_id': Filter('lab_id', 'eq', int_value)}
+)
+
 
 @accessories_bp.route('/get_accessories', methods=["GET"])
+@conditional_on('accessories')
 def get_accessories():
     """
-    Get all laboratory accessories.
+    Get laboratory accessories.
+    
+    Query params (all optional):
+        lab_id: Filter by laboratory (repeat or comma-separate)
+        fields: Comma-separated response fields (default: all)
+        sort: id (default) or name, prefixed with - for descending
+        limit: Page size (default 50, at most 500)
+        cursor: next_cursor of the previous page
+    
+    Returns:
+        {"items": [...], "next_cursor": ...}; next_cursor is null on the
+        last page
     """
     try:
-        query = "SELECT * FROM accessories"
-        accessories = execute_query(query, fetch_all=True, commit=False)
-        
-        final_data = []
-        for accessory in accessories:
-            # Assuming structure: id, name, quantity, lab_id, lab_name, notes
-            acc_dict = {
-                "id": accessory[0] if len(accessory) > 0 else None,
-                "name": accessory[1] if len(accessory) > 1 else None,
-                "quantity": accessory[2] if len(accessory) > 2 else None,
-                "lab_id": accessory[3] if len(accessory) > 3 else None,
-                "lab_name": accessory[4] if len(accessory) > 4 else None,
-                "notes": accessory[5] if len(accessory) > 5 else None
-            }
-            final_data.append(acc_dict)
-        
-        return jsonify(final_data), 200
+        selection = ACCESSORY_FIELDS.select(request.args)
+        accessories, next_cursor = ACCESSORY_LIST.fetch(
+            request.args, columns=selection.columns
+        )
+        
+        final_data = [selection.serialize(accessory) for accessory in accessories]
+        
+        return list_response(final_data, next_cursor)
         
+    except (ListQueryError, FieldSetError) as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get accessories error: {str(e)}')
         return database_error_response(e, "Failed to get accessories")
@@ -65,6 +91,7 @@ def add_accessories():
         """
         execute_query(query, (name, quantity, lab_id, lab_name, notes))
         
+        bump_versions('accessories')
         logger.info(f'Accessory added: {name} (Qty: {quantity}) to lab {lab_name}')
         
         return jsonify({"success": True, "message": "Accessory added successfully"}), 200
@@ -96,6 +123,7 @@ def update_accessory(accessory_id):
         """
         execute_query(query, (name, quantity, notes, accessory_id))
         
+        bump_versions('accessories')
         logger.info(f'Accessory updated: {accessory_id}')
         
         return jsonify({"success": True, "message": "Accessory updated successfully"}), 200
@@ -117,6 +145,7 @@ def delete_accessory(accessory_id):
         query = "DELETE FROM accessories WHERE id = %s"
         execute_query(query, (accessory_id,))
         
+        bump_versions('accessories')
         logger.info(f'Accessory deleted: {accessory_id}')
         
         return jsonify({"success": True, "message": "Accessory deleted successfully"}), 200
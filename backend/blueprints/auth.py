@@ -2,12 +2,12 @@
 Authentication blueprint for CLAIMS backend.
 Handles login, logout, session management with JWT.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import check_password_hash, generate_password_hash
-from services.database import execute_query
+from services.database import execute_query, primary_reads
 from services.logger import get_logger
-from utils.responses import success_response, error_response, unauthorized_response
+from services.password_hashing import verify_password, PasswordHashingBusyError
+from utils.responses import success_response, error_response, unauthorized_response, busy_response
 from utils.validators import validate_request_data, LoginSchema
 
 logger = get_logger(__name__)
@@ -33,6 +33,7 @@ def login():
         200: Login successful with JWT token and user data
         401: Invalid credentials
         404: User not found
+        503: Password hashing saturated, retry after Retry-After seconds
     """
     try:
         # Get request data
@@ -48,8 +49,10 @@ def login():
             return error_response("Email and password are required", 400)
         
         # Query user from database
+        # Always against the primary: a changed password must not keep working on a lagging replica
         query = "SELECT id, name, email, role, year, password_hash FROM users WHERE email = %s"
-        user = execute_query(query, (email,), fetch_one=True, commit=False)
+        with primary_reads():
+            user = execute_query(query, (email,), fetch_one=True, commit=False)
         
         if not user:
             logger.warning(f'Login attempt for non-existent user: {email}')
@@ -58,7 +61,7 @@ def login():
         user_id, name, email, role, year, stored_password = user
         
         # Check password
-        password_valid = check_password_hash(stored_password, password)
+        password_valid = verify_password(stored_password, password)
         
         if not password_valid:
             logger.warning(f'Invalid password attempt for user: {email}')
@@ -91,6 +94,8 @@ def login():
             }
         }), 200
         
+    except PasswordHashingBusyError as e:
+        return busy_response(e, current_app.config['PASSWORD_HASH_RETRY_AFTER'])
     except Exception as e:
         logger.error(f'Login error: {str(e)}')
         return jsonify({"msg": str(e)}), 500
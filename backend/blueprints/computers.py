@@ -6,15 +6,135 @@ from flask import Blueprint, request, jsonify
 import json
 import random
 import uuid
-from services.database import execute_query, get_db_cursor
+from services.dashboard import track_dashboard_changes
+from services.data_versions import bump_versions
+from services.database import execute_query, get_db_cursor, stream_query
+from services.events import publish_event
+from services.inventory import (
+    COMPUTER_COLUMNS, PART_COLUMNS, STATUS_MAP, adjust_lab_counts, apply_status_changes,
+    build_part_rows, import_computers, insert_rows, normalize_other_parts
+)
 from services.logger import get_logger
-from utils.responses import success_response, error_response, database_error_response
-from utils.decorators import jwt_required_custom, role_required, admin_required
+from services.open_issues import refresh_open_issues
+from utils.responses import success_response, error_response, database_error_response, stream_json_array
+from utils.decorators import jwt_required_custom, role_required, admin_required, conditional_on
+from utils.fieldsets import Field, FieldSet, FieldSetError
+from utils.json_provider import raw_json
+from utils.pagination import ListQueryError
+from utils.validators import parse_list_param
 from flask_jwt_extended import get_jwt
 
 logger = get_logger(__name__)
 
 computers_bp = Blueprint('computers', __name__, url_prefix='')
+track_dashboard_changes(computers_bp)
+
+# computer_parts.status -> frontend status code
+STATUS_CODES = {label: code for code, label in STATUS_MAP.items()}
+
+COMPUTER_FIELDS = FieldSet({
+    'id': Field(['c.id']),
+    'pc_name': Field(['c.name']),  # Keep for frontend compatibility
+    'name': Field(['c.name']),
+    'lab_name': Field(['l.name']),
+    'lab_id': Field(['c.lab_id']),
+    # json_valid() checked columns, spliced into the response without decoding
+    'specs': Field(['c.specs'], raw_json),
+    'other_parts': Field(['c.other_parts'], raw_json),
+})
+
+PART_STATUS_FIELDS = FieldSet({
+    'id': Field(['p.id']),
+    'com_id': Field(['p.computer_id']),
+    'computer_id': Field(['p.computer_id']),
+    # Category as part key for standard parts, name for custom/other
+    'part': Field(['p.category', 'p.name'], lambda category, name: category if category and category != 'other' else name),
+    'name': Field(['p.name']),
+    'serial_number': Field(['p.serial_number']),
+    'category': Field(['p.category']),
+    'type': Field(['p.type']),
+    'status': Field(['p.status'], lambda label: STATUS_CODES.get(label, 4)),
+    'status_label': Field(['p.status']),
+    'notes': Field(['p.notes']),
+})
+
+
+def computers_query(args):
+    """
+    Build the /get_computers query for the request args.
+    Shared with the async read path (asgi.py).
+    
+    Args:
+        args: Request args
+        
+    Returns:
+        tuple: (query, params, Selection)
+        
+    Raises:
+        FieldSetError: If ?fields names an unknown field
+    """
+    selection = COMPUTER_FIELDS.select(args)
+    
+    query = f"SELECT {', '.join(selection.columns)} FROM computers c"
+    if selection.uses('l.'):
+        query += " LEFT JOIN laboratories l ON c.lab_id = l.id"
+    
+    return query, (), selection
+
+
+def part_statuses_query(args):
+    """
+    Build the /get_computer_statuses query for the request args.
+    Shared with the async read path (asgi.py).
+    
+    Args:
+        args: Request args
+        
+    Returns:
+        tuple: (query, params, Selection)
+        
+    Raises:
+        FieldSetError: If ?fields names an unknown field
+        ListQueryError: If a lab_id or status filter is invalid
+    """
+    selection = PART_STATUS_FIELDS.select(args)
+
+    lab_ids = parse_list_param(args, 'lab_id')
+    computer_ids = parse_list_param(args, 'computer_id')
+    statuses_filter = parse_list_param(args, 'status')
+    
+    if not all(lab_id.isdigit() for lab_id in lab_ids):
+        raise ListQueryError("lab_id must be an integer")
+    
+    status_values = []
+    for value in statuses_filter:
+        status_enum = STATUS_MAP.get(int(value)) if value.isdigit() else value
+        if status_enum not in STATUS_CODES:
+            raise ListQueryError(f"Invalid status: {value}")
+        status_values.append(status_enum)
+    
+    query = f"SELECT {', '.join(selection.columns)} FROM computer_parts p"
+    conditions = []
+    params = []
+    
+    if lab_ids:
+        # Resolved through the computers.lab_id index, then computer_parts(computer_id, status)
+        query += " JOIN computers c ON c.id = p.computer_id"
+        conditions.append(f"c.lab_id IN ({', '.join(['%s'] * len(lab_ids))})")
+        params.extend(int(lab_id) for lab_id in lab_ids)
+    
+    if computer_ids:
+        conditions.append(f"p.computer_id IN ({', '.join(['%s'] * len(computer_ids))})")
+        params.extend(computer_ids)
+    
+    if status_values:
+        conditions.append(f"p.status IN ({', '.join(['%s'] * len(status_values))})")
+        params.extend(status_values)
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    
+    return query, tuple(params), selection
 
 
 @computers_bp.route('/computer', methods=['POST'])
@@ -31,18 +151,7 @@ def add_computer():
         name = data.get('pc_name') # Frontend sends pc_name
         lab_id = data.get('lab_id')
         specs = data.get('specs', {})
-        other_parts = data.get('other_parts', [])
-        
-        # Parse other_parts if it's a JSON string
-        if isinstance(other_parts, str):
-            try:
-                other_parts = json.loads(other_parts)
-            except json.JSONDecodeError:
-                other_parts = []
-        
-        # Ensure other_parts is a list
-        if not isinstance(other_parts, list):
-            other_parts = []
+        other_parts = normalize_other_parts(data.get('other_parts', []))
         
         # Generate unique ID for computer
         computer_id = str(uuid.uuid4())
@@ -51,37 +160,21 @@ def add_computer():
         specs_json = json.dumps(specs) if isinstance(specs, dict) else specs
         other_parts_json = json.dumps(other_parts)
         
-        # Insert computer equipment
-        query = """
-            INSERT INTO computers (id, name, lab_id, specs, other_parts) 
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        execute_query(query, (computer_id, name, lab_id, specs_json, other_parts_json))
-        
-        # Initialize computer status for each part (Unified table)
-        if isinstance(specs, dict):
-            for category, details in specs.items():
-                # details is expected to be { "name": "...", "serial": "..." }
-                part_name = details.get('name', '')
-                serial_number = details.get('serial', '')
-                
-                status_query = """
-                    INSERT INTO computer_parts (computer_id, name, serial_number, category, type, status, notes) 
-                    VALUES (%s, %s, %s, %s, 'standard', 'operational', '')
-                """
-                execute_query(status_query, (computer_id, part_name, serial_number, category))
-        
-        # Insert other parts status for each item in the list
-        for item in other_parts:
-            if isinstance(item, dict) and 'name' in item:
-                part_name = item['name']
-                serial_number = item.get('serial', '')
-                other_query = """
-                    INSERT INTO computer_parts (computer_id, name, serial_number, category, type, status, notes) 
-                    VALUES (%s, %s, %s, 'other', 'custom', 'operational', '')
-                """
-                execute_query(other_query, (computer_id, part_name, serial_number))
+        with get_db_cursor() as cursor:
+            # Lock the laboratory row before the inserts (see adjust_lab_counts)
+            adjust_lab_counts(cursor, {lab_id: 1})
+            
+            # Insert computer equipment
+            insert_rows(cursor, 'computers', COMPUTER_COLUMNS,
+                        [(computer_id, name, lab_id, specs_json, other_parts_json)])
+            
+            # Initialize part rows (Unified table) in one statement
+            insert_rows(cursor, 'computer_parts', PART_COLUMNS,
+                        build_part_rows(computer_id, specs, other_parts))
         
+        bump_versions('computers', 'laboratories', 'computer_parts')
+        publish_event('computer.added', computer_id=computer_id, name=name, lab_id=lab_id)
+        publish_event('lab.count_changed', lab_id=lab_id, delta=1)
         logger.info(f'Computer added: {name} (ID: {computer_id}) in lab_id {lab_id}')
         
         return jsonify({
@@ -105,85 +198,36 @@ def computer_bulk():
     """
     try:
         data = request.json.get('data')
-        inserted_computers = []
-        skipped = []
-        
-        for computer in data:
-            name = computer.get('pc_name')
-            lab_id = computer.get('lab_id')
-            specs = computer.get('specs', {})
-            other_parts = computer.get('other_parts', [])
-            
-            # Parse other_parts if it's a JSON string
-            if isinstance(other_parts, str):
-                try:
-                    other_parts = json.loads(other_parts)
-                except json.JSONDecodeError:
-                    other_parts = []
-            
-            # Ensure other_parts is a list
-            if not isinstance(other_parts, list):
-                other_parts = []
-            
-            # Check if computer already exists
-            check_query = "SELECT id FROM computers WHERE name = %s AND lab_id = %s"
-            existing = execute_query(check_query, (name, lab_id), fetch_one=True, commit=False)
-            
-            if existing:
-                skipped.append(name)
-                continue
-            
-            # Generate unique ID
-            computer_id = str(uuid.uuid4())
-            
-            # Convert to JSON
-            specs_json = json.dumps(specs) if isinstance(specs, dict) else specs
-            other_parts_json = json.dumps(other_parts)
-            
-            # Insert computer
-            query = """
-                INSERT INTO computers (id, name, lab_id, specs, other_parts) 
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            execute_query(query, (computer_id, name, lab_id, specs_json, other_parts_json))
-            
-            # Initialize statuses (Unified table)
-            if isinstance(specs, dict):
-                for category, details in specs.items():
-                    # details might be string (old format) or dict (new format)
-                    if isinstance(details, dict):
-                        part_name = details.get('name', '')
-                        serial_number = details.get('serial', '')
-                    else:
-                        part_name = str(details)
-                        serial_number = ''
-
-                    status_query = """
-                        INSERT INTO computer_parts (computer_id, name, serial_number, category, type, status, notes) 
-                        VALUES (%s, %s, %s, %s, 'standard', 'operational', '')
-                    """
-                    execute_query(status_query, (computer_id, part_name, serial_number, category))
-            
-            # Insert other parts status for each item in the list
-            for item in other_parts:
-                if isinstance(item, dict) and 'name' in item:
-                    part_name = item['name']
-                    serial_number = item.get('serial', '')
-                    other_query = """
-                        INSERT INTO computer_parts (computer_id, name, serial_number, category, type, status, notes) 
-                        VALUES (%s, %s, %s, 'other', 'custom', 'operational', '')
-                    """
-                    execute_query(other_query, (computer_id, part_name, serial_number))
-            
-            inserted_computers.append({"pc_name": name, "id": computer_id})
-        
-        logger.info(f'Bulk computers added: {len(inserted_computers)} inserted, {len(skipped)} skipped')
         
-        return jsonify({
-            "success": True,
-            "inserted": inserted_computers,
-            "skipped_duplicates": skipped
-        }), 200
+        if not isinstance(data, list):
+            return error_response("Expected a list of computers", 400)
+        
+        invalid = [
+            index for index, computer in enumerate(data)
+            if not isinstance(computer, dict)
+            or not isinstance(computer.get('pc_name'), str)
+            or not computer['pc_name'].strip()
+        ]
+        if invalid:
+            return error_response("Every computer needs a pc_name", 400, errors={"indexes": invalid})
+        
+        result = import_computers(data)
+        added_per_lab = result.pop("added_per_lab")
+        if result["inserted_count"]:
+            bump_versions('computers', 'laboratories', 'computer_parts')
+            publish_event('computer.added', computers=[
+                {"computer_id": item["id"], "name": item["pc_name"], "lab_id": item["lab_id"]}
+                for item in result["inserted"]
+            ])
+            for lab_id, count in added_per_lab.items():
+                publish_event('lab.count_changed', lab_id=lab_id, delta=count)
+        
+        logger.info(
+            f'Bulk computers added: {result["inserted_count"]} inserted, '
+            f'{result["skipped_count"]} skipped in {result["timing_ms"]["total"]}ms'
+        )
+        
+        return jsonify({"success": True, **result}), 200
         
     except Exception as e:
         logger.error(f'Bulk computer add error: {str(e)}')
@@ -191,48 +235,26 @@ def computer_bulk():
 
 
 @computers_bp.route('/get_computers', methods=['GET'])
+@conditional_on('computers', 'laboratories')
 def get_computers():
     """
     Get all computers with their specifications.
+    Streamed from an unbuffered cursor, so memory stays flat with fleet size.
+    
+    Query params (optional):
+        fields: Comma-separated response fields (default: all), e.g.
+            fields=id,name,lab_id skips the specs/other_parts JSON columns
     """
     try:
-        query = """
-            SELECT c.id, c.name, l.name, c.lab_id, c.specs, c.other_parts 
-            FROM computers c 
-            LEFT JOIN laboratories l ON c.lab_id = l.id
-        """
-        computers = execute_query(query, fetch_all=True, commit=False)
-        
-        result = []
-        for computer in computers:
-            comp_id, name, lab_name, lab_id, specs, other_parts = computer
-            
-            # Parse JSON specs
-            try:
-                specs_dict = json.loads(specs) if specs else {}
-            except:
-                specs_dict = {}
-            
-            try:
-                other_parts_dict = json.loads(other_parts) if other_parts else {}
-            except:
-                other_parts_dict = {}
-            
-            result.append({
-                "id": comp_id,
-                "pc_name": name, # Keep for frontend compatibility
-                "name": name,
-                "lab_name": lab_name,
-                "lab_id": lab_id,
-                "specs": specs_dict,
-                "other_parts": other_parts_dict
-            })
-        
-        return jsonify(result), 200
+        query, params, selection = computers_query(request.args)
+        return stream_json_array(stream_query(query, params), selection.serialize)
         
+    except FieldSetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get computers error: {str(e)}')
-        return jsonify({"error": str(e)}), 500
+        # PoolTimeoutError (no stream connection free) becomes a 503
+        return database_error_response(e, "Failed to get computers")
 
 
 @computers_bp.route('/delete_computer/<string:id>', methods=['DELETE'])
@@ -247,11 +269,21 @@ def delete_computer(id):
         logger.info(f'Deleting computer: {id}')
         
         with get_db_cursor() as cursor:
+            # Lock the row so concurrent deletes can't both decrement the lab count
+            cursor.execute("SELECT lab_id FROM computers WHERE id = %s FOR UPDATE", (id,))
+            row = cursor.fetchone()
             cursor.execute("DELETE FROM computers WHERE id = %s", (id,))
             # Cascade delete handles computer_parts
             # Reports might be set null or deleted depending on config, but safe to delete explicitly if needed
             cursor.execute("DELETE FROM reports WHERE computer_id = %s", (id,))
+            
+            if row:
+                adjust_lab_counts(cursor, {row[0]: -1})
         
+        bump_versions('computers', 'laboratories', 'computer_parts', 'reports')
+        if row:
+            publish_event('computer.removed', computer_id=id, lab_id=row[0])
+            publish_event('lab.count_changed', lab_id=row[0], delta=-1)
         logger.info(f'Computer deleted: {id}')
         
         return {"message": "Computer deleted"}, 200
@@ -262,44 +294,29 @@ def delete_computer(id):
 
 
 @computers_bp.route('/get_computer_statuses', methods=['GET'])
+@conditional_on('computer_parts')
 def get_computer_statuses():
     """
-    Get all computer part statuses (Unified).
+    Get computer part statuses (Unified).
+    Streamed from an unbuffered cursor, so memory stays flat with fleet size.
+    
+    Query params (all optional, lab_id and computer_id may be repeated or
+    comma-separated):
+        lab_id: Only parts of computers in these laboratories
+        computer_id: Only parts of these computers
+        status: Only parts with these statuses (label or 1-4 code)
+        fields: Comma-separated response fields (default: all)
     """
     try:
-        # Fetch all parts from the unified table
-        query = "SELECT * FROM computer_parts"
-        results = execute_query(query, fetch_all=True, commit=False)
-        
-        statuses = []
-        for row in results:
-            # id, computer_id, name, serial_number, category, type, status, notes, updated_at
-            # Note: Indexing depends on table structure. Assuming:
-            # id(0), computer_id(1), name(2), serial_number(3), category(4), type(5), status(6), notes(7), updated_at(8)
-            # But we used SELECT * which might be risky if columns change.
-            # Let's map by name if possible, or assume the order from schema.
-            # Schema order: id, computer_id, name, serial_number, category, type, status, notes, updated_at
-            
-            status = {
-                "id": row[0],
-                "com_id": row[1],
-                "computer_id": row[1],
-                "part": row[4] if row[4] and row[4] != 'other' else row[2], # Use category as part key for standard, or name for custom/other
-                "name": row[2],
-                "serial_number": row[3],
-                "category": row[4],
-                "type": row[5],
-                "status": 1 if row[6] == 'operational' else 2 if row[6] == 'not_operational' else 3 if row[6] == 'damaged' else 4,
-                "status_label": row[6],
-                "notes": row[7]
-            }
-            statuses.append(status)
-        
-        return jsonify(statuses), 200
+        query, params, selection = part_statuses_query(request.args)
+        return stream_json_array(stream_query(query, params), selection.serialize)
         
+    except (FieldSetError, ListQueryError) as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get computer statuses error: {str(e)}')
-        return jsonify({"error": str(e)}), 500
+        # PoolTimeoutError (no stream connection free) becomes a 503
+        return database_error_response(e, "Failed to get computer statuses")
 
 
 @computers_bp.route('/get_other_part_status', methods=['GET'])
@@ -378,20 +395,24 @@ def update_computer_status():
             execute_query(query, (com_id, part, status_enum, notes))
         
         # Auto-generate report if status is not operational
+        # Part of the same unit of work: a failure here (e.g. a deadlock,
+        # which has already rolled back the status update) fails the request
         if status_enum in ['not_operational', 'damaged', 'missing']:
-            try:
-                claims = get_jwt()
-                user_email = claims.get('email', 'System')
-                
-                report_query = """
-                    INSERT INTO reports (computer_id, part_name, issue_description, status, submitted_by)
-                    VALUES (%s, %s, %s, 'pending', %s)
-                """
-                execute_query(report_query, (com_id, part, notes, user_email))
-                logger.info(f'Auto-generated report for {com_id} - {part}')
-            except Exception as e:
-                logger.error(f'Failed to auto-generate report: {str(e)}')
-        
+            claims = get_jwt()
+            user_email = claims.get('email', 'System')
+            
+            report_query = """
+                INSERT INTO reports (computer_id, part_name, issue_description, status, submitted_by)
+                VALUES (%s, %s, %s, 'pending', %s)
+            """
+            execute_query(report_query, (com_id, part, notes, user_email))
+            with get_db_cursor() as cursor:
+                refresh_open_issues(cursor, [(com_id, part)])
+            publish_event('report.created', computer_id=com_id, part_name=part, status='pending')
+            logger.info(f'Auto-generated report for {com_id} - {part}')
+        
+        bump_versions('computer_parts', 'reports')
+        publish_event('part.status_changed', computer_id=com_id, parts=[{"name": part, "status": status_enum}])
         logger.info(f'Computer status updated: {com_id} - {part}')
         
         return jsonify({"success": True, "message": "Status updated"}), 200
@@ -413,111 +434,25 @@ def update_computer_status_bulk():
         data = request.json
         all_statuses = data.get("statuses", {})
         
-        status_map = {1: 'operational', 2: 'not_operational', 3: 'damaged', 4: 'missing'}
+        claims = get_jwt()
+        user_email = claims.get('email', 'System')
         
-        with get_db_cursor() as cursor:
-            for com_id, parts in all_statuses.items():
-                for part, status_data in parts.items():
-                    status_val = status_data.get("status")
-                    notes = status_data.get("notes", "")
-                    new_name = status_data.get("name") # Get new name if provided
-                    
-                    if isinstance(status_val, int):
-                        status_enum = status_map.get(status_val, 'operational')
-                    else:
-                        status_enum = status_val
-                    
-                    # Check if part exists by name or category
-                    check_query = "SELECT id, name, status, serial_number FROM computer_parts WHERE computer_id = %s AND (name = %s OR category = %s) LIMIT 1"
-                    cursor.execute(check_query, (com_id, part, part))
-                    existing = cursor.fetchone()
-                    
-                    new_serial = status_data.get("serial") # Get new serial if provided
-                    
-                    if existing:
-                        part_id, current_name, current_status, current_serial = existing
-                        changes = []
-                        
-                        # Detect changes
-                        effective_name = new_name if new_name else current_name
-                        
-                        if new_name and new_name != current_name:
-                            changes.append(f"{part.capitalize()} Name updated to {new_name}")
-                        
-                        if new_serial and new_serial != current_serial:
-                            changes.append(f"{part.capitalize()} Serial updated to {new_serial}")
-                            
-                        if status_enum != current_status:
-                            changes.append(f"{part.capitalize()} is {status_enum}")
-                        
-                        # Update existing by ID
-                        update_fields = ["status = %s", "notes = %s"]
-                        update_params = [status_enum, notes]
-                        
-                        if new_name:
-                            update_fields.append("name = %s")
-                            update_params.append(new_name)
-                            
-                        if new_serial:
-                            update_fields.append("serial_number = %s")
-                            update_params.append(new_serial)
-                            
-                        update_params.append(part_id)
-                        
-                        query = f"UPDATE computer_parts SET {', '.join(update_fields)} WHERE id = %s"
-                        cursor.execute(query, tuple(update_params))
-                        
-                        # Generate report if there are changes
-                        if changes:
-                            try:
-                                claims = get_jwt()
-                                user_email = claims.get('email', 'System')
-                                change_description = ". ".join(changes)
-                                if notes:
-                                    change_description += f". Notes: {notes}"
-                                
-                                report_query = """
-                                    INSERT INTO reports (computer_id, part_name, issue_description, status, submitted_by)
-                                    VALUES (%s, %s, %s, 'pending', %s)
-                                """
-                                # Use new_name if available, else current_name
-                                report_part_name = new_name if new_name else current_name
-                                cursor.execute(report_query, (com_id, report_part_name, change_description, user_email))
-                                logger.info(f'Report generated for {com_id} - {report_part_name}: {change_description}')
-                            except Exception as e:
-                                logger.error(f'Failed to auto-generate report in bulk update: {str(e)}')
-                                
-                    else:
-                        # Insert new
-                        part_type = status_data.get("type", "standard")
-                        category = part if part_type == 'standard' else 'other'
-                        # Use new_name if provided, else part (key)
-                        final_name = new_name if new_name else part
-                        final_serial = new_serial if new_serial else ''
-                        
-                        query = """
-                            INSERT INTO computer_parts (computer_id, name, serial_number, category, type, status, notes)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        """
-                        cursor.execute(query, (com_id, final_name, final_serial, category, part_type, status_enum, notes))
-                        
-                        # Auto-generate report for new non-operational parts
-                        if status_enum in ['not_operational', 'damaged', 'missing']:
-                            try:
-                                claims = get_jwt()
-                                user_email = claims.get('email', 'System')
-                                
-                                report_query = """
-                                    INSERT INTO reports (computer_id, part_name, issue_description, status, submitted_by)
-                                    VALUES (%s, %s, %s, 'pending', %s)
-                                """
-                                cursor.execute(report_query, (com_id, final_name, f"New part added with status: {status_enum}. Notes: {notes}", user_email))
-                            except Exception as e:
-                                logger.error(f'Failed to auto-generate report for new part: {str(e)}')
-        
-        logger.info(f'Bulk computer statuses updated')
-        
-        return jsonify({"success": True, "message": "Statuses updated"}), 200
+        result = apply_status_changes(all_statuses, user_email)
+        bump_versions('computer_parts', 'reports')
+        
+        # One delta per computer rather than per part
+        for com_id, parts in result.pop("status_changes").items():
+            publish_event('part.status_changed', computer_id=com_id, parts=parts)
+        if result["reports"]:
+            publish_event('report.created', count=result["reports"])
+        
+        logger.info(
+            f'Bulk computer statuses updated: {result["updated"]} updated, '
+            f'{result["inserted"]} inserted, {result["reports"]} reports '
+            f'in {result["statements"]} statements'
+        )
+        
+        return jsonify({"success": True, "message": "Statuses updated", **result}), 200
         
     except Exception as e:
         logger.error(f'Bulk update status error: {str(e)}')
@@ -572,7 +507,7 @@ def get_computer_details(computer_id):
                         specs[key] = {"name": val, "serial": ""}
             
             if legacy_other_parts:
-                other_parts = json.loads(legacy_other_parts) if isinstance(legacy_other_parts, str) else legacy_other_parts
+                other_parts = raw_json(legacy_other_parts) if isinstance(legacy_other_parts, str) else legacy_other_parts
 
         return jsonify({
             "id": comp_id,
@@ -619,6 +554,7 @@ def update_edit_data(pc_id):
         # Get current user for report
         claims = get_jwt()
         user_email = claims.get('email', 'System')
+        reported_parts = []
         
         # Update standard parts
         if isinstance(specs, dict):
@@ -648,6 +584,7 @@ def update_edit_data(pc_id):
                                 VALUES (%s, %s, %s, 'pending', %s)
                             """
                             execute_query(report_query, (pc_id, part_name if part_name else current_name, change_description, user_email))
+                            reported_parts.append((pc_id, part_name if part_name else current_name))
                             logger.info(f'Report generated for {pc_id}: {change_description}')
                         except Exception as e:
                             logger.error(f'Failed to generate report for update: {str(e)}')
@@ -685,6 +622,12 @@ def update_edit_data(pc_id):
                     """
                     execute_query(insert_custom_query, (pc_id, part_name, serial_number))
         
+        if reported_parts:
+            with get_db_cursor() as cursor:
+                refresh_open_issues(cursor, reported_parts)
+        
+        bump_versions('computers', 'computer_parts', 'reports')
+        publish_event('computer.updated', computer_id=pc_id, name=name)
         logger.info(f'Computer data updated: {pc_id}')
         
         return jsonify({"success": True, "message": "Computer updated successfully"}), 200
@@ -712,12 +655,26 @@ def delete_computer_bulk():
             # Create placeholders for IN clause
             format_strings = ','.join(['%s'] * len(computer_ids))
             
+            cursor.execute(
+                f"SELECT lab_id FROM computers WHERE id IN ({format_strings}) FOR UPDATE",
+                tuple(computer_ids)
+            )
+            removed_per_lab = {}
+            for (lab_id,) in cursor.fetchall():
+                removed_per_lab[lab_id] = removed_per_lab.get(lab_id, 0) + 1
+            
             # Delete related records first (if cascading isn't fully set up, though schema says ON DELETE CASCADE)
             # But relying on schema cascade is better.
             
             query = f"DELETE FROM computers WHERE id IN ({format_strings})"
             cursor.execute(query, tuple(computer_ids))
             
+            adjust_lab_counts(cursor, {lab_id: -count for lab_id, count in removed_per_lab.items()})
+            
+        bump_versions('computers', 'laboratories', 'computer_parts', 'reports')
+        for lab_id, count in removed_per_lab.items():
+            publish_event('lab.count_changed', lab_id=lab_id, delta=-count)
+        publish_event('computer.removed', computer_ids=computer_ids)
         logger.info(f'Bulk deleted computers: {computer_ids}')
         return success_response(f"Successfully deleted {len(computer_ids)} computers")
         
@@ -0,0 +1,84 @@
+"""
+Events blueprint for CLAIMS backend.
+Server-Sent Events stream of live dashboard and lab status deltas.
+"""
+import queue
+from flask import Blueprint, Response, current_app
+from services.events import RESYNC_EVENT, format_event, get_broadcaster
+from services.logger import get_logger
+from utils.decorators import jwt_required_custom
+from utils.responses import busy_response, error_response
+
+logger = get_logger(__name__)
+
+events_bp = Blueprint('events', __name__, url_prefix='')
+
+
+class TooManySubscribersError(Exception):
+    """Raised when a worker already serves EVENTS_MAX_SUBSCRIBERS streams."""
+
+
+@events_bp.route('/events', methods=['GET'])
+@jwt_required_custom
+def events():
+    """
+    Stream change events as Server-Sent Events.
+    Requires authentication (Authorization header).
+    
+    Event types:
+        part.status_changed, report.created, report.sent, report.updated,
+        report.deleted, computer.added, computer.updated, computer.removed,
+        lab.count_changed
+    
+    A 'resync' event tells the client it fell behind and should refetch.
+    
+    Each open stream holds one worker thread, so a worker serves at most
+    EVENTS_MAX_SUBSCRIBERS of them and answers 503 beyond that. asgi.py
+    serves this route without holding threads, for many open dashboards.
+    """
+    broadcaster = get_broadcaster()
+    if broadcaster is None:
+        return error_response("Event stream unavailable", 503)
+    
+    limit = current_app.config['EVENTS_MAX_SUBSCRIBERS']
+    subscription = broadcaster.subscribe(limit=limit)
+    if subscription is None:
+        return busy_response(
+            TooManySubscribersError(f'{limit} event streams already open in this worker'),
+            retry_after=30
+        )
+    
+    heartbeat = current_app.config['EVENTS_HEARTBEAT_INTERVAL']
+    logger.debug(f'Event stream opened ({broadcaster.subscriber_count} subscribers)')
+    
+    def close():
+        if broadcaster.unsubscribe(subscription):
+            logger.debug('Event stream closed')
+    
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    item = subscription.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Keepalive comment; also detects closed connections
+                    yield ": keepalive\n\n"
+                    continue
+                
+                if item is None:
+                    yield RESYNC_EVENT
+                    return
+                
+                yield format_event(*item)
+        finally:
+            close()
+    
+    response = Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # The generator's finally never runs if the client leaves before the
+    # first chunk is pulled; release the slot when the response closes
+    response.call_on_close(close)
+    return response
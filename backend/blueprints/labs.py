@@ -4,14 +4,31 @@ Handles laboratory management (CRUD operations).
 """
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from services.dashboard import track_dashboard_changes
+from services.data_versions import bump_versions
 from services.database import execute_query, get_db_cursor
+from services.inventory import lab_counts_enabled
 from services.logger import get_logger
 from utils.responses import success_response, error_response, database_error_response
-from utils.decorators import jwt_required_custom, admin_required, role_required
+from utils.decorators import jwt_required_custom, admin_required, role_required, conditional_on
+from utils.fieldsets import Field, FieldSet, FieldSetError
 
 logger = get_logger(__name__)
 
 labs_bp = Blueprint('labs', __name__, url_prefix='')
+track_dashboard_changes(labs_bp)
+
+# Placeholder resolved per request to the pc_count column or a grouped count
+PC_COUNT = 'pc_count'
+
+LAB_FIELDS = FieldSet({
+    'lab_id': Field(['l.id']),  # Keep for frontend compatibility
+    'id': Field(['l.id']),
+    'lab_name': Field(['l.name']),  # Keep for frontend compatibility
+    'name': Field(['l.name']),
+    'location': Field(['l.location']),
+    'pc_count': Field([PC_COUNT]),
+})
 
 
 @labs_bp.route('/add_laboratory', methods=['POST'])
@@ -43,6 +60,7 @@ def add_laboratory():
         result = execute_query(query, (name,), fetch_one=True, commit=False)
         new_id = result[0] if result else None
         
+        bump_versions('laboratories')
         logger.info(f'Laboratory added: {name} (ID: {new_id})')
         
         return {
@@ -57,35 +75,44 @@ def add_laboratory():
 
 
 @labs_bp.route('/get_laboratory', methods=['GET'])
+@conditional_on('laboratories', 'computers')
 def get_laboratory():
     """
     Get all laboratories with their computer counts.
+    Counts come from laboratories.pc_count when LAB_PC_COUNT_COLUMN is
+    enabled, otherwise from per-lab counts of computers joined to the lab
+    rows (skipped entirely when pc_count is not among the requested
+    fields). Each lab is listed with its own count, as before.
+    
+    Query params (optional):
+        fields: Comma-separated response fields (default: all)
     """
     try:
-        final_data = []
-        
-        query = "SELECT id, name, location FROM laboratories"
+        selection = LAB_FIELDS.select(request.args)
+        columns = [
+            ('l.pc_count' if lab_counts_enabled() else 'COALESCE(c.pc_count, 0)') if column == PC_COUNT else column
+            for column in selection.columns
+        ]
+        
+        if PC_COUNT in selection.columns and not lab_counts_enabled():
+            query = f"""
+                SELECT {', '.join(columns)}
+                FROM laboratories l
+                LEFT JOIN (
+                    SELECT lab_id, COUNT(*) AS pc_count FROM computers GROUP BY lab_id
+                ) c ON c.lab_id = l.id
+                ORDER BY l.id
+            """
+        else:
+            query = f"SELECT {', '.join(columns)} FROM laboratories l ORDER BY l.id"
         labs = execute_query(query, fetch_all=True, commit=False)
         
-        for lab in labs:
-            lab_id, name, location = lab
-            
-            # Count computers in this lab
-            count_query = "SELECT COUNT(*) FROM computers WHERE lab_id = %s"
-            count_result = execute_query(count_query, (lab_id,), fetch_one=True, commit=False)
-            pc_count = count_result[0] if count_result else 0
-            
-            final_data.append({
-                "lab_id": lab_id, # Keep for frontend compatibility
-                "id": lab_id,
-                "lab_name": name, # Keep for frontend compatibility
-                "name": name,
-                "location": location,
-                "pc_count": pc_count
-            })
+        final_data = [selection.serialize(lab) for lab in labs]
         
         return jsonify(final_data), 200
         
+    except FieldSetError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get laboratories error: {str(e)}')
         return database_error_response(e, "Failed to get laboratories")
@@ -108,6 +135,7 @@ def edit_lab(lab_id):
         query = "UPDATE laboratories SET name=%s, location=%s WHERE id=%s"
         execute_query(query, (new_name, location, lab_id))
         
+        bump_versions('laboratories')
         logger.info(f'Laboratory updated: {lab_id} -> {new_name}')
         
         return jsonify({"success": True, "message": "Lab updated successfully"}), 200
@@ -153,6 +181,7 @@ def delete_lab(lab_name):
             # Delete the laboratory itself
             cursor.execute("DELETE FROM laboratories WHERE id = %s", (lab_id,))
         
+        bump_versions('laboratories', 'computers', 'computer_parts', 'reports')
         logger.info(f'Laboratory deleted successfully: {lab_name}')
         
         return {"message": "Lab deleted"}, 200
@@ -165,15 +194,19 @@ def delete_lab(lab_name):
 @labs_bp.route("/labs-pc-count", methods=["GET"])
 def labs_pc_count():
     """
-    Get computer count for each laboratory.
+    Get computer count for each laboratory name.
+    Labs sharing a name are listed once with their counts added.
     """
     try:
-        query = """
-            SELECT l.name, COUNT(c.id) as pc_count 
-            FROM laboratories l 
-            LEFT JOIN computers c ON l.id = c.lab_id 
-            GROUP BY l.name
-        """
+        if lab_counts_enabled():
+            query = "SELECT name, CAST(SUM(pc_count) AS SIGNED) AS pc_count FROM laboratories GROUP BY name"
+        else:
+            query = """
+                SELECT l.name, COUNT(c.id) as pc_count 
+                FROM laboratories l 
+                LEFT JOIN computers c ON l.id = c.lab_id 
+                GROUP BY l.name
+            """
         results = execute_query(query, fetch_all=True, commit=False)
         
         data = []
@@ -2,12 +2,20 @@
 Reports blueprint for CLAIMS backend.
 Handles report submission, management, and email notifications.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from services.dashboard import get_dashboard_payload, track_dashboard_changes
+from services.data_versions import bump_versions
 from services.database import execute_query, get_db_cursor
-from services.email_service import send_email
+from services.email_outbox import enqueue_email, get_outbox_entry
+from services.events import publish_event
 from services.logger import get_logger
+from services.open_issues import refresh_open_issues
 from utils.responses import success_response, error_response, database_error_response
-from utils.decorators import jwt_required_custom, role_required
+from utils.decorators import ROLE_BITS, get_current_principal, jwt_required_custom, role_required
+from utils.pagination import (
+    Filter, ListQuery, ListQueryError, choice_value, date_value, end_date_value, int_value,
+    list_response
+)
 import uuid
 from datetime import datetime
 
@@ -15,6 +23,43 @@ logger = get_logger(__name__)
 
 reports_bp = Blueprint('reports', __name__, url_prefix='')
 
+OPEN_ISSUE_LIST = ListQuery(
+    columns=[
+        'r.id', 'r.computer_id', 'r.part_name', 'r.issue_description', 'r.status', 'r.created_at',
+        'c.name AS pc_name', 'l.name AS lab_name'
+    ],
+    from_clause="""open_issues o
+            JOIN reports r ON r.id = o.report_id
+            LEFT JOIN computers c ON o.computer_id = c.id
+            LEFT JOIN laboratories l ON c.lab_id = l.id""",
+    id_column='o.report_id',
+    sort_keys={'created_at': 'o.created_at'},
+    default_sort='-created_at',
+    filters={
+        'lab_id': Filter('c.lab_id', 'eq', int_value),
+        'computer_id': Filter('o.computer_id', 'eq', str),
+        'part_name': Filter('o.part_name', 'eq', str),
+        'created_from': Filter('o.created_at', 'gte', date_value),
+        'created_to': Filter('o.created_at', 'lte', end_date_value),
+    }
+)
+
+TECHNICIAN_LOG_LIST = ListQuery(
+    columns=['id', 'report_id', 'technician_id', 'technician_name', 'action_taken', 'status_after', 'created_at'],
+    from_clause='technician_logs',
+    id_column='id',
+    sort_keys={'created_at': 'created_at'},
+    default_sort='-created_at',
+    filters={
+        'report_id': Filter('report_id', 'eq', int_value),
+        'technician_id': Filter('technician_id', 'eq', str),
+        'status': Filter('status_after', 'eq', choice_value('operational', 'not_operational', 'damaged', 'missing')),
+        'created_from': Filter('created_at', 'gte', date_value),
+        'created_to': Filter('created_at', 'lte', end_date_value),
+    }
+)
+track_dashboard_changes(reports_bp)
+
 
 @reports_bp.route('/add_report', methods=['POST'])
 @jwt_required_custom
@@ -45,6 +90,12 @@ def add_report():
         """
         execute_query(query, (computer_id, part_name, issue_description, status, email))
         
+        if status == 'pending':
+            with get_db_cursor() as cursor:
+                refresh_open_issues(cursor, [(computer_id, part_name)])
+        
+        bump_versions('reports')
+        publish_event('report.created', computer_id=computer_id, part_name=part_name, status=status)
         logger.info(f'Report added by {email} for computer {computer_id}')
         
         return {"report": "added successfully"}, 200
@@ -66,11 +117,20 @@ def delete_report(id):
         if id == "ALL":
             query = "DELETE FROM reports"
             execute_query(query)
+            # open_issues rows go with their reports (ON DELETE CASCADE)
+            bump_versions('reports', 'technician_logs')
+            publish_event('report.deleted', report_id="ALL")
             logger.info('All reports deleted')
             return {"message": "All reports deleted"}, 200
         else:
-            query = "DELETE FROM reports WHERE id = %s"
-            execute_query(query, (id,))
+            with get_db_cursor() as cursor:
+                cursor.execute("SELECT computer_id, part_name FROM reports WHERE id = %s", (id,))
+                deleted = cursor.fetchall()
+                cursor.execute("DELETE FROM reports WHERE id = %s", (id,))
+                # An older pending report may now be the latest for this part
+                refresh_open_issues(cursor, deleted)
+            bump_versions('reports', 'technician_logs')
+            publish_event('report.deleted', report_id=id)
             logger.info(f'Report deleted: {id}')
             return {"message": "Report deleted"}, 200
             
@@ -84,95 +144,16 @@ def get_data():
     """
     Get comprehensive data including users, reports, computer statuses.
     This endpoint returns dashboard data formatted for the frontend.
+    Served from the shared precomputed snapshot when available.
     """
     try:
-        result = {}
-        
-        # Fetch all necessary data
-        users = execute_query("SELECT * FROM users", fetch_all=True, commit=False)
-        reports = execute_query("SELECT * FROM reports", fetch_all=True, commit=False)
-        computer_parts = execute_query("SELECT * FROM computer_parts", fetch_all=True, commit=False)
-        labs = execute_query("SELECT id, name FROM laboratories", fetch_all=True, commit=False)
-        computers = execute_query("SELECT id, lab_id FROM computers", fetch_all=True, commit=False)
-        
-        # --- Stats ---
-        # computer_parts: id, computer_id, name, serial_number, category, type, status, notes
-        # Indices: 0=id, 1=comp_id, 2=name, 3=serial, 4=category, 5=type, 6=status, 7=notes
-        
-        operational_count = sum(1 for part in computer_parts if part[6] == 'operational')
-        damaged_count = sum(1 for part in computer_parts if part[6] == 'damaged')
-        missing_count = sum(1 for part in computer_parts if part[6] == 'missing')
-        not_operational_count = sum(1 for part in computer_parts if part[6] == 'not_operational')
-        
-        result['stats'] = {
-            'operational': operational_count,
-            'damaged': damaged_count,
-            'missing': missing_count,
-            'notOperational': not_operational_count,
-            'totalComputers': len(computers),
-            'totalLabs': len(labs),
-            'reportsSubmitted': len(reports),
-            'totalUsers': len(users)
-        }
+        payload = get_dashboard_payload()
         
-        # --- Computer Part Status (Group by category) ---
-        part_stats = {}
-        for part in computer_parts:
-            # Use category (index 4) for grouping, fallback to name (index 2) if category is null
-            category = part[4] if part[4] else part[2]
-            status = part[6]
-            
-            if category not in part_stats:
-                part_stats[category] = {'name': category, 'operational': 0, 'notOperational': 0, 'missing': 0, 'damaged': 0}
-            
-            if status == 'operational':
-                part_stats[category]['operational'] += 1
-            elif status == 'not_operational':
-                part_stats[category]['notOperational'] += 1
-            elif status == 'missing':
-                part_stats[category]['missing'] += 1
-            elif status == 'damaged':
-                part_stats[category]['damaged'] += 1
-                
-        result['computerPartStatus'] = list(part_stats.values())
-        
-        # --- Lab Equipments (Computers per lab) ---
-        # labs: id, name
-        # computers: id, lab_id
-        lab_map = {lab[0]: lab[1] for lab in labs}
-        lab_comp_counts = {lab[0]: 0 for lab in labs}
-        
-        for comp in computers:
-            lab_id = comp[1]
-            if lab_id in lab_comp_counts:
-                lab_comp_counts[lab_id] += 1
-                
-        result['labEquipments'] = [
-            {'name': lab_map[lid], 'computers': count} 
-            for lid, count in lab_comp_counts.items()
-        ]
-        
-        # --- Damage vs Missing per Lab ---
-        # Need to join computer_parts -> computers -> laboratories
-        lab_issues = {lab[0]: {'name': lab[1], 'damaged': 0, 'missing': 0} for lab in labs}
-        
-        # Create a map of computer_id -> lab_id
-        comp_lab_map = {comp[0]: comp[1] for comp in computers}
-        
-        for part in computer_parts:
-            comp_id = part[1]
-            status = part[6]
-            if comp_id in comp_lab_map:
-                lab_id = comp_lab_map[comp_id]
-                if lab_id in lab_issues:
-                    if status == 'damaged':
-                        lab_issues[lab_id]['damaged'] += 1
-                    elif status == 'missing':
-                        lab_issues[lab_id]['missing'] += 1
-                        
-        result['damageMissing'] = list(lab_issues.values())
-        
-        return jsonify(result), 200
+        # The snapshot can lag behind table versions, so tag the content itself
+        response = current_app.response_class(payload, mimetype='application/json')
+        response.add_etag()
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f'Get data error: {str(e)}')
@@ -186,35 +167,21 @@ def get_admin_computer_reports():
     """
     Get detailed computer reports for admin dashboard.
     Requires admin or dean role.
+    
+    Query params (all optional):
+        lab_id, computer_id, part_name: Filters (repeat or comma-separate)
+        created_from, created_to: Report date range (YYYY-MM-DD, inclusive)
+        sort: created_at or -created_at (default)
+        limit: Page size (default 50, at most 500)
+        cursor: next_cursor of the previous page
+    
+    Returns:
+        {"items": [...], "next_cursor": ...}; next_cursor is null on the
+        last page
     """
     try:
-        # Fetch reports with computer and lab details
-        # Fetch reports with computer and lab details, filtering for pending and latest per component
-        query = """
-            SELECT 
-                r.id, 
-                r.computer_id, 
-                r.part_name, 
-                r.issue_description, 
-                r.status, 
-                r.created_at,
-                c.name as pc_name,
-                l.name as lab_name
-            FROM reports r
-            JOIN (
-                SELECT computer_id, part_name, MAX(created_at) as max_created_at
-                FROM reports
-                WHERE status = 'pending'
-                GROUP BY computer_id, part_name
-            ) latest ON r.computer_id = latest.computer_id 
-                    AND r.part_name = latest.part_name 
-                    AND r.created_at = latest.max_created_at
-            LEFT JOIN computers c ON r.computer_id = c.id
-            LEFT JOIN laboratories l ON c.lab_id = l.id
-            WHERE r.status = 'pending'
-            ORDER BY r.created_at DESC
-        """
-        results = execute_query(query, fetch_all=True, commit=False)
+        # Latest pending report per component, from the maintained open_issues table
+        results, next_cursor = OPEN_ISSUE_LIST.fetch(request.args)
         
         reports_list = []
         for row in results:
@@ -231,8 +198,10 @@ def get_admin_computer_reports():
             }
             reports_list.append(report)
         
-        return jsonify(reports_list), 200
+        return list_response(reports_list, next_cursor)
         
+    except ListQueryError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get admin reports error: {str(e)}')
         return database_error_response(e, "Failed to get reports")
@@ -243,7 +212,9 @@ def get_admin_computer_reports():
 @role_required('admin', 'technician', 'itsd')
 def send_report_email():
     """
-    Send report notification email with summary of multiple reports.
+    Queue report notification email with summary of multiple reports.
+    The selected reports are marked sent in the same transaction; the
+    email is delivered by the email worker (poll /email_outbox/<id>).
     """
     try:
         data = request.json
@@ -266,43 +237,51 @@ def send_report_email():
             'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        # Send email
-        success = send_email(
-            subject=f"Lab Report Summary: {title}",
-            recipients=[user_email], # Send to sender for now, or configured admin list
-            template_name='report.html', # Changed to existing template
-            template_context=context
-        )
+        report_ids = [report.get('com_id') for report in summary if report.get('com_id')]
         
-        if success:
-            logger.info(f'Report email sent by {user_email}')
-            
+        with get_db_cursor() as cursor:
             # Update report statuses
             # summary contains report objects with 'com_id' which is the report ID
-            with get_db_cursor() as cursor:
-                for report in summary:
-                    report_id = report.get('com_id')
-                    if report_id:
-                        # 1. Update this report to 'sent'
-                        cursor.execute("UPDATE reports SET status = 'sent' WHERE id = %s", (report_id,))
-                        
-                        # 2. Find computer_id and part_name for this report to handle duplicates
-                        cursor.execute("SELECT computer_id, part_name FROM reports WHERE id = %s", (report_id,))
-                        result = cursor.fetchone()
-                        
-                        if result:
-                            computer_id, part_name = result
-                            # 3. Update other 'pending' reports for this component to 'complete'
-                            # This clears the queue of older/duplicate reports for the same item
-                            cursor.execute("""
-                                UPDATE reports 
-                                SET status = 'complete' 
-                                WHERE computer_id = %s AND part_name = %s AND status = 'pending' AND id != %s
-                            """, (computer_id, part_name, report_id))
-                            
-            return {"message": "Email sent successfully"}, 200
-        else:
-            return {"error": "Failed to send email"}, 500
+            if report_ids:
+                placeholders = ', '.join(['%s'] * len(report_ids))
+                
+                # 1. Update the selected reports to 'sent'
+                cursor.execute(f"UPDATE reports SET status = 'sent' WHERE id IN ({placeholders})", tuple(report_ids))
+                
+                # 2. Update other 'pending' reports for the same components to 'complete'
+                # This clears the queue of older/duplicate reports for the same item
+                cursor.execute(f"""
+                    UPDATE reports r
+                    JOIN reports s ON r.computer_id = s.computer_id AND r.part_name = s.part_name
+                    SET r.status = 'complete'
+                    WHERE s.id IN ({placeholders}) AND r.status = 'pending'
+                """, tuple(report_ids))
+                
+                cursor.execute(
+                    f"SELECT DISTINCT computer_id, part_name FROM reports WHERE id IN ({placeholders})",
+                    tuple(report_ids)
+                )
+                refresh_open_issues(cursor, cursor.fetchall())
+            
+            # Queued in the same transaction; sent by the email worker
+            outbox_id = enqueue_email(
+                cursor,
+                subject=f"Lab Report Summary: {title}",
+                recipients=[user_email], # Send to sender for now, or configured admin list
+                template_name='report.html', # Changed to existing template
+                template_context=context,
+                created_by=get_current_principal().email
+            )
+        
+        bump_versions('reports')
+        publish_event('report.sent', report_ids=report_ids)
+        logger.info(f'Report email queued by {user_email} (outbox {outbox_id})')
+        
+        return {
+            "message": "Email queued",
+            "outbox_id": outbox_id,
+            "status_url": f"/email_outbox/{outbox_id}"
+        }, 202
             
     except Exception as e:
         logger.error(f'Send report email error: {str(e)}')
@@ -357,7 +336,14 @@ def submit_technician_report():
             computer_id, part_name = report_data
             part_update_query = "UPDATE computer_parts SET status = %s WHERE computer_id = %s AND name = %s"
             execute_query(part_update_query, (status_after, computer_id, part_name))
+            
+            with get_db_cursor() as cursor:
+                refresh_open_issues(cursor, [report_data])
         
+        bump_versions('technician_logs', 'reports', 'computer_parts')
+        publish_event('report.updated', report_id=report_id, status=report_status)
+        if report_data:
+            publish_event('part.status_changed', computer_id=computer_id, parts=[{"name": part_name, "status": status_after}])
         logger.info(f'Technician report submitted for report {report_id} by {technician_name}')
         
         return {"message": "Report submitted successfully"}, 200
@@ -371,12 +357,22 @@ def submit_technician_report():
 @jwt_required_custom
 def get_technician_logs():
     """
-    Get all technician logs.
+    Get technician logs, newest first.
     Requires authentication.
+    
+    Query params (all optional):
+        report_id, technician_id, status: Filters (repeat or comma-separate)
+        created_from, created_to: Log date range (YYYY-MM-DD, inclusive)
+        sort: created_at or -created_at (default)
+        limit: Page size (default 50, at most 500)
+        cursor: next_cursor of the previous page
+    
+    Returns:
+        {"items": [...], "next_cursor": ...}; next_cursor is null on the
+        last page
     """
     try:
-        query = "SELECT * FROM technician_logs"
-        results = execute_query(query, fetch_all=True, commit=False)
+        results, next_cursor = TECHNICIAN_LOG_LIST.fetch(request.args)
         
         logs = []
         for row in results:
@@ -392,8 +388,10 @@ def get_technician_logs():
             }
             logs.append(log)
         
-        return jsonify(logs), 200
+        return list_response(logs, next_cursor)
         
+    except ListQueryError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get technician logs error: {str(e)}')
         return database_error_response(e, "Failed to get logs")
@@ -404,7 +402,8 @@ def get_technician_logs():
 @role_required('technician', 'admin', 'itsd')
 def technician_send_report_email():
     """
-    Send technician report email with multiple logs.
+    Queue technician report email with multiple logs.
+    Delivered by the email worker (poll /email_outbox/<id>).
     """
     try:
         data = request.json.get('data')
@@ -426,30 +425,57 @@ def technician_send_report_email():
             'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        # Send email
-        # We might need a loop or a template that handles the list
-        # For now assuming 'technician_report_email.html' can handle a list or we construct a body
-        
-        # If the template expects a single log, we might need to update the template or use a generic email function
-        # Let's assume we use a generic body construction here for simplicity if template is unknown,
-        # or better, pass the list to the template.
-        
-        success = send_email(
-            subject=f"Technician Report: {title}",
-            recipients=[user_email], # Send to self/admin? Frontend doesn't specify recipients, maybe just to the user?
-            # The original code sent to 'recipients' from data, but frontend doesn't send 'recipients'.
-            # It likely sends to the ITSD/Admin or the user themselves.
-            # Let's send to the user_email and maybe a default admin email if configured.
-            template_name='technician.html',
-            template_context=context
-        )
-        
-        if success:
-            logger.info(f'Technician report email sent by {user_email}')
-            return {"message": "Email sent successfully"}, 200
-        else:
-            return {"error": "Failed to send email"}, 500
+        # The template receives the whole list of logs
+        with get_db_cursor() as cursor:
+            outbox_id = enqueue_email(
+                cursor,
+                subject=f"Technician Report: {title}",
+                recipients=[user_email], # Send to self/admin? Frontend doesn't specify recipients, maybe just to the user?
+                # The original code sent to 'recipients' from data, but frontend doesn't send 'recipients'.
+                # It likely sends to the ITSD/Admin or the user themselves.
+                # Let's send to the user_email and maybe a default admin email if configured.
+                template_name='technician.html',
+                template_context=context,
+                created_by=get_current_principal().email
+            )
+        
+        logger.info(f'Technician report email queued by {user_email} (outbox {outbox_id})')
+        return {
+            "message": "Email queued",
+            "outbox_id": outbox_id,
+            "status_url": f"/email_outbox/{outbox_id}"
+        }, 202
             
     except Exception as e:
         logger.error(f'Technician send email error: {str(e)}')
         return database_error_response(e, "Failed to send email")
+
+
+def _is_requester(entry, principal):
+    created_by = entry['created_by']
+    return bool(created_by and principal.email) and created_by.casefold() == principal.email.casefold()
+
+
+@reports_bp.route('/email_outbox/<int:outbox_id>', methods=['GET'])
+@jwt_required_custom
+@role_required('admin', 'technician', 'itsd')
+def get_email_status(outbox_id):
+    """
+    Get the delivery status of a queued email.
+    Status is one of pending, sending, sent or failed.
+    
+    Admins can read any entry; other roles only the emails they queued.
+    Entries of other users are answered as not found.
+    """
+    try:
+        entry = get_outbox_entry(outbox_id)
+        principal = get_current_principal()
+        is_admin = principal.permissions & ROLE_BITS['admin']
+        if entry is None or not (is_admin or _is_requester(entry, principal)):
+            return error_response("Email not found", 404)
+        
+        return jsonify(entry), 200
+        
+    except Exception as e:
+        logger.error(f'Get email status error: {str(e)}')
+        return database_error_response(e, "Failed to get email status")
@@ -4,17 +4,40 @@ Handles user management, profile updates, and registration.
 """
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from werkzeug.security import generate_password_hash, check_password_hash
 import random
 import uuid
 from services.database import execute_query, get_db_cursor
 from services.file_upload import save_uploaded_file
 from services.logger import get_logger
-from utils.responses import success_response, error_response, database_error_response
+from services.admin_init import DEFAULT_ADMIN_ID, has_default_credentials
+from services.password_hashing import hash_password, verify_password, PasswordHashingBusyError
+from utils.responses import success_response, error_response, database_error_response, busy_response
 from utils.decorators import jwt_required_custom, admin_required, role_required
+from utils.fieldsets import Field, FieldSet, FieldSetError
+from utils.pagination import Filter, ListQuery, ListQueryError, choice_value, list_response
 
 logger = get_logger(__name__)
 
+USER_ROLES = ('admin', 'dean', 'itsd', 'technician')
+
+USER_FIELDS = FieldSet({
+    'id': Field(['id']),
+    'name': Field(['name']),
+    'email': Field(['email']),
+    'role': Field(['role']),
+    'year': Field(['year']),
+    'profile': Field(['profile_image']),
+})
+
+USER_LIST = ListQuery(
+    columns=['id', 'name', 'email', 'role', 'year', 'profile_image'],
+    from_clause='users',
+    id_column='id',
+    sort_keys={'name': 'name', 'created_at': 'created_at'},
+    default_sort='name',
+    filters={'role': Filter('role', 'eq', choice_value(*USER_ROLES))}
+)
+
 users_bp = Blueprint('users', __name__, url_prefix='')
 
 
@@ -86,20 +109,21 @@ def update_profile():
             stored_pw = result[0] if result else None
             
             # Check password
-            from werkzeug.security import check_password_hash
-            password_valid = check_password_hash(stored_pw, current_password)
+            password_valid = verify_password(stored_pw, current_password)
             
             if not password_valid:
                 return jsonify({"success": False, "message": "Current password is incorrect"}), 401
             
             # Hash new password
-            hashed_password = generate_password_hash(new_password, method='pbkdf2:sha256')
+            hashed_password = hash_password(new_password)
             query = "UPDATE users SET password_hash=%s WHERE id=%s"
             execute_query(query, (hashed_password, user_id))
         
-        # Update profile information
-        update_fields = ["name=%s", "email=%s"]
-        params = [name, email]
+        # Update profile information; the email and password decide whether
+        # the account is still on the default admin credentials
+        must_change = has_default_credentials(user_id, email, password=new_password or None)
+        update_fields = ["name=%s", "email=%s", "must_change_credentials=%s"]
+        params = [name, email, must_change]
         
         if image_filename is not None:
             update_fields.append("profile_image=%s")
@@ -114,6 +138,8 @@ def update_profile():
         
         return jsonify({"success": True, "message": "Profile updated successfully"}), 200
         
+    except PasswordHashingBusyError as e:
+        return busy_response(e, current_app.config['PASSWORD_HASH_RETRY_AFTER'])
     except Exception as e:
         logger.error(f'Profile update error: {str(e)}')
         return database_error_response(e, "Failed to update profile")
@@ -182,7 +208,7 @@ def register_user():
             return jsonify({"success": False, "message": f"Invalid role. Must be one of: {', '.join(valid_roles)}"}), 400
         
         # Hash password
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+        hashed_password = hash_password(password)
         
         # Insert user
         query = """
@@ -195,6 +221,8 @@ def register_user():
         
         return jsonify({"success": True}), 200
         
+    except PasswordHashingBusyError as e:
+        return busy_response(e, current_app.config['PASSWORD_HASH_RETRY_AFTER'])
     except Exception as e:
         logger.error(f'User registration error: {str(e)}')
         return database_error_response(e, "Failed to register user")
@@ -205,35 +233,39 @@ def register_user():
 @role_required('admin', 'itsd')
 def get_users():
     """
-    Get all users.
+    Get users.
     Requires admin or itsd role.
+    
+    Query params (all optional):
+        role: Filter by role (repeat or comma-separate for several)
+        fields: Comma-separated response fields (default: all)
+        sort: name or created_at, prefixed with - for descending
+        limit: Page size (default 50, at most 500)
+        cursor: next_cursor of the previous page
+    
+    Returns:
+        {"items": [...], "next_cursor": ...}; next_cursor is null on the
+        last page
     """
     try:
         # Check role for filtering
         claims = get_jwt()
         current_role = claims.get('role', '')
         
+        selection = USER_FIELDS.select(request.args)
         if current_role == 'itsd':
-            query = "SELECT id, name, email, role, year, profile_image FROM users WHERE role = 'technician'"
+            users, next_cursor = USER_LIST.fetch(
+                request.args, "role = 'technician'", columns=selection.columns
+            )
         else:
-            query = "SELECT id, name, email, role, year, profile_image FROM users"
-            
-        users = execute_query(query, fetch_all=True, commit=False)
-        
-        final = []
-        for user in users:
-            user_id, name, email, role, year, profile_image = user
-            final.append({
-                "id": user_id,
-                "name": name,
-                "email": email,
-                "role": role,
-                "year": year,
-                "profile": profile_image
-            })
-        
-        return jsonify(final), 200
+            users, next_cursor = USER_LIST.fetch(request.args, columns=selection.columns)
+        
+        final = [selection.serialize(user) for user in users]
         
+        return list_response(final, next_cursor)
+        
+    except (ListQueryError, FieldSetError) as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.error(f'Get users error: {str(e)}')
         return database_error_response(e, "Failed to get users")
@@ -313,9 +345,13 @@ def update_user(user_id):
             update_fields.append("year=%s")
             params.append(year)
         if password:
-            hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+            hashed_password = hash_password(password)
             update_fields.append("password_hash=%s")
             params.append(hashed_password)
+        if email or password:
+            # Re-evaluate against the account's resulting email and password
+            update_fields.append("must_change_credentials=%s")
+            params.append(has_default_credentials(user_id, email or None, password=password or None))
         if profile_image:
             update_fields.append("profile_image=%s")
             params.append(profile_image)
@@ -329,6 +365,8 @@ def update_user(user_id):
         
         return jsonify({'message': 'User updated successfully'}), 200
         
+    except PasswordHashingBusyError as e:
+        return busy_response(e, current_app.config['PASSWORD_HASH_RETRY_AFTER'])
     except Exception as e:
         logger.error(f'Update user error: {str(e)}')
         return database_error_response(e, "Failed to update user")
@@ -412,32 +450,23 @@ def check_default_credentials():
     """
     Check if current user has default admin credentials.
     Returns true if user needs to update credentials.
+    Answered from the persisted must_change_credentials flag (no hashing).
     """
     try:
         user_id = get_jwt_identity()
         
         # Get user info
-        query = "SELECT id, email, password_hash FROM users WHERE id=%s"
+        query = "SELECT id, must_change_credentials FROM users WHERE id=%s"
         user = execute_query(query, (user_id,), fetch_one=True, commit=False)
         
         if not user:
             return jsonify({"needs_update": False}), 200
         
-        user_id, email, password_hash = user
-        
-        # Check if this is the default admin account
-        is_default_id = (user_id == "0")
-        is_default_email = (email == "admin@example.com")
-        
-        # Check if password is still "changeme"
-        is_default_password = check_password_hash(password_hash, "changeme")
-        
-        # User needs update if they have default credentials
-        needs_update = is_default_id and is_default_email and is_default_password
+        user_id, must_change_credentials = user
         
         return jsonify({
-            "needs_update": needs_update,
-            "is_default_admin": is_default_id
+            "needs_update": bool(must_change_credentials),
+            "is_default_admin": user_id == DEFAULT_ADMIN_ID
         }), 200
         
     except Exception as e:
@@ -505,14 +534,14 @@ def update_default_admin():
         new_id = str(uuid.uuid4())
         
         # Hash new password
-        hashed_password = generate_password_hash(new_password, method='pbkdf2:sha256')
+        hashed_password = hash_password(new_password)
         
         # Update the user with new ID and credentials
         with get_db_cursor() as cursor:
             # Insert new admin with UUID
             insert_query = """
-                INSERT INTO users (id, name, email, password_hash, role, year, profile_image)
-                SELECT %s, %s, %s, %s, role, year, profile_image
+                INSERT INTO users (id, name, email, password_hash, must_change_credentials, role, year, profile_image)
+                SELECT %s, %s, %s, %s, 0, role, year, profile_image
                 FROM users WHERE id = '0'
             """
             cursor.execute(insert_query, (new_id, new_name, new_email, hashed_password))
@@ -529,6 +558,8 @@ def update_default_admin():
             "new_id": new_id
         }), 200
         
+    except PasswordHashingBusyError as e:
+        return busy_response(e, current_app.config['PASSWORD_HASH_RETRY_AFTER'])
     except Exception as e:
         logger.error(f'Update default admin error: {str(e)}')
         return database_error_response(e, "Failed to update admin account")
@@ -0,0 +1,33 @@
+"""
+CLI commands for CLAIMS backend.
+Maintenance tasks run with the Flask CLI, e.g. `flask --app wsgi rebuild-open-issues`.
+"""
+import click
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def register_commands(app):
+    """
+    Register maintenance CLI commands.
+    
+    Args:
+        app: Flask application instance
+    """
+    
+    @app.cli.command('rebuild-open-issues')
+    def rebuild_open_issues_command():
+        """Recompute the open_issues table from reports."""
+        from services.open_issues import rebuild_open_issues
+        
+        count = rebuild_open_issues()
+        click.echo(f'Open issues rebuilt: {count} open')
+    
+    @app.cli.command('backfill-credential-flags')
+    def backfill_credential_flags_command():
+        """Compute users.must_change_credentials for existing accounts."""
+        from services.admin_init import backfill_credential_flags
+        
+        count = backfill_credential_flags()
+        click.echo(f'Credential flags backfilled: {count} user(s) must change credentials')
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -37,6 +38,36 @@ class Config:
     MYSQL_PASSWORD = get_secret('MYSQL_PASSWORD', '')
     MYSQL_DB = os.getenv('MYSQL_DB', 'claims')
     
+    # Connection Pool Configuration
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))  # max connection lifetime
+    DB_POOL_IDLE_TIMEOUT = int(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))
+    DB_POOL_PING_INTERVAL = int(os.getenv('DB_POOL_PING_INTERVAL', 30))
+    DB_STREAM_BATCH_SIZE = int(os.getenv('DB_STREAM_BATCH_SIZE', 500))  # rows per fetchmany in streamed reads
+    DB_STREAM_POOL_SIZE = int(os.getenv('DB_STREAM_POOL_SIZE', 4))  # separate pool for streamed reads; 0 = share the main pool
+    DB_STREAM_MAX_SECONDS = float(os.getenv('DB_STREAM_MAX_SECONDS', 120))  # longest a streamed read may hold its connection; 0 = unbounded
+    
+    # Read Replica (optional; GET/HEAD reads are routed here while it is healthy)
+    MYSQL_REPLICA_HOST = os.getenv('MYSQL_REPLICA_HOST', '')
+    MYSQL_REPLICA_PORT = int(os.getenv('MYSQL_REPLICA_PORT', 3306))
+    MYSQL_REPLICA_USER = os.getenv('MYSQL_REPLICA_USER', '')  # defaults to MYSQL_USER
+    MYSQL_REPLICA_PASSWORD = get_secret('MYSQL_REPLICA_PASSWORD', '')  # defaults to MYSQL_PASSWORD
+    DB_REPLICA_POOL_SIZE = int(os.getenv('DB_REPLICA_POOL_SIZE', 0))  # 0 = same as DB_POOL_SIZE
+    DB_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 5))  # seconds before reads fall back to the primary
+    DB_REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', 5))
+    
+    # ASGI Read Path (asgi.py): aiomysql pool and threads for the mounted Flask app
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', 0))  # 0 = same as DB_POOL_SIZE
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 16))
+    
+    # Query Instrumentation (slow-query log, N+1 detection)
+    QUERY_STATS_ENABLED = os.getenv('QUERY_STATS_ENABLED', 'True').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', 10))  # same statement per request
+    QUERY_STATS_SERVER_TIMING = os.getenv('QUERY_STATS_SERVER_TIMING', 'False').lower() == 'true'
+    
     # JWT Configuration
     JWT_SECRET_KEY = get_secret('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
@@ -55,6 +86,20 @@ class Config:
     MAIL_PASSWORD = get_secret('MAIL_PASSWORD', '')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER', '')
     
+    # SMTP connection reuse for batched delivery (SMTPBatchSender)
+    MAIL_BATCH_MAX_PER_CONNECTION = int(os.getenv('MAIL_BATCH_MAX_PER_CONNECTION', 100))
+    MAIL_BATCH_MAX_PER_SECOND = float(os.getenv('MAIL_BATCH_MAX_PER_SECOND', 0))
+    MAIL_KEEPALIVE_INTERVAL = float(os.getenv('MAIL_KEEPALIVE_INTERVAL', 30))
+    MAIL_IDLE_TIMEOUT = float(os.getenv('MAIL_IDLE_TIMEOUT', 120))
+    
+    # Email Outbox Worker Configuration
+    EMAIL_WORKER_POLL_INTERVAL = float(os.getenv('EMAIL_WORKER_POLL_INTERVAL', 2))
+    EMAIL_WORKER_BATCH_SIZE = int(os.getenv('EMAIL_WORKER_BATCH_SIZE', 20))
+    EMAIL_SEND_LEASE = int(os.getenv('EMAIL_SEND_LEASE', 300))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 6))
+    EMAIL_RETRY_BASE_DELAY = int(os.getenv('EMAIL_RETRY_BASE_DELAY', 30))
+    EMAIL_RETRY_MAX_DELAY = int(os.getenv('EMAIL_RETRY_MAX_DELAY', 3600))
+    
     # File Upload Configuration
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))  # 16MB default
@@ -68,6 +113,38 @@ class Config:
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('LOG_FILE', 'logs/claims.log')
     
+    # Shared state between gunicorn workers (snapshots, locks); tmpfs when available
+    SHARED_STATE_DIR = os.getenv(
+        'SHARED_STATE_DIR',
+        '/dev/shm/claims' if os.path.isdir('/dev/shm') else os.path.join(tempfile.gettempdir(), 'claims')
+    )
+    
+    # Compiled email template cache, shared by all workers
+    EMAIL_TEMPLATE_CACHE_DIR = os.getenv('EMAIL_TEMPLATE_CACHE_DIR', os.path.join(SHARED_STATE_DIR, 'jinja'))
+    
+    # Maintain and read the denormalized laboratories.pc_count column
+    # (apply database/migrations/002_laboratories_pc_count.sql first)
+    LAB_PC_COUNT_COLUMN = os.getenv('LAB_PC_COUNT_COLUMN', 'False').lower() == 'true'
+    
+    # Dashboard Snapshot Configuration
+    DASHBOARD_SNAPSHOT_ENABLED = os.getenv('DASHBOARD_SNAPSHOT_ENABLED', 'True').lower() == 'true'
+    DASHBOARD_REFRESH_INTERVAL = float(os.getenv('DASHBOARD_REFRESH_INTERVAL', 30))
+    DASHBOARD_CHANGE_POLL_INTERVAL = float(os.getenv('DASHBOARD_CHANGE_POLL_INTERVAL', 1))
+    
+    # Change Events (SSE) Configuration
+    EVENTS_POLL_INTERVAL = float(os.getenv('EVENTS_POLL_INTERVAL', 0.25))
+    EVENTS_HEARTBEAT_INTERVAL = float(os.getenv('EVENTS_HEARTBEAT_INTERVAL', 15))
+    EVENTS_MAX_FEED_BYTES = int(os.getenv('EVENTS_MAX_FEED_BYTES', 1048576))
+    EVENTS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv('EVENTS_SUBSCRIBER_QUEUE_SIZE', 256))
+    # Open /events streams per WSGI worker; each holds a thread, so keep well below GUNICORN_THREADS
+    EVENTS_MAX_SUBSCRIBERS = int(os.getenv('EVENTS_MAX_SUBSCRIBERS', 4))
+    
+    # Password Hashing Executor (per gunicorn worker; 0 workers hashes inline)
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 8))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 2))
+    
     # Admin Initialization
     ADMIN_INIT_PASSWORD = get_secret('ADMIN_INIT_PASSWORD', None)
     
@@ -91,6 +168,8 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     MYSQL_DB = 'claims_test'
+    DASHBOARD_SNAPSHOT_ENABLED = False
+    PASSWORD_HASH_WORKERS = 0
 
 
 # Configuration dictionary
@@ -0,0 +1,67 @@
+"""
+Email Worker for CLAIMS Backend
+Drains the email outbox outside the web workers.
+
+Run alongside gunicorn:
+    python email_worker.py
+
+Use --once to send everything currently due and exit. To try the full
+flow locally, point MAIL_SERVER/MAIL_PORT at an SMTP stand-in such as
+`python -m aiosmtpd -n -l localhost:8025` with MAIL_USE_TLS=False.
+"""
+import argparse
+import os
+import signal
+import threading
+from app import create_app
+from services.email_outbox import process_batch
+from services.email_service import SMTPBatchSender
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def run_worker(app, once=False):
+    """
+    Send outbox emails until stopped.
+
+    Args:
+        app: Flask application instance
+        once: Exit as soon as no emails are due
+    """
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    poll_interval = app.config['EMAIL_WORKER_POLL_INTERVAL']
+    # One SMTP connection kept open across batches
+    sender = SMTPBatchSender.from_config(app.config)
+    logger.info(f'Email worker started (pid {os.getpid()})')
+
+    while not stop.is_set():
+        try:
+            with app.app_context():
+                processed = process_batch(app.config, sender)
+        except Exception as e:
+            logger.error(f'Email worker error: {str(e)}')
+            processed = 0
+
+        if processed:
+            # More may be due; keep draining
+            continue
+        if once:
+            break
+        stop.wait(poll_interval)
+
+    with app.app_context():
+        sender.close()
+    logger.info(f'Email worker stopped ({sender.sent} sent over {sender.connections} connections)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CLAIMS email outbox worker')
+    parser.add_argument('--once', action='store_true', help='send all due emails and exit')
+    args = parser.parse_args()
+
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    run_worker(app, once=args.once)
@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for CLAIMS backend.
+
+The app is created once in the master (preload_app), so the run-once
+startup work (connection test, admin account check, email config check,
+template compilation) happens there, and workers start as plain forks
+that share the master's memory copy-on-write:
+
+- the master's garbage collector is disabled while the app loads; the
+  loaded heap is frozen (gc.freeze) and collection re-enabled once the
+  server is ready, and frozen again before each fork, so collections in
+  the workers never write to the shared pages;
+- pre_fork closes the master's pooled database connections, so no socket
+  is shared with a worker;
+- post_fork resets the pools and rate limiter storage (app.init_worker);
+  connections are opened on first use.
+
+Run from the backend directory:
+    gunicorn --config gunicorn.conf.py
+"""
+import gc
+import os
+
+wsgi_app = 'wsgi:app'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+# Threaded workers. Each open /events stream holds a thread, so a worker
+# serves at most EVENTS_MAX_SUBSCRIBERS of them; run asgi.py (uvicorn) to
+# serve many open dashboards
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+timeout = 120
+accesslog = '-'
+errorlog = '-'
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+# No collections while the app loads; when_ready freezes and re-enables
+gc.disable()
+
+
+def when_ready(server):
+    """Freeze the loaded app, then collect normally in the master."""
+    gc.freeze()
+    gc.enable()
+
+
+def pre_fork(server, worker):
+    """Leave nothing in the master that a worker must not inherit."""
+    from services.database import dispose_pools
+
+    dispose_pools()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Set up the worker's own connections."""
+    gc.enable()
+
+    # server.app.callable is the preloaded Flask app (None without preload)
+    app = server.app.callable
+    if app is not None:
+        from app import init_worker
+
+        init_worker(app)
+        server.log.info(f'Worker {worker.pid} initialized from the preloaded app')
@@ -3,12 +3,54 @@ Admin initialization service for CLAIMS backend.
 Ensures at least one admin account exists on startup.
 """
 from datetime import datetime
-from werkzeug.security import generate_password_hash
-from .database import execute_query
+from werkzeug.security import check_password_hash, generate_password_hash
+from .database import execute_query, get_db_cursor
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Bootstrap admin account, replaced through /update_default_admin
+DEFAULT_ADMIN_ID = "0"
+DEFAULT_ADMIN_EMAIL = "admin@example.com"
+DEFAULT_ADMIN_PASSWORD = "changeme"
+
+
+def has_default_credentials(user_id, email=None, password=None, password_hash=None):
+    """
+    Check whether an account is still on the default admin credentials.
+    
+    This is the rule behind users.must_change_credentials: the default ID,
+    the default email and the default password. Only the default ID can
+    match, so other accounts are answered without a query or hashing.
+    
+    Args:
+        user_id: Account ID
+        email: Account email; None loads the stored one
+        password: Plaintext password when known (e.g. just set)
+        password_hash: Stored password hash; loaded when neither password
+            nor password_hash is given
+        
+    Returns:
+        bool: True if the account must change its credentials
+    """
+    if str(user_id) != DEFAULT_ADMIN_ID:
+        return False
+    
+    if email is None or (password is None and password_hash is None):
+        row = execute_query(
+            "SELECT email, password_hash FROM users WHERE id = %s", (user_id,), fetch_one=True, commit=False
+        )
+        if not row:
+            return False
+        email = row[0] if email is None else email
+        password_hash = row[1] if password_hash is None else password_hash
+    
+    if email != DEFAULT_ADMIN_EMAIL:
+        return False
+    if password is not None:
+        return password == DEFAULT_ADMIN_PASSWORD
+    return check_password_hash(password_hash, DEFAULT_ADMIN_PASSWORD)
+
 
 def check_admin_exists():
     """
@@ -36,6 +78,8 @@ def check_admin_exists():
 def create_default_admin():
     """
     Create a default admin account with predefined credentials.
+    must_change_credentials is set by has_default_credentials, so only an
+    account created with the "changeme" password is flagged.
     
     Default credentials:
         - id: 0
@@ -54,9 +98,9 @@ def create_default_admin():
         from flask import current_app
         
         # Default admin credentials
-        admin_id = "0"
+        admin_id = DEFAULT_ADMIN_ID
         admin_name = "admin"
-        admin_email = "admin@example.com"
+        admin_email = DEFAULT_ADMIN_EMAIL
         admin_role = "admin"
         # Get password from config (which handles secrets)
         admin_password = current_app.config.get('ADMIN_INIT_PASSWORD')
@@ -68,12 +112,14 @@ def create_default_admin():
         # Hash the password
         hashed_password = generate_password_hash(admin_password, method='pbkdf2:sha256')
         
+        must_change = has_default_credentials(admin_id, admin_email, password=admin_password)
+        
         # Insert default admin
         query = """
-            INSERT INTO users (id, name, email, password_hash, role, year, profile_image) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            INSERT INTO users (id, name, email, password_hash, must_change_credentials, role, year, profile_image) 
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
-        execute_query(query, (admin_id, admin_name, admin_email, hashed_password, admin_role, admin_year, ''))
+        execute_query(query, (admin_id, admin_name, admin_email, hashed_password, must_change, admin_role, admin_year, ''))
         
         logger.info('=' * 60)
         logger.info('DEFAULT ADMIN ACCOUNT CREATED')
@@ -90,6 +136,39 @@ def create_default_admin():
         return False
 
 
+def backfill_credential_flags():
+    """
+    Compute must_change_credentials for existing users.
+    
+    A user is flagged when has_default_credentials holds, matching what
+    /check_default_credentials used to compute per request. Only default
+    admin rows are hashed; every other row is cleared.
+    
+    Returns:
+        int: Number of users flagged
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "SELECT id, password_hash FROM users WHERE id = %s AND email = %s FOR UPDATE",
+            (DEFAULT_ADMIN_ID, DEFAULT_ADMIN_EMAIL)
+        )
+        flagged = [
+            user_id for user_id, password_hash in cursor.fetchall()
+            if has_default_credentials(user_id, DEFAULT_ADMIN_EMAIL, password_hash=password_hash)
+        ]
+        
+        if flagged:
+            cursor.execute(
+                f"UPDATE users SET must_change_credentials = id IN ({', '.join(['%s'] * len(flagged))})",
+                tuple(flagged)
+            )
+        else:
+            cursor.execute("UPDATE users SET must_change_credentials = 0 WHERE must_change_credentials = 1")
+    
+    logger.info(f'Credential flags backfilled: {len(flagged)} user(s) must change credentials')
+    return len(flagged)
+
+
 def initialize_admin():
     """
     Main initialization function to ensure admin account exists.
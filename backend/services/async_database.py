@@ -0,0 +1,236 @@
+"""
+Async database service for CLAIMS backend.
+aiomysql connection pool for the ASGI read path (asgi.py).
+
+Only read-only queries run here. Connections are in autocommit mode, so
+each statement sees the latest committed data and no transaction stays
+open between calls. The pool is created on ASGI startup in each worker
+process, separately from services.database's pool, and is sized by
+ASYNC_DB_POOL_SIZE. Waiting for a connection is bounded by DB_POOL_TIMEOUT
+and raises the same PoolTimeoutError as the sync pool. Statements are
+reported to services.query_stats (slow-query log). Reads whose results
+must agree with each other use fetch_consistent, which opens a snapshot
+transaction for them.
+"""
+import asyncio
+import time
+import aiomysql
+from .connection_pool import PoolTimeoutError
+from .database import StreamTimeoutError
+from .logger import get_logger
+from .query_stats import record_statement
+
+logger = get_logger(__name__)
+
+# Per-process aiomysql pool, set up by init_async_db
+pool = None
+
+_settings = {
+    'timeout': 30,
+    'batch_size': 500,
+    'stream_max_seconds': 120,
+}
+
+
+async def init_async_db(app):
+    """
+    Create the async connection pool.
+
+    Args:
+        app: Flask application instance (for its config)
+    """
+    global pool
+
+    _settings.update({
+        'timeout': app.config['DB_POOL_TIMEOUT'],
+        'batch_size': app.config['DB_STREAM_BATCH_SIZE'],
+        'stream_max_seconds': app.config['DB_STREAM_MAX_SECONDS'],
+    })
+    size = app.config['ASYNC_DB_POOL_SIZE'] or app.config['DB_POOL_SIZE']
+
+    pool = await aiomysql.create_pool(
+        host=app.config['MYSQL_HOST'],
+        user=app.config['MYSQL_USER'],
+        password=app.config['MYSQL_PASSWORD'],
+        db=app.config['MYSQL_DB'],
+        minsize=1,
+        maxsize=size,
+        pool_recycle=app.config['DB_POOL_RECYCLE'],
+        autocommit=True,
+        charset='utf8mb4'
+    )
+    logger.info(f'Async database pool initialized (size={size})')
+
+
+async def close_async_db():
+    """Close the async connection pool."""
+    global pool
+
+    if pool is None:
+        return
+    pool.close()
+    await pool.wait_closed()
+    pool = None
+
+
+async def _acquire():
+    """
+    Acquire a connection, waiting at most DB_POOL_TIMEOUT seconds.
+
+    Raises:
+        PoolTimeoutError: If no connection became available in time
+    """
+    try:
+        return await asyncio.wait_for(pool.acquire(), _settings['timeout'])
+    except asyncio.TimeoutError:
+        raise PoolTimeoutError(
+            f'No database connection available within {_settings["timeout"]}s '
+            f'({pool.size - pool.freesize} in use)'
+        ) from None
+
+
+async def fetch_one(query, params=None):
+    """
+    Run a read query and return its first row.
+
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+
+    Returns:
+        tuple: Row, or None
+    """
+    conn = await _acquire()
+    try:
+        async with conn.cursor() as cursor:
+            started = time.perf_counter()
+            await cursor.execute(query, params)
+            row = await cursor.fetchone()
+            record_statement(query, time.perf_counter() - started, 0 if row is None else 1)
+            return row
+    except Exception as e:
+        logger.error(f'Async query execution failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        raise
+    finally:
+        await pool.release(conn)
+
+
+async def fetch_all(query, params=None):
+    """
+    Run a read query and return all rows.
+
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+
+    Returns:
+        list: Row tuples
+    """
+    conn = await _acquire()
+    try:
+        async with conn.cursor() as cursor:
+            started = time.perf_counter()
+            await cursor.execute(query, params)
+            rows = await cursor.fetchall()
+            record_statement(query, time.perf_counter() - started, len(rows))
+            return list(rows)
+    except Exception as e:
+        logger.error(f'Async query execution failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        raise
+    finally:
+        await pool.release(conn)
+
+
+async def fetch_consistent(*queries):
+    """
+    Run several read queries on one connection, in a read-only transaction
+    with a consistent snapshot, so their results describe the same commit.
+
+    Args:
+        *queries: SQL query strings (no parameters)
+
+    Returns:
+        list: One list of row tuples per query
+    """
+    conn = await _acquire()
+    try:
+        async with conn.cursor() as cursor:
+            query = "START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY"
+            await cursor.execute(query)
+            results = []
+            for query in queries:
+                started = time.perf_counter()
+                await cursor.execute(query)
+                rows = await cursor.fetchall()
+                record_statement(query, time.perf_counter() - started, len(rows))
+                results.append(list(rows))
+            await conn.commit()
+            return results
+    except Exception as e:
+        logger.error(f'Async snapshot read failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        # Don't return a connection with the transaction still open
+        conn.close()
+        raise
+    finally:
+        await pool.release(conn)
+
+
+async def stream_query(query, params=None, batch_size=None):
+    """
+    Run a read query on an unbuffered cursor and yield its rows in batches.
+    Async counterpart of services.database.stream_query.
+
+    The connection stays acquired until the generator is exhausted or
+    closed (aclose()), for at most DB_STREAM_MAX_SECONDS, after which the
+    consumer gets StreamTimeoutError. If it is closed early the connection
+    is dropped rather than drained.
+
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+        batch_size: Rows per batch (default DB_STREAM_BATCH_SIZE)
+
+    Yields:
+        list: Up to batch_size row tuples
+    """
+    conn = await _acquire()
+    max_seconds = _settings['stream_max_seconds']
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    cursor = None
+    finished = False
+    fetched = 0
+    server_seconds = 0.0
+    try:
+        cursor = await conn.cursor(aiomysql.SSCursor)
+        started = time.perf_counter()
+        await cursor.execute(query, params)
+
+        while True:
+            rows = await cursor.fetchmany(batch_size or _settings['batch_size'])
+            server_seconds += time.perf_counter() - started
+            if not rows:
+                break
+            fetched += len(rows)
+            yield list(rows)
+            if deadline is not None and time.monotonic() > deadline:
+                raise StreamTimeoutError(
+                    f'Streamed read held its connection for more than {max_seconds}s '
+                    f'({fetched} rows sent)'
+                )
+            started = time.perf_counter()
+        finished = True
+    except Exception as e:
+        logger.error(f'Async streaming query failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        raise
+    finally:
+        record_statement(query, server_seconds, fetched)
+        if finished:
+            await cursor.close()
+        else:
+            # Unread rows would have to be drained first; drop the connection instead
+            conn.close()
+        await pool.release(conn)
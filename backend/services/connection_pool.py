@@ -0,0 +1,319 @@
+"""
+Connection pool for CLAIMS backend.
+Blocking, instrumented replacement for mysql.connector's MySQLConnectionPool.
+
+Unlike MySQLConnectionPool, checking out a connection waits (up to a timeout)
+when the pool is exhausted instead of failing immediately, the pool can grow
+past its base size by a bounded overflow, and connections are recycled after
+a maximum lifetime or idle period. A cheap ping replaces the full session
+reset on checkout, and only for connections that have sat idle for a while.
+"""
+import bisect
+import threading
+import time
+import mysql.connector
+from mysql.connector.errors import PoolError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (milliseconds) of the wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became available within the pool timeout."""
+
+
+class _PoolEntry:
+    """A raw connection plus the bookkeeping needed to recycle it."""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class PooledConnection:
+    """
+    Connection handed out by ClaimsConnectionPool.
+
+    Behaves like the underlying MySQL connection, except that close()
+    returns it to the pool instead of disconnecting.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise PoolError('Connection has already been returned to the pool')
+        return getattr(entry.conn, name)
+
+    def close(self):
+        """Return the connection to the pool. Safe to call more than once."""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def discard(self):
+        """
+        Disconnect instead of returning the connection to the pool, e.g.
+        when it still has unread results that a rollback would have to drain.
+        """
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._discard(entry)
+
+
+class ClaimsConnectionPool:
+    """
+    Thread-safe MySQL connection pool with bounded waiting and live stats.
+
+    Args:
+        pool_size: Number of connections kept open when idle
+        max_overflow: Extra connections allowed under load, closed on return
+        timeout: Seconds to wait for a connection before raising
+            PoolTimeoutError
+        recycle: Maximum connection lifetime in seconds
+        idle_timeout: Idle connections older than this are closed
+        ping_interval: Connections idle longer than this are pinged on
+            checkout
+        **connect_args: Arguments passed to mysql.connector.connect
+    """
+
+    def __init__(self, pool_size=10, max_overflow=10, timeout=30, recycle=3600,
+                 idle_timeout=300, ping_interval=30, **connect_args):
+        if pool_size < 1:
+            raise ValueError('pool_size must be at least 1')
+
+        self.pool_size = pool_size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self._connect_args = connect_args
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        # Counters
+        self._checkouts = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_pings = 0
+        self._wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def max_connections(self):
+        return self.pool_size + self.max_overflow
+
+    def get_connection(self, timeout=None):
+        """
+        Check out a connection, waiting for one to be released if needed.
+
+        Args:
+            timeout: Seconds to wait; defaults to the pool timeout
+
+        Returns:
+            PooledConnection
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        entry = None
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        # LIFO keeps a warm working set and lets extras idle out
+                        entry = self._idle.pop()
+                        break
+                    if self._total < self.max_connections:
+                        self._total += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f'No database connection available within {timeout}s '
+                            f'({self._in_use} in use, {self._waiting - 1} waiting)'
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+            self._checkouts += 1
+            self._record_wait(time.monotonic() - started)
+
+        try:
+            entry = self._connect() if entry is None else self._validate(entry)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, entry)
+
+    def _connect(self):
+        """Open a new raw connection."""
+        return _PoolEntry(mysql.connector.connect(**self._connect_args))
+
+    def _validate(self, entry):
+        """
+        Make sure a pooled connection is still usable, replacing it if it
+        has exceeded its lifetime or fails a liveness check.
+        """
+        now = time.monotonic()
+
+        if self.recycle and now - entry.created_at > self.recycle:
+            with self._cond:
+                self._recycled += 1
+            self._close_quietly(entry)
+            return self._connect()
+
+        if self.ping_interval is not None and now - entry.last_used > self.ping_interval:
+            try:
+                entry.conn.ping(reconnect=False)
+            except Exception as e:
+                with self._cond:
+                    self._failed_pings += 1
+                logger.warning(f'Pooled connection failed liveness check, reconnecting: {str(e)}')
+                self._close_quietly(entry)
+                return self._connect()
+
+        return entry
+
+    def _release(self, entry):
+        """Return a connection to the pool."""
+        discard = []
+        try:
+            # End any transaction the caller left open
+            if entry.conn.in_transaction:
+                entry.conn.rollback()
+        except Exception as e:
+            logger.warning(f'Discarding connection that failed to roll back: {str(e)}')
+            discard.append(entry)
+            entry = None
+
+        with self._cond:
+            self._in_use -= 1
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                if len(self._idle) < self.pool_size or self._waiting:
+                    self._idle.append(entry)
+                else:
+                    # Overflow connection no longer needed
+                    discard.append(entry)
+            discard.extend(self._expire_idle())
+            self._total -= len(discard)
+            self._cond.notify()
+
+        for stale in discard:
+            self._close_quietly(stale)
+
+    def _discard(self, entry):
+        """Close a checked-out connection and free its slot."""
+        with self._cond:
+            self._in_use -= 1
+            self._total -= 1
+            self._cond.notify()
+        self._close_quietly(entry)
+
+    def _expire_idle(self):
+        """Remove idle connections past idle_timeout. Caller holds the lock."""
+        if not self.idle_timeout or not self._idle:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [e for e in self._idle if e.last_used < cutoff]
+        if expired:
+            self._idle = [e for e in self._idle if e.last_used >= cutoff]
+        return expired
+
+    def _record_wait(self, seconds):
+        """Add a checkout wait to the histogram. Caller holds the lock."""
+        ms = seconds * 1000
+        self._wait_histogram[bisect.bisect_left(WAIT_BUCKETS_MS, ms)] += 1
+        self._wait_total += ms
+        self._wait_max = max(self._wait_max, ms)
+
+    @staticmethod
+    def _close_quietly(entry):
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """
+        Get a snapshot of pool usage.
+
+        Returns:
+            dict: Current usage, counters and the checkout wait histogram
+        """
+        with self._cond:
+            labels = [f'<={b}ms' for b in WAIT_BUCKETS_MS] + [f'>{WAIT_BUCKETS_MS[-1]}ms']
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'total': self._total,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'failed_pings': self._failed_pings,
+                'wait_ms': {
+                    'avg': round(self._wait_total / self._checkouts, 3) if self._checkouts else 0.0,
+                    'max': round(self._wait_max, 3),
+                    'histogram': dict(zip(labels, self._wait_histogram)),
+                },
+            }
+
+    def dispose(self):
+        """Close all idle connections. Checked-out connections close on return."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+        for entry in idle:
+            self._close_quietly(entry)
+
+    def reset_after_fork(self):
+        """
+        Start over with no connections in a forked child process.
+
+        Connections inherited through fork share their socket with the
+        parent, so they are forgotten rather than closed (closing would send
+        COM_QUIT on the parent's socket). dispose() in the parent before
+        forking leaves nothing to forget. The lock is replaced as well,
+        since it may have been held by another thread at fork time.
+        """
+        if self._idle or self._in_use:
+            logger.warning(
+                f'Pool reset after fork dropped {len(self._idle)} idle and '
+                f'{self._in_use} checked-out inherited connections'
+            )
+        self._cond = threading.Condition()
+        self._idle = []
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
@@ -0,0 +1,441 @@
+"""
+Dashboard service for CLAIMS backend.
+Builds the aggregated dashboard payload served by /get_data.
+
+The payload is precomputed in the background and shared by all gunicorn
+workers through a memory-mapped snapshot file:
+
+- Every worker runs a refresher thread, but only the one holding an
+  exclusive flock on the lock file builds snapshots; the others take over
+  if it dies.
+- The leader rebuilds on an interval, and shortly after a write endpoint
+  touches the change marker (see mark_dashboard_changed).
+- Snapshots are written to a temp file and atomically renamed into place.
+  Readers mmap the file and cache the bytes until it changes, so serving
+  /get_data costs one stat() and never touches MySQL.
+- The generation and build time live in the file header, not in the
+  payload, so unchanged data serializes to the same bytes (and ETag)
+  however often it is rebuilt.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+from flask import current_app, request
+from .database import execute_query, on_commit
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Snapshot file header: magic, generation, build timestamp, payload length
+SNAPSHOT_HEADER = struct.Struct('<8sQdI')
+SNAPSHOT_MAGIC = b'CLMSDASH'
+
+SNAPSHOT_FILE = 'dashboard.snapshot'
+LOCK_FILE = 'dashboard.lock'
+CHANGE_MARKER_FILE = 'dashboard.changed'
+
+# Per-process state, set up by init_dashboard
+_settings = {}
+_refresher = None
+_refresher_lock = threading.Lock()
+_reader = None
+
+# computer_parts.status -> payload key
+STATUS_KEYS = {
+    'operational': 'operational',
+    'not_operational': 'notOperational',
+    'damaged': 'damaged',
+    'missing': 'missing'
+}
+
+
+# Aggregates behind the dashboard; shared with the async read path (asgi.py)
+TOTALS_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM users),
+        (SELECT COUNT(*) FROM reports),
+        (SELECT COUNT(*) FROM computers),
+        (SELECT COUNT(*) FROM laboratories)
+"""
+
+# Use category for grouping, fallback to name if category is empty.
+# Binary collation keeps differently cased values (e.g. "Monitor" and
+# "monitor") apart, as the per-row grouping did; the table's general_ci
+# collation would merge them.
+# Ordered by first appearance to keep the original category order.
+PART_COUNTS_QUERY = """
+    SELECT COALESCE(NULLIF(category, ''), name) COLLATE utf8mb4_bin AS part_category, status, COUNT(*)
+    FROM computer_parts
+    GROUP BY part_category, status
+    ORDER BY MIN(id)
+"""
+
+LAB_COUNTS_QUERY = """
+    SELECT
+        l.id,
+        l.name,
+        COUNT(DISTINCT c.id),
+        COUNT(CASE WHEN p.status = 'damaged' THEN 1 END),
+        COUNT(CASE WHEN p.status = 'missing' THEN 1 END)
+    FROM laboratories l
+    LEFT JOIN computers c ON c.lab_id = l.id
+    LEFT JOIN computer_parts p ON p.computer_id = c.id AND p.status IN ('damaged', 'missing')
+    GROUP BY l.id, l.name
+    ORDER BY l.id
+"""
+
+
+def build_dashboard_data():
+    """
+    Build the dashboard payload with a few GROUP BY queries.
+
+    Only counts per status, part category and lab leave the database, so
+    the cost scales with the number of labs and categories rather than the
+    number of parts and reports.
+
+    Returns:
+        dict: stats, computerPartStatus, labEquipments and damageMissing
+    """
+    totals = execute_query(TOTALS_QUERY, fetch_one=True, commit=False)
+    part_counts = execute_query(PART_COUNTS_QUERY, fetch_all=True, commit=False)
+    lab_counts = execute_query(LAB_COUNTS_QUERY, fetch_all=True, commit=False)
+    return assemble_dashboard_data(totals, part_counts, lab_counts)
+
+
+def assemble_dashboard_data(totals, part_counts, lab_counts):
+    """
+    Shape the results of the dashboard queries into the payload.
+
+    Args:
+        totals: TOTALS_QUERY row
+        part_counts: PART_COUNTS_QUERY rows
+        lab_counts: LAB_COUNTS_QUERY rows
+
+    Returns:
+        dict: stats, computerPartStatus, labEquipments and damageMissing
+    """
+    total_users, total_reports, total_computers, total_labs = totals
+
+    # --- Stats and Computer Part Status (Group by category) ---
+    status_totals = {key: 0 for key in STATUS_KEYS.values()}
+    part_stats = {}
+    for category, status, count in part_counts:
+        if category not in part_stats:
+            part_stats[category] = {'name': category, 'operational': 0, 'notOperational': 0, 'missing': 0, 'damaged': 0}
+
+        key = STATUS_KEYS.get(status)
+        if key:
+            part_stats[category][key] += count
+            status_totals[key] += count
+
+    result = {
+        'stats': {
+            'operational': status_totals['operational'],
+            'damaged': status_totals['damaged'],
+            'missing': status_totals['missing'],
+            'notOperational': status_totals['notOperational'],
+            'totalComputers': total_computers,
+            'totalLabs': total_labs,
+            'reportsSubmitted': total_reports,
+            'totalUsers': total_users
+        },
+        'computerPartStatus': list(part_stats.values()),
+        # --- Lab Equipments (Computers per lab) ---
+        'labEquipments': [
+            {'name': name, 'computers': computers}
+            for _, name, computers, _, _ in lab_counts
+        ],
+        # --- Damage vs Missing per Lab ---
+        'damageMissing': [
+            {'name': name, 'damaged': damaged, 'missing': missing}
+            for _, name, _, damaged, missing in lab_counts
+        ]
+    }
+
+    return result
+
+
+def _path(name):
+    return os.path.join(_settings['dir'], name)
+
+
+def write_snapshot(path, generation, built_at, payload):
+    """
+    Atomically publish a snapshot file.
+
+    Args:
+        path: Snapshot file path
+        generation: Snapshot generation number
+        built_at: Build time (UNIX timestamp)
+        payload: Serialized JSON bytes
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation, built_at, len(payload)))
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_header(path):
+    """
+    Read a snapshot's generation and build time without loading the payload.
+
+    Returns:
+        tuple: (generation, built_at) or (0, 0.0) if missing or invalid
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic, generation, built_at, _ = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+        if magic == SNAPSHOT_MAGIC:
+            return generation, built_at
+    except (OSError, struct.error):
+        pass
+    return 0, 0.0
+
+
+class SnapshotReader:
+    """
+    Serves the shared snapshot, re-mapping the file only when it changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._key = None
+        self._payload = None
+        self._built_at = 0.0
+
+    def read(self, max_age=None):
+        """
+        Get the current snapshot payload.
+
+        Args:
+            max_age: Ignore snapshots older than this many seconds
+
+        Returns:
+            bytes: Serialized payload, or None if no usable snapshot exists
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key != self._key:
+                if not self._load(key):
+                    return None
+
+            if max_age is not None and time.time() - self._built_at > max_age:
+                return None
+            return self._payload
+
+    def _load(self, key):
+        """Map the snapshot file and cache its payload. Caller holds the lock."""
+        try:
+            with open(self.path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    magic, _, built_at, length = SNAPSHOT_HEADER.unpack_from(mm)
+                    if magic != SNAPSHOT_MAGIC:
+                        return False
+                    self._payload = mm[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length]
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f'Failed to read dashboard snapshot: {str(e)}')
+            return False
+
+        self._key = key
+        self._built_at = built_at
+        return True
+
+
+class DashboardRefresher(threading.Thread):
+    """
+    Background thread that rebuilds the snapshot while holding leadership.
+    """
+
+    def __init__(self, app):
+        super().__init__(name='dashboard-refresher', daemon=True)
+        self.app = app
+        self.pid = os.getpid()
+        self.interval = _settings['interval']
+        self.poll_interval = _settings['poll_interval']
+        self._lock_file = None
+        self._last_build = 0.0
+        self._last_marker = None
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self._lock_file is not None or self._acquire_leadership():
+                    marker = self._marker_key()
+                    due = time.monotonic() - self._last_build >= self.interval
+                    if due or marker != self._last_marker:
+                        self._last_marker = marker
+                        self.refresh()
+            except Exception as e:
+                # Retry on the next interval (or change) rather than every tick
+                self._last_build = time.monotonic()
+                logger.error(f'Dashboard refresh failed: {str(e)}')
+            self._stop_event.wait(self.poll_interval)
+
+    def _acquire_leadership(self):
+        """Try to become the single snapshot builder."""
+        lock_file = open(_path(LOCK_FILE), 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f'Dashboard refresher leadership acquired by pid {self.pid}')
+        return True
+
+    @staticmethod
+    def _marker_key():
+        try:
+            return os.stat(_path(CHANGE_MARKER_FILE)).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Build and publish a new snapshot."""
+        started = time.monotonic()
+        snapshot_path = _path(SNAPSHOT_FILE)
+        generation = read_snapshot_header(snapshot_path)[0] + 1
+
+        with self.app.app_context():
+            payload = serialize_dashboard(self.app, build_dashboard_data())
+
+        write_snapshot(snapshot_path, generation, time.time(), payload)
+        self._last_build = time.monotonic()
+        logger.debug(
+            f'Dashboard snapshot {generation} published '
+            f'({len(payload)} bytes, {round((self._last_build - started) * 1000, 1)}ms)'
+        )
+
+
+def serialize_dashboard(app, data):
+    """
+    Serialize a dashboard payload.
+
+    Keys are sorted, so equal data always gives equal bytes; /get_data
+    derives its ETag from them.
+
+    Returns:
+        bytes: JSON payload
+    """
+    return app.json.dumps(data).encode('utf-8')
+
+
+def init_dashboard(app):
+    """
+    Configure the shared dashboard snapshot.
+
+    The refresher thread is started lazily on the first request of each
+    worker process, so it is never started in (or inherited from) a parent
+    process that forks workers.
+
+    Args:
+        app: Flask application instance
+    """
+    global _reader
+
+    if not app.config.get('DASHBOARD_SNAPSHOT_ENABLED', True):
+        logger.info('Dashboard snapshots disabled; /get_data will query live')
+        return
+
+    state_dir = app.config['SHARED_STATE_DIR']
+    os.makedirs(state_dir, exist_ok=True)
+
+    _settings.update({
+        'dir': state_dir,
+        'interval': app.config['DASHBOARD_REFRESH_INTERVAL'],
+        'poll_interval': app.config['DASHBOARD_CHANGE_POLL_INTERVAL'],
+    })
+    _reader = SnapshotReader(_path(SNAPSHOT_FILE))
+
+    @app.before_request
+    def ensure_dashboard_refresher():
+        start_refresher(app)
+
+    logger.info(f'Dashboard snapshots enabled in {state_dir}')
+
+
+def start_refresher(app):
+    """Start this process's refresher thread if it is not running."""
+    global _refresher
+
+    if not _settings:
+        return
+    if _refresher is not None and _refresher.pid == os.getpid():
+        return
+    with _refresher_lock:
+        if _refresher is None or _refresher.pid != os.getpid():
+            _refresher = DashboardRefresher(app)
+            _refresher.start()
+
+
+def mark_dashboard_changed():
+    """
+    Signal the refresher that dashboard data changed.
+    Touches the shared change marker; cheap enough to call on every write.
+    """
+    if not _settings:
+        return
+    try:
+        with open(_path(CHANGE_MARKER_FILE), 'a'):
+            pass
+        os.utime(_path(CHANGE_MARKER_FILE))
+    except OSError as e:
+        logger.warning(f'Failed to mark dashboard as changed: {str(e)}')
+
+
+def track_dashboard_changes(blueprint):
+    """
+    Mark the dashboard as changed after every successful write request
+    handled by a blueprint, once its transaction has committed.
+
+    Args:
+        blueprint: Flask blueprint whose non-GET endpoints modify dashboard data
+    """
+    @blueprint.after_request
+    def notify_dashboard(response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            on_commit(mark_dashboard_changed)
+        return response
+
+
+def get_dashboard_payload():
+    """
+    Get the serialized dashboard payload.
+
+    Served from the shared snapshot when available and fresh; otherwise
+    built live.
+
+    Returns:
+        bytes: JSON payload
+    """
+    payload = read_dashboard_snapshot()
+    if payload is not None:
+        return payload
+
+    return serialize_dashboard(current_app, build_dashboard_data())
+
+
+def read_dashboard_snapshot():
+    """
+    Get the shared snapshot's payload if snapshots are enabled and fresh.
+
+    Returns:
+        bytes: JSON payload, or None
+    """
+    if _reader is None:
+        return None
+    return _reader.read(max_age=_settings['interval'] * 3)
@@ -0,0 +1,174 @@
+"""
+Data versioning service for CLAIMS backend.
+Per-table version counters used to build ETags for read endpoints.
+
+Counters live in a small memory-mapped file in SHARED_STATE_DIR so every
+gunicorn worker sees the same versions. Write paths bump the tables they
+touched once their transaction commits (bump_versions); read endpoints
+derive a strong ETag from the versions they depend on (compute_etag) and
+can answer 304 Not Modified without querying the database.
+
+The file also holds a random epoch created with it, so versions from a
+previous deployment (or a wiped tmpfs) never produce a matching ETag.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from .database import on_commit
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tables with a version counter; the order defines the slot layout
+TABLES = (
+    'users',
+    'laboratories',
+    'computers',
+    'computer_parts',
+    'reports',
+    'technician_logs',
+    'accessories',
+)
+
+VERSIONS_FILE = 'data_versions'
+VERSIONS_MAGIC = b'CLMSVER1'
+EPOCH_SIZE = 16
+COUNTER = struct.Struct('<Q')
+HEADER_SIZE = len(VERSIONS_MAGIC) + EPOCH_SIZE
+FILE_SIZE = HEADER_SIZE + COUNTER.size * len(TABLES)
+
+_SLOTS = {table: HEADER_SIZE + i * COUNTER.size for i, table in enumerate(TABLES)}
+
+_path = None
+_state = {}
+_state_lock = threading.Lock()
+
+
+def init_data_versions(app):
+    """
+    Configure the shared version counters.
+
+    Args:
+        app: Flask application instance
+    """
+    global _path
+
+    state_dir = app.config['SHARED_STATE_DIR']
+    os.makedirs(state_dir, exist_ok=True)
+    _path = os.path.join(state_dir, VERSIONS_FILE)
+    logger.info('Data versioning initialized')
+
+
+def _create_file():
+    """Create the versions file atomically with a fresh epoch."""
+    tmp_path = f'{_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(VERSIONS_MAGIC + os.urandom(EPOCH_SIZE) + bytes(FILE_SIZE - HEADER_SIZE))
+    try:
+        # link() fails if another worker created the file first
+        os.link(tmp_path, _path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+
+
+def _mapping():
+    """
+    Get this process's mapping of the versions file, creating it if needed.
+
+    Returns:
+        tuple: (file object, mmap) or None if versioning is unavailable
+    """
+    if _path is None:
+        return None
+
+    state = _state.get(os.getpid())
+    if state is not None:
+        return state
+
+    with _state_lock:
+        state = _state.get(os.getpid())
+        if state is None:
+            try:
+                if not os.path.exists(_path):
+                    _create_file()
+                f = open(_path, 'r+b')
+                mm = mmap.mmap(f.fileno(), FILE_SIZE)
+                if mm[:len(VERSIONS_MAGIC)] != VERSIONS_MAGIC:
+                    raise ValueError('unrecognized versions file')
+            except (OSError, ValueError) as e:
+                logger.error(f'Data versions unavailable: {str(e)}')
+                return None
+            state = (f, mm)
+            _state.clear()
+            _state[os.getpid()] = state
+    return state
+
+
+def _bump_now(tables):
+    """Increment the counters of the given tables."""
+    state = _mapping()
+    if state is None:
+        return
+    f, mm = state
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        for table in tables:
+            offset = _SLOTS[table]
+            COUNTER.pack_into(mm, offset, COUNTER.unpack_from(mm, offset)[0] + 1)
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def bump_versions(*tables):
+    """
+    Mark tables as changed once the current unit of work commits.
+
+    Bumping after commit (never before) guarantees that a client can not
+    cache data older than the ETag it was served with.
+
+    Args:
+        *tables: Table names from TABLES
+    """
+    unknown = [t for t in tables if t not in _SLOTS]
+    if unknown:
+        raise ValueError(f'Unknown versioned tables: {", ".join(unknown)}')
+    on_commit(lambda: _bump_now(tables))
+
+
+def get_versions(*tables):
+    """
+    Get the current versions of the given tables.
+
+    Returns:
+        tuple: (epoch hex, {table: version}) or None if unavailable
+    """
+    state = _mapping()
+    if state is None:
+        return None
+    _, mm = state
+    epoch = mm[len(VERSIONS_MAGIC):HEADER_SIZE].hex()
+    return epoch, {table: COUNTER.unpack_from(mm, _SLOTS[table])[0] for table in tables}
+
+
+def compute_etag(tables, variant=''):
+    """
+    Build a strong ETag from the versions of the given tables.
+
+    Args:
+        tables: Table names the response depends on
+        variant: Extra discriminator (e.g. the query string)
+
+    Returns:
+        str: ETag value (unquoted), or None if versioning is unavailable
+    """
+    versions = get_versions(*tables)
+    if versions is None:
+        return None
+    epoch, counters = versions
+    key = f'{epoch}:{variant}:' + ','.join(f'{t}={counters[t]}' for t in tables)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
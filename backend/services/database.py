@@ -1,18 +1,71 @@
 """
 Database service for CLAIMS backend.
 Handles MySQL connection using mysql-connector-python.
+
+Inside a request, every helper in this module shares one connection pinned
+to ``flask.g`` (the request's unit of work). It is committed once when the
+request succeeds and rolled back otherwise, so a handler's writes are atomic
+and the pool is only touched once per request. Outside a request (startup
+checks, CLI commands) each call checks out its own connection as before.
+
+Every statement and pool checkout is reported to services.query_stats.
+
+With MYSQL_REPLICA_HOST set, read-only calls (execute_query with
+commit=False, stream_query) made while handling a GET or HEAD request run
+on a second pool pointed at a read replica while it is healthy (see
+services.replica). Everything else reads from the primary:
+
+- requests with other methods, whose reads feed read-modify-write
+  decisions and must see the latest committed data,
+- requests pinned with read_from_primary(), e.g. ETag-versioned endpoints,
+  whose table versions move as soon as the primary commits,
+- a request that already holds a primary connection, so it sees its own
+  writes,
+- code outside a request (the dashboard refresher, CLI commands).
+
+Reads that cannot reach the replica are retried on the primary.
 """
-import mysql.connector
-from mysql.connector import pooling
-from mysql.connector.pooling import MySQLConnectionPool
+import threading
+import time
 from contextlib import contextmanager
+from flask import g, has_request_context, jsonify, request
+from mysql.connector.errors import PoolError
+from .connection_pool import ClaimsConnectionPool
 from .logger import get_logger
+from .replica import CONNECTION_ERRORS, ReplicaMonitor
+from .query_stats import InstrumentedCursor, record_pool_wait, record_statement, timed_statement
 
 logger = get_logger(__name__)
 
 # Global connection pool
 connection_pool = None
 
+# Read replica (ReplicaMonitor wrapping its pool), None when not configured
+replica = None
+
+# Errors after which a replica read is retried on the primary
+REPLICA_FALLBACK_ERRORS = CONNECTION_ERRORS + (PoolError,)
+
+# Per-thread primary_reads() depth
+_local = threading.local()
+
+# Request methods whose reads may be served by the replica
+REPLICA_READ_METHODS = frozenset(('GET', 'HEAD'))
+
+# Pool for stream_query on the primary (None: use connection_pool), so
+# slow downloads can't take connections from other requests
+stream_pool = None
+
+# Rows per fetchmany() call for stream_query
+stream_batch_size = 500
+
+# Seconds a stream_query may keep its connection (0: unbounded)
+stream_max_seconds = 120
+
+
+class StreamTimeoutError(Exception):
+    """Raised when a streamed read holds its connection longer than DB_STREAM_MAX_SECONDS."""
+
 
 def init_db(app):
     """
@@ -21,7 +74,10 @@ def init_db(app):
     Args:
         app: Flask application instance
     """
-    global connection_pool
+    global connection_pool, replica, stream_pool, stream_batch_size, stream_max_seconds
+
+    stream_batch_size = app.config['DB_STREAM_BATCH_SIZE']
+    stream_max_seconds = app.config['DB_STREAM_MAX_SECONDS']
 
     try:
         db_config = {
@@ -29,16 +85,53 @@ def init_db(app):
             'user': app.config['MYSQL_USER'],
             'password': app.config['MYSQL_PASSWORD'],
             'database': app.config['MYSQL_DB'],
-            'pool_name': 'claims_pool',
-            'pool_size': 20,
-            'pool_reset_session': True,
+            'pool_size': app.config['DB_POOL_SIZE'],
+            'max_overflow': app.config['DB_POOL_MAX_OVERFLOW'],
+            'timeout': app.config['DB_POOL_TIMEOUT'],
+            'recycle': app.config['DB_POOL_RECYCLE'],
+            'idle_timeout': app.config['DB_POOL_IDLE_TIMEOUT'],
+            'ping_interval': app.config['DB_POOL_PING_INTERVAL'],
             'autocommit': False,
             'charset': 'utf8mb4',
             'collation': 'utf8mb4_general_ci'
         }
 
-        connection_pool = mysql.connector.pooling.MySQLConnectionPool(**db_config)
-        logger.info('Database connection pool initialized successfully')
+        connection_pool = ClaimsConnectionPool(**db_config)
+        logger.info(
+            f'Database connection pool initialized successfully '
+            f'(size={db_config["pool_size"]}, overflow={db_config["max_overflow"]})'
+        )
+
+        if app.config['DB_STREAM_POOL_SIZE']:
+            stream_pool = ClaimsConnectionPool(
+                **dict(db_config, pool_size=app.config['DB_STREAM_POOL_SIZE'], max_overflow=0)
+            )
+            logger.info(f'Stream connection pool initialized (size={app.config["DB_STREAM_POOL_SIZE"]})')
+
+        if app.config['MYSQL_REPLICA_HOST']:
+            replica_config = dict(
+                db_config,
+                host=app.config['MYSQL_REPLICA_HOST'],
+                port=app.config['MYSQL_REPLICA_PORT'],
+                user=app.config['MYSQL_REPLICA_USER'] or db_config['user'],
+                password=app.config['MYSQL_REPLICA_PASSWORD'] or db_config['password'],
+                pool_size=app.config['DB_REPLICA_POOL_SIZE'] or db_config['pool_size'],
+            )
+            replica = ReplicaMonitor(
+                ClaimsConnectionPool(**replica_config),
+                max_lag=app.config['DB_REPLICA_MAX_LAG'],
+                check_interval=app.config['DB_REPLICA_CHECK_INTERVAL']
+            )
+            logger.info(
+                f'Read replica pool initialized '
+                f'(host={replica_config["host"]}:{replica_config["port"]}, '
+                f'size={replica_config["pool_size"]}, max lag={replica.max_lag}s)'
+            )
+            replica.available()
+
+        # Request-scoped unit of work
+        app.after_request(finish_unit_of_work)
+        app.teardown_request(release_request_connection)
 
         # Test the connection
         test_connection()
@@ -79,12 +172,310 @@ def check_db_connection(app):
     return test_connection()
 
 
+def dispose_pools():
+    """
+    Close the idle connections of the primary and replica pools.
+    Called in a preloading parent process before it forks workers, so no
+    socket is shared with them.
+    """
+    if connection_pool is not None:
+        connection_pool.dispose()
+    if stream_pool is not None:
+        stream_pool.dispose()
+    if replica is not None:
+        replica.pool.dispose()
+
+
+def reset_pools_after_fork():
+    """
+    Reset the pools in a freshly forked worker; connections are opened
+    again on first use.
+    """
+    if connection_pool is not None:
+        connection_pool.reset_after_fork()
+    if stream_pool is not None:
+        stream_pool.reset_after_fork()
+    if replica is not None:
+        replica.reset_after_fork()
+
+
+def get_pool_stats():
+    """
+    Get live connection pool statistics.
+
+    Returns:
+        dict: Pool usage snapshot (with the stream pool's under 'stream'),
+            or empty dict if the pool is not initialized
+    """
+    if connection_pool is None:
+        return {}
+    stats = connection_pool.stats()
+    if stream_pool is not None:
+        stats['stream'] = stream_pool.stats()
+    return stats
+
+
+def get_replica_stats():
+    """
+    Get read replica health and routing statistics.
+
+    Returns:
+        dict: Replica snapshot, or empty dict if no replica is configured
+    """
+    if replica is None:
+        return {}
+    return replica.stats()
+
+
+def _in_unit_of_work():
+    """
+    Check whether the current call should use the request's shared connection.
+
+    Returns:
+        bool: True inside a request that has not opted out
+    """
+    return has_request_context() and not g.get('_db_uow_disabled', False)
+
+
+def _checkout(pool=None):
+    """
+    Check a connection out of a pool, recording the wait.
+
+    Args:
+        pool: Pool to use (default: the primary pool)
+
+    Returns:
+        Pooled MySQL connection
+    """
+    started = time.perf_counter()
+    try:
+        return (pool or connection_pool).get_connection()
+    finally:
+        record_pool_wait(time.perf_counter() - started)
+
+
+def _reads_from_replica():
+    """
+    Check whether a read-only query should run on the replica.
+
+    Returns:
+        bool: True if a healthy replica is configured and the read belongs
+            to a GET/HEAD request that may see slightly stale data
+    """
+    if replica is None or getattr(_local, 'primary_reads', 0):
+        return False
+    if not has_request_context() or request.method not in REPLICA_READ_METHODS:
+        return False
+    if g.get('_db_primary_reads') or g.get('_db_conn') is not None:
+        return False
+
+    if not replica.available():
+        replica.record_fallback()
+        return False
+    return True
+
+
+def read_from_primary():
+    """
+    Pin the rest of the current request's reads to the primary.
+
+    Used by endpoints whose validators (ETags from services.data_versions)
+    advance when the primary commits: a body read from a lagging replica
+    would be cached under the new ETag and revalidated as current.
+    """
+    if has_request_context():
+        g._db_primary_reads = True
+
+
+def _replica_connection(in_uow):
+    """
+    Get a replica connection: the one pinned to the request, checking it
+    out on first use, or a fresh one outside a request.
+    """
+    if not in_uow:
+        return _checkout(replica.pool)
+    conn = g.get('_db_replica_conn')
+    if conn is None:
+        conn = g._db_replica_conn = _checkout(replica.pool)
+    return conn
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the primary for the duration of the block, e.g. for
+    credential checks that must never see a lagging copy.
+
+    Example:
+        with primary_reads():
+            user = execute_query("SELECT ...", (email,), fetch_one=True, commit=False)
+    """
+    _local.primary_reads = getattr(_local, 'primary_reads', 0) + 1
+    try:
+        yield
+    finally:
+        _local.primary_reads -= 1
+
+
+def get_request_connection():
+    """
+    Get the connection pinned to the current request, checking it out of
+    the pool on first use.
+
+    Returns:
+        Pooled MySQL connection
+    """
+    conn = g.get('_db_conn')
+    if conn is None:
+        conn = _checkout()
+        g._db_conn = conn
+        g._db_dirty = False
+    return conn
+
+
+def _mark_dirty():
+    """Record that the request's unit of work contains writes."""
+    g._db_dirty = True
+
+
+def on_commit(callback):
+    """
+    Run a callback once the current unit of work has been committed.
+    Outside a request the callback runs immediately. In a request that
+    never checked out a connection it runs after a successful response
+    (status < 400), as there is nothing to commit; failed responses drop
+    it.
+
+    Args:
+        callback: Callable taking no arguments
+    """
+    if not _in_unit_of_work():
+        callback()
+        return
+    g.setdefault('_db_on_commit', []).append(callback)
+
+
+def _run_commit_callbacks():
+    """Run and clear the callbacks registered with on_commit."""
+    callbacks = g.pop('_db_on_commit', [])
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f'Post-commit callback failed: {str(e)}')
+
+
+def finish_unit_of_work(response):
+    """
+    Commit or roll back the request's unit of work.
+    Registered as an after_request hook by init_db.
+
+    Successful responses (status < 400) are committed; anything else is
+    rolled back. A failed commit turns the response into a 500.
+
+    Args:
+        response: Flask response object
+
+    Returns:
+        Flask response object
+    """
+    conn = g.get('_db_conn')
+    if conn is None:
+        # Nothing to commit; callbacks still follow the response status
+        if response.status_code < 400:
+            _run_commit_callbacks()
+        else:
+            g.pop('_db_on_commit', None)
+        return response
+
+    if response.status_code >= 400:
+        conn.rollback()
+        g.pop('_db_on_commit', None)
+        return response
+
+    try:
+        if g.get('_db_dirty'):
+            conn.commit()
+        else:
+            # Read-only request: just end the transaction
+            conn.rollback()
+    except Exception as e:
+        logger.error(f'Unit of work commit failed: {str(e)}')
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        g.pop('_db_on_commit', None)
+        error = jsonify({
+            "success": False,
+            "message": "Failed to save changes",
+            "error": str(e)
+        })
+        error.status_code = 500
+        return error
+
+    _run_commit_callbacks()
+    return response
+
+
+def release_request_connection(exc=None):
+    """
+    Return the request's connection to the pool.
+    Registered as a teardown_request hook by init_db; rolls back anything
+    that was not committed (e.g. when the handler raised).
+
+    Args:
+        exc: Exception that ended the request, if any
+    """
+    replica_conn = g.pop('_db_replica_conn', None)
+    if replica_conn is not None:
+        replica_conn.close()
+
+    conn = g.pop('_db_conn', None)
+    g.pop('_db_on_commit', None)
+    if conn is None:
+        return
+    try:
+        if exc is not None or conn.in_transaction:
+            conn.rollback()
+    except Exception as e:
+        logger.error(f'Rollback on teardown failed: {str(e)}')
+    finally:
+        conn.close()
+
+
+@contextmanager
+def standalone_connection():
+    """
+    Opt out of the request's unit of work for the duration of the block.
+
+    Calls made inside the block check out their own connection and commit
+    per statement, as outside a request. Use this for long-running streaming
+    reads that should not hold the request's connection or transaction open.
+
+    Example:
+        with standalone_connection():
+            rows = execute_query("SELECT ...", fetch_all=True, commit=False)
+    """
+    previous = g.get('_db_uow_disabled', False) if has_request_context() else None
+    if previous is not None:
+        g._db_uow_disabled = True
+    try:
+        yield
+    finally:
+        if previous is not None:
+            g._db_uow_disabled = previous
+
+
 @contextmanager
 def get_db_cursor(dictionary=False):
     """
     Context manager for database cursor.
     Automatically commits and closes cursor.
 
+    Inside a request the cursor runs on the request's connection and the
+    commit is deferred to the end of the request.
+
     Args:
         dictionary: If True, return rows as dictionaries
 
@@ -96,15 +487,29 @@ def get_db_cursor(dictionary=False):
             cursor.execute("SELECT * FROM users")
             results = cursor.fetchall()
     """
+    if _in_unit_of_work():
+        cursor = None
+        try:
+            cursor = get_request_connection().cursor(dictionary=dictionary)
+            yield InstrumentedCursor(cursor)
+            _mark_dirty()
+        except Exception as e:
+            logger.error(f'Database error: {str(e)}')
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+        return
+
     conn = None
     cursor = None
     try:
-        conn = connection_pool.get_connection()
+        conn = _checkout()
         if dictionary:
             cursor = conn.cursor(dictionary=True)
         else:
             cursor = conn.cursor()
-        yield cursor
+        yield InstrumentedCursor(cursor)
         conn.commit()
     except Exception as e:
         if conn:
@@ -127,7 +532,8 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=T
         params: Query parameters (tuple or dict)
         fetch_one: If True, return single row
         fetch_all: If True, return all rows
-        commit: If True, commit transaction
+        commit: If True, commit transaction (deferred to the end of the
+            request inside a unit of work)
 
     Returns:
         Query results or None
@@ -135,39 +541,173 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=T
     Raises:
         Exception: If query execution fails
     """
+    in_uow = _in_unit_of_work()
+    if not commit and _reads_from_replica():
+        try:
+            return _execute_on_replica(query, params, fetch_one, fetch_all, in_uow)
+        except REPLICA_FALLBACK_ERRORS as e:
+            replica.record_fallback()
+            logger.warning(f'Replica read failed, retrying on the primary: {str(e)}')
+
     conn = None
-    cursor = None
     try:
-        conn = connection_pool.get_connection()
-        cursor = conn.cursor()
-
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-
-        result = None
-        if fetch_one:
-            result = cursor.fetchone()
-        elif fetch_all:
-            result = cursor.fetchall()
+        conn = get_request_connection() if in_uow else _checkout()
+        result = _run_query(conn, query, params, fetch_one, fetch_all)
 
         if commit:
-            conn.commit()
+            if in_uow:
+                _mark_dirty()
+            else:
+                conn.commit()
 
         return result
     except Exception as e:
-        if conn and commit:
+        if conn and commit and not in_uow:
             conn.rollback()
         logger.error(f'Query execution failed: {str(e)}')
         logger.error(f'Query: {query}')
         logger.error(f'Params: {params}')
         raise
     finally:
-        if cursor:
+        if conn and not in_uow:
+            conn.close()
+
+
+def _run_query(conn, query, params, fetch_one, fetch_all):
+    """Execute one statement on conn and fetch its result, as execute_query."""
+    cursor = conn.cursor()
+    try:
+        with timed_statement(query) as rows:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            result = None
+            if fetch_one:
+                result = cursor.fetchone()
+                rows[0] = 0 if result is None else 1
+            elif fetch_all:
+                result = cursor.fetchall()
+                rows[0] = len(result)
+            else:
+                rows[0] = cursor.rowcount
+        return result
+    finally:
+        cursor.close()
+
+
+def _execute_on_replica(query, params, fetch_one, fetch_all, in_uow):
+    """
+    Run a read-only execute_query call on the replica.
+
+    Raises:
+        REPLICA_FALLBACK_ERRORS: If the replica could not serve the read;
+            on connection errors the replica is marked down and the
+            connection dropped
+    """
+    conn = None
+    try:
+        conn = _replica_connection(in_uow)
+        return _run_query(conn, query, params, fetch_one, fetch_all)
+    except REPLICA_FALLBACK_ERRORS as e:
+        if isinstance(e, CONNECTION_ERRORS):
+            replica.mark_failed(e)
+            if conn is not None:
+                if in_uow:
+                    g.pop('_db_replica_conn', None)
+                conn.discard()
+                conn = None
+        raise
+    except Exception as e:
+        logger.error(f'Replica query execution failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        logger.error(f'Params: {params}')
+        raise
+    finally:
+        if conn is not None and not in_uow:
+            conn.close()
+
+
+def stream_query(query, params=None, batch_size=None):
+    """
+    Run a read query on an unbuffered cursor and yield its rows in batches.
+
+    Rows are pulled from the server with fetchmany(), so at most one batch
+    is held in Python at a time. The query runs on its own pooled connection
+    (from the replica when reads are routed there, else from the stream
+    pool) outside the request's unit of work, so it does not see the
+    request's uncommitted writes. The connection stays checked out until
+    the generator is exhausted or closed, for at most DB_STREAM_MAX_SECONDS:
+    a consumer that is still reading after that (e.g. a slow client) gets
+    StreamTimeoutError. If it is closed early the connection is discarded
+    rather than drained.
+
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+        batch_size: Rows per batch (default DB_STREAM_BATCH_SIZE)
+
+    Yields:
+        list: Up to batch_size row tuples
+
+    Example:
+        for rows in stream_query("SELECT id, name FROM computers"):
+            ...
+    """
+    conn = None
+    if _reads_from_replica():
+        try:
+            conn = _checkout(replica.pool)
+        except REPLICA_FALLBACK_ERRORS as e:
+            if isinstance(e, CONNECTION_ERRORS):
+                replica.mark_failed(e)
+            replica.record_fallback()
+            logger.warning(f'Replica unavailable for streamed read, using the primary: {str(e)}')
+    if conn is None:
+        conn = _checkout(stream_pool)
+    deadline = time.monotonic() + stream_max_seconds if stream_max_seconds else None
+
+    cursor = None
+    finished = False
+    fetched = 0
+    server_seconds = 0.0
+    try:
+        cursor = conn.cursor(buffered=False)
+        started = time.perf_counter()
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+
+        while True:
+            rows = cursor.fetchmany(batch_size or stream_batch_size)
+            # Time spent in the driver only, not in the consumer between batches
+            server_seconds += time.perf_counter() - started
+            if not rows:
+                break
+            fetched += len(rows)
+            yield rows
+            if deadline is not None and time.monotonic() > deadline:
+                raise StreamTimeoutError(
+                    f'Streamed read held its connection for more than {stream_max_seconds}s '
+                    f'({fetched} rows sent)'
+                )
+            started = time.perf_counter()
+        finished = True
+    except Exception as e:
+        logger.error(f'Streaming query failed: {str(e)}')
+        logger.error(f'Query: {query}')
+        logger.error(f'Params: {params}')
+        raise
+    finally:
+        record_statement(query, server_seconds, fetched)
+        if finished:
             cursor.close()
-        if conn:
             conn.close()
+        else:
+            # Unread rows would be drained by close()/rollback; drop the connection instead
+            conn.discard()
 
 
 def execute_many(query, params_list, commit=True):
@@ -177,7 +717,8 @@ def execute_many(query, params_list, commit=True):
     Args:
         query: SQL query string
         params_list: List of parameter tuples
-        commit: If True, commit transaction
+        commit: If True, commit transaction (deferred to the end of the
+            request inside a unit of work)
 
     Returns:
         Number of affected rows
@@ -185,26 +726,30 @@ def execute_many(query, params_list, commit=True):
     Raises:
         Exception: If query execution fails
     """
+    in_uow = _in_unit_of_work()
     conn = None
     cursor = None
     try:
-        conn = connection_pool.get_connection()
+        conn = get_request_connection() if in_uow else _checkout()
         cursor = conn.cursor()
-        cursor.executemany(query, params_list)
-
-        affected_rows = cursor.rowcount
+        with timed_statement(query) as rows:
+            cursor.executemany(query, params_list)
+            rows[0] = affected_rows = cursor.rowcount
 
         if commit:
-            conn.commit()
+            if in_uow:
+                _mark_dirty()
+            else:
+                conn.commit()
 
         return affected_rows
     except Exception as e:
-        if conn and commit:
+        if conn and commit and not in_uow:
             conn.rollback()
         logger.error(f'Batch query execution failed: {str(e)}')
         raise
     finally:
         if cursor:
             cursor.close()
-        if conn:
+        if conn and not in_uow:
             conn.close()
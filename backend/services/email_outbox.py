@@ -0,0 +1,230 @@
+"""
+Email outbox service for CLAIMS backend.
+Transactional outbox for emails sent by the background email worker.
+
+Request handlers enqueue emails in the same transaction as the data
+changes they describe (enqueue_email) and return immediately; no SMTP
+work happens inside a gunicorn worker. The email worker process
+(email_worker.py) claims due rows with SELECT ... FOR UPDATE SKIP LOCKED,
+so several workers can drain the outbox concurrently, and retries failed
+sends with exponential backoff.
+
+A claimed row is leased: its next_attempt_at is pushed past the lease
+period while it is being sent, so rows left behind by a crashed worker are
+picked up again once the lease expires.
+"""
+import json
+from .database import get_db_cursor, execute_query
+from .email_service import SMTPBatchSender, build_message
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+OUTBOX_COLUMNS = (
+    'id', 'subject', 'recipients', 'template_name', 'template_context',
+    'status', 'attempts', 'last_error', 'created_at', 'sent_at', 'created_by'
+)
+
+
+def enqueue_email(cursor, subject, recipients, template_name, template_context, created_by=None):
+    """
+    Add an email to the outbox.
+
+    Use the cursor of the transaction that makes the related data changes,
+    so the email is queued if and only if they commit.
+
+    Args:
+        cursor: Database cursor
+        subject: Email subject
+        recipients: List of recipient email addresses or single email string
+        template_name: Name of the template file
+        template_context: JSON-serializable context for template rendering
+        created_by: Email of the requesting user; only they and admins
+            can read the entry
+
+    Returns:
+        int: Outbox entry ID
+    """
+    if isinstance(recipients, str):
+        recipients = [recipients]
+
+    cursor.execute("""
+        INSERT INTO email_outbox (subject, recipients, template_name, template_context, created_by)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (subject, json.dumps(recipients), template_name, json.dumps(template_context, default=str), created_by))
+    return cursor.lastrowid
+
+
+def get_outbox_entry(outbox_id):
+    """
+    Get the delivery state of an outbox entry.
+
+    Args:
+        outbox_id: Outbox entry ID
+
+    Returns:
+        dict: Entry state, or None if not found
+    """
+    row = execute_query(f"""
+        SELECT {', '.join(OUTBOX_COLUMNS)} FROM email_outbox WHERE id = %s
+    """, (outbox_id,), fetch_one=True, commit=False)
+    if not row:
+        return None
+
+    entry = dict(zip(OUTBOX_COLUMNS, row))
+    return {
+        "id": entry['id'],
+        "subject": entry['subject'],
+        "recipients": json.loads(entry['recipients']),
+        "status": entry['status'],
+        "attempts": entry['attempts'],
+        "last_error": entry['last_error'],
+        "created_at": str(entry['created_at']),
+        "sent_at": str(entry['sent_at']) if entry['sent_at'] else None,
+        "created_by": entry['created_by']
+    }
+
+
+def claim_batch(limit, lease_seconds):
+    """
+    Claim up to `limit` due outbox entries for sending.
+
+    Args:
+        limit: Maximum entries to claim
+        lease_seconds: How long the claim is held before others may retry
+
+    Returns:
+        list: Entry dicts (id, subject, recipients, template_name,
+        template_context, attempts)
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute("""
+            SELECT id, subject, recipients, template_name, template_context, attempts
+            FROM email_outbox
+            WHERE status IN ('pending', 'sending') AND next_attempt_at <= NOW()
+            ORDER BY next_attempt_at, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, (limit,))
+        rows = cursor.fetchall()
+        if not rows:
+            return []
+
+        ids = [row[0] for row in rows]
+        cursor.execute(f"""
+            UPDATE email_outbox
+            SET status = 'sending',
+                attempts = attempts + 1,
+                next_attempt_at = NOW() + INTERVAL %s SECOND
+            WHERE id IN ({', '.join(['%s'] * len(ids))})
+        """, (lease_seconds, *ids))
+
+    return [
+        {
+            "id": outbox_id,
+            "subject": subject,
+            "recipients": json.loads(recipients),
+            "template_name": template_name,
+            "template_context": json.loads(template_context),
+            "attempts": attempts + 1
+        }
+        for outbox_id, subject, recipients, template_name, template_context, attempts in rows
+    ]
+
+
+def retry_delay(attempts, base_delay, max_delay):
+    """
+    Exponential backoff delay before the next attempt.
+
+    Args:
+        attempts: Attempts made so far (>= 1)
+        base_delay: Delay after the first failure, in seconds
+        max_delay: Upper bound, in seconds
+
+    Returns:
+        int: Seconds to wait
+    """
+    return int(min(max_delay, base_delay * 2 ** (attempts - 1)))
+
+
+def mark_sent(outbox_id):
+    """Record a successful delivery."""
+    execute_query("""
+        UPDATE email_outbox
+        SET status = 'sent', sent_at = NOW(), last_error = NULL
+        WHERE id = %s
+    """, (outbox_id,))
+
+
+def mark_failed(outbox_id, attempts, error, max_attempts, base_delay, max_delay):
+    """
+    Record a failed delivery, scheduling a retry unless attempts ran out.
+
+    Returns:
+        bool: True if the entry will be retried
+    """
+    retry = attempts < max_attempts
+    if retry:
+        execute_query("""
+            UPDATE email_outbox
+            SET status = 'pending', last_error = %s, next_attempt_at = NOW() + INTERVAL %s SECOND
+            WHERE id = %s
+        """, (error[:1000], retry_delay(attempts, base_delay, max_delay), outbox_id))
+    else:
+        execute_query("""
+            UPDATE email_outbox
+            SET status = 'failed', last_error = %s
+            WHERE id = %s
+        """, (error[:1000], outbox_id))
+    return retry
+
+
+def process_batch(config, sender=None):
+    """
+    Claim and send one batch of due emails.
+
+    Must run inside an application context.
+
+    Args:
+        config: Application config
+        sender: SMTPBatchSender to reuse across batches; a temporary one
+            is used (and closed) if omitted
+
+    Returns:
+        int: Number of entries processed
+    """
+    entries = claim_batch(config['EMAIL_WORKER_BATCH_SIZE'], config['EMAIL_SEND_LEASE'])
+    if not entries:
+        return 0
+
+    if sender is None:
+        with SMTPBatchSender.from_config(config) as temporary:
+            return _send_entries(entries, temporary, config)
+    return _send_entries(entries, sender, config)
+
+
+def _send_entries(entries, sender, config):
+    """Send claimed entries over one connection and record the outcomes."""
+    for entry in entries:
+        try:
+            msg = build_message(
+                entry['subject'], entry['recipients'],
+                template_name=entry['template_name'],
+                template_context=entry['template_context']
+            )
+            sender.send(msg)
+        except Exception as e:
+            retry = mark_failed(
+                entry['id'], entry['attempts'], str(e) or type(e).__name__,
+                config['EMAIL_MAX_ATTEMPTS'], config['EMAIL_RETRY_BASE_DELAY'], config['EMAIL_RETRY_MAX_DELAY']
+            )
+            logger.warning(
+                f'Outbox email {entry["id"]} failed (attempt {entry["attempts"]}): {str(e)}'
+                + ('' if retry else ' - giving up')
+            )
+            continue
+
+        mark_sent(entry['id'])
+        logger.info(f'Outbox email {entry["id"]} sent to {", ".join(entry["recipients"])}')
+
+    return len(entries)
@@ -1,11 +1,18 @@
 """
 Email service for CLAIMS backend.
 Handles sending templated emails with improved error handling.
+
+send_email opens one SMTP connection per message. Anything that sends
+more than a few messages should use SMTPBatchSender, which keeps a single
+connection open across messages and batches.
 """
+from flask import current_app
 from flask_mail import Mail, Message
-from jinja2 import Environment, FileSystemLoader
+from .email_templates import render_email
 from .logger import get_logger
-import os
+import smtplib
+import threading
+import time
 
 logger = get_logger(__name__)
 mail = Mail()
@@ -43,6 +50,47 @@ def check_email_config(app):
     return True
 
 
+def build_message(subject, recipients, template_name=None, template_context=None, body=None, html=None):
+    """
+    Build an email message from a template or plain text/html.
+    
+    Args:
+        subject: Email subject
+        recipients: List of recipient email addresses or single email string
+        template_name: Name of the template file (optional)
+        template_context: Context dictionary for template rendering (optional)
+        body: Plain text body (optional)
+        html: HTML body (optional)
+        
+    Returns:
+        Message: Message ready to send
+        
+    Raises:
+        ValueError: If no content was provided
+    """
+    # Ensure recipients is a list
+    if isinstance(recipients, str):
+        recipients = [recipients]
+    
+    # Create message
+    msg = Message(
+        subject=subject,
+        recipients=recipients
+    )
+    
+    # Render template if provided
+    if template_name and template_context:
+        msg.html = render_email(template_name, template_context)
+    elif html:
+        msg.html = html
+    elif body:
+        msg.body = body
+    else:
+        raise ValueError('No email content provided (template, body, or html)')
+    
+    return msg
+
+
 def send_email(subject, recipients, template_name=None, template_context=None, body=None, html=None):
     """
     Send email with template or plain text/html.
@@ -59,40 +107,209 @@ def send_email(subject, recipients, template_name=None, template_context=None, b
         bool: True if email sent successfully, False otherwise
     """
     try:
-        # Ensure recipients is a list
-        if isinstance(recipients, str):
-            recipients = [recipients]
-        
-        # Create message
-        msg = Message(
-            subject=subject,
-            recipients=recipients
-        )
-        
-        # Render template if provided
-        if template_name and template_context:
-            env = Environment(loader=FileSystemLoader('templates'))
-            template = env.get_template(template_name)
-            msg.html = template.render(template_context)
-        elif html:
-            msg.html = html
-        elif body:
-            msg.body = body
-        else:
-            logger.error('No email content provided (template, body, or html)')
-            return False
+        msg = build_message(subject, recipients, template_name, template_context, body, html)
         
         # Send email
         mail.send(msg)
-        logger.info(f'Email sent successfully to {", ".join(recipients)}')
+        logger.info(f'Email sent successfully to {", ".join(msg.recipients)}')
         return True
         
+    except ValueError as e:
+        logger.error(str(e))
+        return False
     except Exception as e:
         logger.error(f'Failed to send email: {str(e)}')
         logger.error(f'Subject: {subject}, Recipients: {recipients}')
         return False
 
 
+class SMTPBatchSender:
+    """
+    Sends many messages over one long-lived SMTP connection.
+    
+    The connection is opened lazily and reused across send() and
+    send_batch() calls. It is checked with NOOP after sitting idle,
+    closed after max_per_connection messages or idle_timeout seconds, and
+    transparently reopened if the server drops it (the interrupted message
+    is retried once on the new connection). max_per_second throttles the
+    send rate across all connections. Must be used inside an application
+    context.
+    
+    Args:
+        max_per_connection: Messages sent before the connection is recycled
+        max_per_second: Maximum send rate (None or 0 for unlimited)
+        keepalive_interval: Idle seconds after which the connection is
+            checked with NOOP before use
+        idle_timeout: Idle seconds after which the connection is closed
+    """
+    
+    def __init__(self, max_per_connection=100, max_per_second=None, keepalive_interval=30, idle_timeout=120):
+        self.max_per_connection = max_per_connection
+        self.min_interval = 1.0 / max_per_second if max_per_second else 0.0
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._conn = None
+        self._sent_on_conn = 0
+        self._last_used = 0.0
+        self._next_slot = 0.0
+        
+        # Counters
+        self.connections = 0
+        self.reconnects = 0
+        self.sent = 0
+    
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a sender from the MAIL_BATCH_* / MAIL_*_INTERVAL settings.
+        
+        Args:
+            config: Application config
+        """
+        return cls(
+            max_per_connection=config['MAIL_BATCH_MAX_PER_CONNECTION'],
+            max_per_second=config['MAIL_BATCH_MAX_PER_SECOND'],
+            keepalive_interval=config['MAIL_KEEPALIVE_INTERVAL'],
+            idle_timeout=config['MAIL_IDLE_TIMEOUT']
+        )
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def send(self, msg):
+        """
+        Send one message.
+        
+        Args:
+            msg: flask_mail Message
+            
+        Raises:
+            Exception: The SMTP error if the message could not be sent
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                conn = self._connection()
+                self._throttle()
+                try:
+                    conn.send(msg)
+                except Exception as e:
+                    if not self._is_disconnect(e):
+                        raise
+                    self._disconnect(quit=False)
+                    if attempt == 2:
+                        raise
+                    self.reconnects += 1
+                    logger.warning(f'SMTP connection dropped, reconnecting: {str(e)}')
+                    continue
+                
+                self._sent_on_conn += 1
+                self._last_used = time.monotonic()
+                self.sent += 1
+                return
+    
+    def send_batch(self, messages):
+        """
+        Send several messages, continuing past individual failures.
+        
+        Args:
+            messages: Iterable of flask_mail Messages
+            
+        Returns:
+            list: Per message, None if sent or the exception raised
+        """
+        results = []
+        for msg in messages:
+            try:
+                self.send(msg)
+                results.append(None)
+            except Exception as e:
+                logger.error(f'Failed to send email to {", ".join(msg.recipients)}: {str(e)}')
+                results.append(e)
+        return results
+    
+    def close(self):
+        """Close the connection, if open."""
+        with self._lock:
+            self._disconnect()
+    
+    def _connection(self):
+        """Get a usable connection, recycling or reopening it as needed. Caller holds the lock."""
+        if self._conn is not None:
+            idle = time.monotonic() - self._last_used
+            if self._sent_on_conn >= self.max_per_connection or idle > self.idle_timeout:
+                self._disconnect()
+            elif idle > self.keepalive_interval and not self._alive():
+                self.reconnects += 1
+                self._disconnect(quit=False)
+        
+        if self._conn is None:
+            conn = mail.connect()
+            conn.__enter__()
+            self._conn = conn
+            self._sent_on_conn = 0
+            self._last_used = time.monotonic()
+            self.connections += 1
+        return self._conn
+    
+    def _alive(self):
+        """Check an idle connection with NOOP."""
+        host = self._conn.host
+        if host is None:
+            # MAIL_SUPPRESS_SEND: nothing to check
+            return True
+        try:
+            return host.noop()[0] == 250
+        except Exception:
+            return False
+    
+    def _disconnect(self, quit=True):
+        conn, self._conn = self._conn, None
+        if conn is None or conn.host is None:
+            return
+        try:
+            if quit:
+                conn.host.quit()
+            else:
+                conn.host.close()
+        except Exception:
+            pass
+    
+    def _throttle(self):
+        """Wait for the next send slot when a rate limit is set."""
+        if not self.min_interval:
+            return
+        now = time.monotonic()
+        if now < self._next_slot:
+            time.sleep(self._next_slot - now)
+            now = self._next_slot
+        self._next_slot = now + self.min_interval
+    
+    @staticmethod
+    def _is_disconnect(error):
+        """Whether an error means the connection is gone (421 = service closing)."""
+        if isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError)):
+            return True
+        return getattr(error, 'smtp_code', None) == 421
+
+
+def send_batch(messages):
+    """
+    Send several messages over a single SMTP connection.
+    
+    Args:
+        messages: Iterable of flask_mail Messages
+        
+    Returns:
+        list: Per message, None if sent or the exception raised
+    """
+    with SMTPBatchSender.from_config(current_app.config) as sender:
+        return sender.send_batch(messages)
+
+
 def send_templated_email(sender_email, sender_password, receiver_email, subject, template_name, context):
     """
     Legacy function for backward compatibility with existing code.
@@ -0,0 +1,167 @@
+"""
+Email template service for CLAIMS backend.
+Shared Jinja environment for rendering email templates.
+
+Templates are loaded from the templates directory next to the application
+(not the process working directory) by a single module-level environment,
+so each template is parsed and compiled once per process. Compiled
+bytecode is also persisted with a FileSystemBytecodeCache, which lets
+fresh gunicorn and email workers skip compilation, and init_templates
+warms every template at startup.
+
+Loading bytecode runs it, so the cache directory must be private to the
+app user (see private_cache_dir); otherwise the cache is not used.
+"""
+import os
+import stat
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# backend/templates, independent of the current working directory
+DEFAULT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+_env = None
+
+
+def private_cache_dir(path):
+    """
+    Create a bytecode cache directory, or check an existing one, so that
+    only the app user can write to it.
+
+    The directory is created with mode 0700 (an existing one owned by the
+    app user is tightened to 0700). It must be a real directory owned by
+    the app user, in a parent that nobody else can rename it out of: owned
+    by the app user or root, and sticky if others may write to it.
+
+    Args:
+        path: Cache directory
+
+    Returns:
+        bool: True if the directory is safe to load bytecode from
+    """
+    uid = os.getuid()
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != uid:
+            logger.warning(f'Template cache {path} is not a directory owned by this user; cache disabled')
+            return False
+        if stat.S_IMODE(info.st_mode) != 0o700:
+            os.chmod(path, 0o700)
+
+        parent = os.stat(os.path.dirname(os.path.abspath(path)))
+        shared = parent.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        if parent.st_uid not in (uid, 0) or (shared and not parent.st_mode & stat.S_ISVTX):
+            logger.warning(f'Template cache {path} is in a directory others can modify; cache disabled')
+            return False
+    except OSError as e:
+        logger.warning(f'Template cache {path} unavailable, cache disabled: {str(e)}')
+        return False
+    return True
+
+
+def create_environment(template_dir=DEFAULT_TEMPLATE_DIR, cache_dir=None, auto_reload=False):
+    """
+    Create an email template environment.
+
+    Args:
+        template_dir: Directory holding the email templates
+        cache_dir: Directory for compiled template bytecode (optional;
+            ignored unless private_cache_dir accepts it)
+        auto_reload: Check templates for changes on every lookup
+
+    Returns:
+        jinja2.Environment
+    """
+    bytecode_cache = None
+    if cache_dir and private_cache_dir(cache_dir):
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=bytecode_cache,
+        auto_reload=auto_reload,
+        cache_size=-1
+    )
+
+
+def init_templates(app):
+    """
+    Configure the shared template environment and warm its templates.
+
+    Args:
+        app: Flask application instance
+    """
+    global _env
+
+    _env = create_environment(
+        template_dir=os.path.join(app.root_path, 'templates'),
+        cache_dir=app.config.get('EMAIL_TEMPLATE_CACHE_DIR'),
+        auto_reload=app.debug
+    )
+    warmed = warm_templates()
+    logger.info(f'Email templates initialized ({warmed} warmed)')
+
+
+def get_environment():
+    """
+    Get the shared template environment, creating a default one if
+    init_templates has not run (e.g. in scripts).
+
+    Returns:
+        jinja2.Environment
+    """
+    global _env
+
+    if _env is None:
+        _env = create_environment()
+    return _env
+
+
+def warm_templates():
+    """
+    Load (and compile) every template so the first send doesn't pay for it.
+
+    Returns:
+        int: Number of templates loaded
+    """
+    env = get_environment()
+    count = 0
+    for name in env.list_templates(extensions=['html', 'txt']):
+        try:
+            env.get_template(name)
+            count += 1
+        except Exception as e:
+            logger.error(f'Failed to compile email template {name}: {str(e)}')
+    return count
+
+
+def render_email(template_name, context):
+    """
+    Render one email template.
+
+    Args:
+        template_name: Template file name
+        context: Template context dictionary
+
+    Returns:
+        str: Rendered template
+    """
+    return get_environment().get_template(template_name).render(context)
+
+
+def render_email_batch(template_name, contexts):
+    """
+    Render one template for many contexts (e.g. a batch of summaries).
+
+    Args:
+        template_name: Template file name
+        contexts: Iterable of template context dictionaries
+
+    Returns:
+        list: Rendered templates, in the order of contexts
+    """
+    template = get_environment().get_template(template_name)
+    return [template.render(context) for context in contexts]
@@ -0,0 +1,336 @@
+"""
+Change event service for CLAIMS backend.
+Shared change feed and per-worker broadcaster behind the /events SSE stream.
+
+Write endpoints publish compact delta events (publish_event) once their
+transaction commits. Events are appended as JSON lines to a change feed
+file in SHARED_STATE_DIR, so a write handled by any gunicorn worker reaches
+subscribers connected to every other worker.
+
+Each worker runs one broadcaster thread that tails the feed and fans new
+events out to its subscribers' queues. Between changes an open stream only
+costs a periodic stat() of the feed and a keepalive comment; no queries are
+run on behalf of connected dashboards.
+
+Subscribers are either threads (Subscription, the Flask route; each open
+stream holds a worker thread, so their number is capped by
+EVENTS_MAX_SUBSCRIBERS) or coroutines (AsyncSubscription, the asgi.py
+route; an open stream only holds a queue on the event loop).
+"""
+import asyncio
+import fcntl
+import json
+import os
+import queue
+import threading
+import time
+from .database import on_commit
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+FEED_FILE = 'events.log'
+
+# Sent to a subscriber that fell behind; the client should refetch
+RESYNC_EVENT = "event: resync\ndata: {}\n\n"
+
+# Per-process state, set up by init_events
+_settings = {}
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def init_events(app):
+    """
+    Configure the shared change feed.
+
+    Args:
+        app: Flask application instance
+    """
+    state_dir = app.config['SHARED_STATE_DIR']
+    os.makedirs(state_dir, exist_ok=True)
+
+    _settings.update({
+        'path': os.path.join(state_dir, FEED_FILE),
+        'poll_interval': app.config['EVENTS_POLL_INTERVAL'],
+        'max_feed_bytes': app.config['EVENTS_MAX_FEED_BYTES'],
+        'queue_size': app.config['EVENTS_SUBSCRIBER_QUEUE_SIZE'],
+    })
+    logger.info('Change events initialized')
+
+
+def _append(event_type, data):
+    """Append one event to the shared feed, rotating it when too large."""
+    path = _settings['path']
+    line = json.dumps(
+        {'type': event_type, 'data': data, 'ts': round(time.time(), 3)},
+        separators=(',', ':'), default=str
+    ).encode('utf-8') + b'\n'
+
+    with open(path, 'ab') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            # Another writer may have rotated the file while we waited
+            if os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                return _append(event_type, data)
+            if os.fstat(f.fileno()).st_size + len(line) > _settings['max_feed_bytes']:
+                os.replace(path, f'{path}.1')
+                return _append(event_type, data)
+            f.write(line)
+            f.flush()
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def publish_event(event_type, **data):
+    """
+    Publish a change event once the current unit of work commits.
+
+    Args:
+        event_type: Event name, e.g. 'part.status_changed'
+        **data: JSON-serializable event payload
+    """
+    if not _settings:
+        return
+
+    def append():
+        try:
+            _append(event_type, data)
+        except OSError as e:
+            logger.error(f'Failed to publish {event_type} event: {str(e)}')
+
+    on_commit(append)
+
+
+def format_event(event_id, event):
+    """Format one event in the text/event-stream wire format."""
+    data = json.dumps(event, separators=(',', ':'), default=str)
+    return f"id: {event_id}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """
+    Bounded event queue read by a thread (the Flask /events route).
+    """
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def offer(self, item):
+        """Queue an item without blocking; False if the queue is full."""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def drop(self):
+        """Replace the oldest queued item with the resync marker (None)."""
+        try:
+            self._queue.get_nowait()
+            self._queue.put_nowait(None)
+        except (queue.Empty, queue.Full):
+            pass
+
+    def get(self, timeout):
+        """
+        Wait for the next item.
+
+        Raises:
+            queue.Empty: If nothing arrived within timeout seconds
+        """
+        return self._queue.get(timeout=timeout)
+
+
+class AsyncSubscription:
+    """
+    Bounded event queue read by a coroutine (the asgi.py /events route).
+    Fed from the broadcaster thread through the event loop.
+    """
+
+    def __init__(self, loop, maxsize):
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._maxsize = maxsize
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _call(self, fn, *args):
+        try:
+            self._loop.call_soon_threadsafe(fn, *args)
+            return True
+        except RuntimeError:
+            # Event loop already closed
+            return False
+
+    def offer(self, item):
+        """Queue an item without blocking; False if the queue is full."""
+        with self._lock:
+            if self._pending >= self._maxsize:
+                return False
+            self._pending += 1
+        return self._call(self._queue.put_nowait, item)
+
+    def drop(self):
+        """Queue the resync marker (None)."""
+        self._call(self._queue.put_nowait, None)
+
+    async def get(self, timeout):
+        """
+        Wait for the next item.
+
+        Raises:
+            asyncio.TimeoutError: If nothing arrived within timeout seconds
+        """
+        item = await asyncio.wait_for(self._queue.get(), timeout)
+        if item is not None:
+            with self._lock:
+                self._pending -= 1
+        return item
+
+
+class Broadcaster(threading.Thread):
+    """
+    Tails the shared change feed and fans events out to local subscribers.
+    """
+
+    def __init__(self):
+        super().__init__(name='events-broadcaster', daemon=True)
+        self.pid = os.getpid()
+        self.path = _settings['path']
+        self.poll_interval = _settings['poll_interval']
+        self.queue_size = _settings['queue_size']
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._inode = None
+        self._buffer = b''
+        self._sequence = 0
+
+    def subscribe(self, loop=None, limit=None):
+        """
+        Register a new subscriber.
+
+        Args:
+            loop: Event loop of an async subscriber; None for a thread
+            limit: Refuse the subscription if this many are already open
+
+        Returns:
+            Subscription, AsyncSubscription or None if limit was reached.
+            Receives (event id, event dict) tuples; None means the
+            subscriber fell behind and was dropped
+        """
+        if loop is None:
+            subscription = Subscription(self.queue_size)
+        else:
+            subscription = AsyncSubscription(loop, self.queue_size)
+        with self._lock:
+            if limit and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscriber. Safe to call more than once.
+
+        Returns:
+            bool: True if the subscription was still registered
+        """
+        with self._lock:
+            registered = subscription in self._subscribers
+            self._subscribers.discard(subscription)
+        return registered
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def run(self):
+        self._open(seek_end=True)
+        while True:
+            try:
+                self._poll()
+            except Exception as e:
+                logger.error(f'Event broadcaster error: {str(e)}')
+            time.sleep(self.poll_interval)
+
+    def _open(self, seek_end=False):
+        """Open the current feed file, optionally skipping existing events."""
+        try:
+            f = open(self.path, 'ab+')
+        except OSError as e:
+            logger.error(f'Cannot open change feed: {str(e)}')
+            return
+        f.seek(0, os.SEEK_END if seek_end else os.SEEK_SET)
+        self._file = f
+        self._inode = os.fstat(f.fileno()).st_ino
+        self._buffer = b''
+
+    def _poll(self):
+        """Read and dispatch events appended since the last poll."""
+        if self._file is None:
+            self._open()
+            if self._file is None:
+                return
+
+        try:
+            rotated = os.stat(self.path).st_ino != self._inode
+        except OSError:
+            rotated = True
+
+        self._dispatch(self._file.read())
+
+        if rotated:
+            # Everything left in the old file has been read; follow the new one
+            self._file.close()
+            self._file = None
+            self._open()
+
+    def _dispatch(self, chunk):
+        if not chunk:
+            return
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b'\n')
+        if not lines or not self._subscribers:
+            return
+
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event in events:
+            self._sequence += 1
+            for subscription in subscribers:
+                if not subscription.offer((self._sequence, event)):
+                    # Slow client: drop it and let it reconnect and resync
+                    self.unsubscribe(subscription)
+                    subscription.drop()
+
+
+def get_broadcaster():
+    """
+    Get this process's broadcaster, starting it on first use.
+
+    Started lazily so it is never created in (or inherited from) a parent
+    process that forks workers.
+
+    Returns:
+        Broadcaster or None if events are not configured
+    """
+    global _broadcaster
+
+    if not _settings:
+        return None
+    if _broadcaster is not None and _broadcaster.pid == os.getpid():
+        return _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None or _broadcaster.pid != os.getpid():
+            _broadcaster = Broadcaster()
+            _broadcaster.start()
+    return _broadcaster
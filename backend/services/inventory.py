@@ -0,0 +1,447 @@
+"""
+Inventory service for CLAIMS backend.
+Set-based helpers for writing computers and their parts.
+"""
+import json
+import time
+import uuid
+from flask import current_app
+from .database import get_db_cursor
+from .logger import get_logger
+from .open_issues import refresh_open_issues
+
+logger = get_logger(__name__)
+
+# Rows per multi-row INSERT statement
+DEFAULT_CHUNK_SIZE = 1000
+
+COMPUTER_COLUMNS = ('id', 'name', 'lab_id', 'specs', 'other_parts')
+PART_COLUMNS = ('computer_id', 'name', 'serial_number', 'category', 'type', 'status', 'notes')
+REPORT_COLUMNS = ('computer_id', 'part_name', 'issue_description', 'status', 'submitted_by')
+
+# Frontend status codes -> computer_parts.status ENUM
+STATUS_MAP = {1: 'operational', 2: 'not_operational', 3: 'damaged', 4: 'missing'}
+ISSUE_STATUSES = ('not_operational', 'damaged', 'missing')
+
+
+def to_status_enum(status_val):
+    """
+    Map a frontend status (int code or ENUM string) to the ENUM value.
+
+    Args:
+        status_val: Int status code or status string
+
+    Returns:
+        str: computer_parts.status value
+    """
+    if isinstance(status_val, int):
+        return STATUS_MAP.get(status_val, 'operational')
+    return status_val
+
+
+def normalize_other_parts(other_parts):
+    """
+    Coerce the other_parts payload into a list.
+
+    Args:
+        other_parts: List, JSON string, or anything else
+
+    Returns:
+        list: Parsed list of parts (empty if invalid)
+    """
+    if isinstance(other_parts, str):
+        try:
+            other_parts = json.loads(other_parts)
+        except json.JSONDecodeError:
+            other_parts = []
+    if not isinstance(other_parts, list):
+        other_parts = []
+    return other_parts
+
+
+def build_part_rows(computer_id, specs, other_parts):
+    """
+    Build computer_parts rows for a new computer.
+
+    Args:
+        computer_id: ID of the computer
+        specs: Dict of category -> {"name", "serial"} (or a plain name string)
+        other_parts: List of {"name", "serial"} dicts
+
+    Returns:
+        list: Tuples matching PART_COLUMNS
+    """
+    rows = []
+    if isinstance(specs, dict):
+        for category, details in specs.items():
+            # details might be string (old format) or dict (new format)
+            if isinstance(details, dict):
+                part_name = details.get('name', '')
+                serial_number = details.get('serial', '')
+            else:
+                part_name = str(details)
+                serial_number = ''
+            rows.append((computer_id, part_name, serial_number, category, 'standard', 'operational', ''))
+
+    for item in other_parts:
+        if isinstance(item, dict) and 'name' in item:
+            rows.append((computer_id, item['name'], item.get('serial', ''), 'other', 'custom', 'operational', ''))
+
+    return rows
+
+
+def insert_rows(cursor, table, columns, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert rows with chunked multi-row INSERT statements.
+
+    Args:
+        cursor: Database cursor
+        table: Table name
+        columns: Column names
+        rows: List of tuples matching columns
+        chunk_size: Maximum rows per statement
+
+    Returns:
+        int: Number of statements executed
+    """
+    placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    statements = 0
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        query = prefix + ', '.join([placeholder] * len(chunk))
+        cursor.execute(query, tuple(value for row in chunk for value in row))
+        statements += 1
+
+    return statements
+
+
+def lab_counts_enabled():
+    """Whether laboratories.pc_count is maintained and read."""
+    return current_app.config.get('LAB_PC_COUNT_COLUMN', False)
+
+
+def adjust_lab_counts(cursor, deltas):
+    """
+    Apply computer count changes to laboratories.pc_count.
+
+    Relative updates keep concurrent writers correct: each one only adds
+    its own delta under the laboratory row lock. Call it before inserting
+    the computers: their foreign key checks share-lock the laboratory rows,
+    and two writers that each hold that shared lock and then ask for the
+    exclusive one deadlock. No-op unless LAB_PC_COUNT_COLUMN is enabled.
+
+    Args:
+        cursor: Database cursor (same transaction as the computers write)
+        deltas: {lab_id: change in number of computers}
+
+    Returns:
+        int: Number of statements executed
+    """
+    # Same lock order for every writer
+    rows = sorted((lab_id, delta) for lab_id, delta in deltas.items() if delta)
+    if not rows or not lab_counts_enabled():
+        return 0
+
+    rows_sql = ' UNION ALL '.join(
+        ['SELECT %s AS id, %s AS delta'] + ['SELECT %s, %s'] * (len(rows) - 1)
+    )
+    cursor.execute(f"""
+        UPDATE laboratories l
+        JOIN ({rows_sql}) v ON l.id = v.id
+        SET l.pc_count = GREATEST(CAST(l.pc_count AS SIGNED) + v.delta, 0)
+    """, tuple(value for row in rows for value in row))
+    return 1
+
+
+def _find_existing(cursor, pairs, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Look up which (lab_id, name) pairs already exist, one query per chunk.
+
+    Names are compared in SQL under the column collation (case-insensitive),
+    so "PC-01" matches a stored "pc-01".
+
+    Args:
+        cursor: Database cursor
+        pairs: Set of (lab_id, name) tuples, lab_id as string
+        chunk_size: Maximum pairs per query
+
+    Returns:
+        set: The subset of pairs already present in computers
+    """
+    pairs = sorted(pairs)
+    existing = set()
+
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        rows_sql = ' UNION ALL '.join(
+            ['SELECT %s AS lab_id, %s AS name'] + ['SELECT %s, %s'] * (len(chunk) - 1)
+        )
+        cursor.execute(f"""
+            SELECT DISTINCT v.lab_id, v.name
+            FROM ({rows_sql}) v
+            JOIN computers c ON c.lab_id = v.lab_id AND c.name = v.name
+        """, tuple(value for pair in chunk for value in pair))
+        existing.update((lab_id, name) for lab_id, name in cursor.fetchall())
+
+    return existing
+
+
+def import_computers(computers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import a batch of computers and their parts in one transaction.
+
+    Duplicates (same name in the same lab ignoring case, either already
+    stored or repeated within the batch) are skipped. Existing computers
+    are resolved with one query per chunk, and computers and parts are
+    written with chunked multi-row inserts.
+
+    Args:
+        computers: List of {"pc_name", "lab_id", "specs", "other_parts"}
+            dicts; pc_name must be a non-empty string
+        chunk_size: Maximum rows per statement
+
+    Returns:
+        dict: inserted, added_per_lab, skipped_duplicates, counts and timing
+    """
+    started = time.perf_counter()
+
+    entries = []
+    for computer in computers:
+        key = (str(computer.get('lab_id')), computer.get('pc_name'))
+        entries.append((key, computer))
+
+    inserted = []
+    skipped = []
+    computer_rows = []
+    part_rows = []
+    added_per_lab = {}
+    pairs = {key for key, _ in entries}
+    statements = -(-len(pairs) // chunk_size)
+
+    with get_db_cursor() as cursor:
+        existing = _find_existing(cursor, pairs, chunk_size)
+        resolved_at = time.perf_counter()
+
+        seen = set()
+        for key, computer in entries:
+            name = computer.get('pc_name')
+            batch_key = (key[0], name.casefold())
+            if key in existing or batch_key in seen:
+                skipped.append(name)
+                continue
+            seen.add(batch_key)
+
+            computer_id = str(uuid.uuid4())
+            specs = computer.get('specs', {})
+            other_parts = normalize_other_parts(computer.get('other_parts', []))
+
+            specs_json = json.dumps(specs) if isinstance(specs, dict) else specs
+            computer_rows.append((computer_id, name, computer.get('lab_id'), specs_json, json.dumps(other_parts)))
+            part_rows.extend(build_part_rows(computer_id, specs, other_parts))
+            inserted.append({"pc_name": name, "id": computer_id, "lab_id": computer.get('lab_id')})
+            added_per_lab[key[0]] = added_per_lab.get(key[0], 0) + 1
+
+        # Lock the laboratory rows before the inserts (see adjust_lab_counts)
+        statements += adjust_lab_counts(cursor, added_per_lab)
+        statements += insert_rows(cursor, 'computers', COMPUTER_COLUMNS, computer_rows, chunk_size)
+        statements += insert_rows(cursor, 'computer_parts', PART_COLUMNS, part_rows, chunk_size)
+
+    finished = time.perf_counter()
+
+    return {
+        "inserted": inserted,
+        "added_per_lab": added_per_lab,
+        "skipped_duplicates": skipped,
+        "inserted_count": len(inserted),
+        "skipped_count": len(skipped),
+        "parts_inserted": len(part_rows),
+        "statements": statements,
+        "timing_ms": {
+            "duplicate_check": round((resolved_at - started) * 1000, 2),
+            "total": round((finished - started) * 1000, 2)
+        }
+    }
+
+
+def _fetch_parts(cursor, computer_ids, chunk_size):
+    """
+    Fetch the current parts of the given computers.
+
+    Args:
+        cursor: Database cursor
+        computer_ids: List of computer IDs
+        chunk_size: Maximum IDs per query
+
+    Returns:
+        dict: computer_id -> list of part rows ordered by id
+    """
+    parts = {computer_id: [] for computer_id in computer_ids}
+    for start in range(0, len(computer_ids), chunk_size):
+        chunk = computer_ids[start:start + chunk_size]
+        query = (
+            "SELECT id, computer_id, name, category, status, serial_number, notes "
+            "FROM computer_parts "
+            f"WHERE computer_id IN ({', '.join(['%s'] * len(chunk))}) "
+            "ORDER BY id"
+        )
+        cursor.execute(query, tuple(chunk))
+        for row in cursor.fetchall():
+            parts.setdefault(row[1], []).append(row)
+    return parts
+
+
+def _match_part(rows, part):
+    """
+    Find the part a status key refers to: the first row (lowest id, then
+    rows added by this batch) whose name or category equals the key,
+    ignoring case as the column collation does.
+    """
+    part = part.casefold()
+    for row in rows:
+        if (row[2] or '').casefold() == part or (row[3] or '').casefold() == part:
+            return row
+    return None
+
+
+def _update_parts(cursor, updates, chunk_size):
+    """
+    Apply part updates with one multi-row UPDATE per chunk.
+
+    Args:
+        cursor: Database cursor
+        updates: List of (id, status, notes, name or None, serial or None)
+        chunk_size: Maximum rows per statement
+
+    Returns:
+        int: Number of statements executed
+    """
+    statements = 0
+    for start in range(0, len(updates), chunk_size):
+        chunk = updates[start:start + chunk_size]
+        rows_sql = ' UNION ALL '.join(
+            ['SELECT %s AS id, %s AS status, %s AS notes, %s AS name, %s AS serial_number']
+            + ['SELECT %s, %s, %s, %s, %s'] * (len(chunk) - 1)
+        )
+        query = f"""
+            UPDATE computer_parts p
+            JOIN ({rows_sql}) v ON p.id = v.id
+            SET p.status = v.status,
+                p.notes = v.notes,
+                p.name = COALESCE(v.name, p.name),
+                p.serial_number = COALESCE(v.serial_number, p.serial_number)
+        """
+        cursor.execute(query, tuple(value for row in chunk for value in row))
+        statements += 1
+    return statements
+
+
+def apply_status_changes(all_statuses, user_email, chunk_size=500):
+    """
+    Apply a bulk status/name/serial update and auto-generate reports.
+
+    All affected parts are fetched once and diffed in memory; the writes are
+    then applied as a handful of multi-row statements at the end, so row
+    locks are only held for those statements.
+
+    Args:
+        all_statuses: {computer_id: {part_key: {"status", "notes", "name",
+            "serial", "type"}}}
+        user_email: Email recorded as the reports' submitter
+        chunk_size: Maximum rows per statement
+
+    Returns:
+        dict: Counts of updated, inserted and reported parts and statements,
+        plus status_changes ({computer_id: [{"name", "status"}]}) for
+        parts whose status changed or that were added
+    """
+    computer_ids = list(all_statuses.keys())
+    if not computer_ids:
+        return {"updated": 0, "inserted": 0, "reports": 0, "statements": 0, "status_changes": {}}
+
+    with get_db_cursor() as cursor:
+        current = _fetch_parts(cursor, computer_ids, chunk_size)
+        statements = -(-len(computer_ids) // chunk_size)
+
+        updates = {}
+        inserts = []
+        reports = []
+        status_changes = {}
+
+        for com_id, parts in all_statuses.items():
+            for part, status_data in parts.items():
+                status_enum = to_status_enum(status_data.get("status"))
+                notes = status_data.get("notes", "")
+                new_name = status_data.get("name") # Get new name if provided
+                new_serial = status_data.get("serial") # Get new serial if provided
+
+                rows = current.setdefault(com_id, [])
+                existing = _match_part(rows, part)
+
+                if existing:
+                    part_id, _, current_name, category, current_status, current_serial, current_notes = existing
+                    changes = []
+
+                    if new_name and new_name != current_name:
+                        changes.append(f"{part.capitalize()} Name updated to {new_name}")
+
+                    if new_serial and new_serial != current_serial:
+                        changes.append(f"{part.capitalize()} Serial updated to {new_serial}")
+
+                    if status_enum != current_status:
+                        changes.append(f"{part.capitalize()} is {status_enum}")
+                        status_changes.setdefault(com_id, []).append({"name": new_name or current_name, "status": status_enum})
+
+                    # Rows that would not change are left alone
+                    if changes or notes != current_notes:
+                        if isinstance(part_id, tuple):
+                            # Added earlier in this batch: fold into its insert
+                            index = part_id[1]
+                            _, _, _, _, part_type, _, _ = inserts[index]
+                            inserts[index] = (com_id, new_name or current_name, new_serial or current_serial,
+                                              category, part_type, status_enum, notes)
+                        else:
+                            # Keep a name/serial set by an earlier key for the same row
+                            previous = updates.get(part_id, (None,) * 5)
+                            updates[part_id] = (part_id, status_enum, notes,
+                                                new_name or previous[3], new_serial or previous[4])
+                        # Later keys in the batch see the new values
+                        rows[rows.index(existing)] = (part_id, com_id, new_name or current_name, category,
+                                                      status_enum, new_serial or current_serial, notes)
+
+                    # Generate report if there are changes
+                    if changes:
+                        change_description = ". ".join(changes)
+                        if notes:
+                            change_description += f". Notes: {notes}"
+                        report_part_name = new_name if new_name else current_name
+                        reports.append((com_id, report_part_name, change_description, 'pending', user_email))
+                else:
+                    part_type = status_data.get("type", "standard")
+                    category = part if part_type == 'standard' else 'other'
+                    # Use new_name if provided, else part (key)
+                    final_name = new_name if new_name else part
+                    final_serial = new_serial if new_serial else ''
+
+                    # Matched by later keys in the batch like a stored row
+                    rows.append((('insert', len(inserts)), com_id, final_name, category, status_enum, final_serial, notes))
+                    inserts.append((com_id, final_name, final_serial, category, part_type, status_enum, notes))
+                    status_changes.setdefault(com_id, []).append({"name": final_name, "status": status_enum})
+
+                    # Auto-generate report for new non-operational parts
+                    if status_enum in ISSUE_STATUSES:
+                        reports.append((com_id, final_name, f"New part added with status: {status_enum}. Notes: {notes}", 'pending', user_email))
+
+        statements += _update_parts(cursor, list(updates.values()), chunk_size)
+        statements += insert_rows(cursor, 'computer_parts', PART_COLUMNS, inserts, chunk_size)
+        statements += insert_rows(cursor, 'reports', REPORT_COLUMNS, reports, chunk_size)
+        statements += refresh_open_issues(cursor, reports)
+
+    return {
+        "updated": len(updates),
+        "inserted": len(inserts),
+        "reports": len(reports),
+        "statements": statements,
+        "status_changes": status_changes
+    }
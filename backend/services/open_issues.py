@@ -0,0 +1,102 @@
+"""
+Open issues service for CLAIMS backend.
+Maintains the open_issues table behind the admin report queue.
+
+open_issues holds one row per (computer_id, part_name) that has at least
+one pending report, pointing at the latest pending report. Every path that
+creates reports or changes their status refreshes the affected keys in the
+same transaction (refresh_open_issues), so the queue is read with an
+indexed scan whose cost follows the number of open issues rather than the
+size of the report history. rebuild_open_issues recomputes the whole table
+from reports if it ever drifts.
+"""
+from .database import get_db_cursor
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys per statement when refreshing
+DEFAULT_CHUNK_SIZE = 500
+
+# Pending reports r that are the latest for their key. Keys compare under
+# the table collation (case-insensitive), as the open_issues primary key
+# does, so differently cased part names yield one row per key.
+LATEST_PENDING_SQL = """
+    INSERT INTO open_issues (computer_id, part_name, report_id, created_at)
+    SELECT r.computer_id, r.part_name, r.id, r.created_at
+    FROM reports r
+    WHERE r.status = 'pending'
+      AND r.computer_id IS NOT NULL
+      AND r.part_name IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM reports n
+          WHERE n.computer_id = r.computer_id
+            AND n.part_name = r.part_name
+            AND n.status = 'pending'
+            AND (n.created_at > r.created_at OR (n.created_at = r.created_at AND n.id > r.id))
+      )
+"""
+
+
+def issue_keys(rows):
+    """
+    Collect the (computer_id, part_name) keys that can be open issues.
+
+    Reports without a computer or part never appear in the queue.
+
+    Args:
+        rows: Iterable of (computer_id, part_name, ...) tuples
+
+    Returns:
+        set: (computer_id, part_name) tuples
+    """
+    return {(row[0], row[1]) for row in rows if row[0] and row[1]}
+
+
+def refresh_open_issues(cursor, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Recompute the open issue rows for the given keys from reports.
+
+    Must run in the same transaction as the reports write it follows.
+    The open_issues rows are deleted first and the latest pending reports
+    are inserted with INSERT ... SELECT, which share-locks the reports it
+    reads, so concurrent refreshes of the same key serialize and always
+    see each other's committed reports.
+
+    Args:
+        cursor: Database cursor
+        keys: Iterable of (computer_id, part_name, ...) tuples
+        chunk_size: Maximum keys per statement
+
+    Returns:
+        int: Number of statements executed
+    """
+    keys = sorted(issue_keys(keys))
+    statements = 0
+
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        key_sql = ', '.join(['(%s, %s)'] * len(chunk))
+        params = tuple(value for key in chunk for value in key)
+
+        cursor.execute(f"DELETE FROM open_issues WHERE (computer_id, part_name) IN ({key_sql})", params)
+        cursor.execute(LATEST_PENDING_SQL + f" AND (r.computer_id, r.part_name) IN ({key_sql})", params)
+        statements += 2
+
+    return statements
+
+
+def rebuild_open_issues():
+    """
+    Rebuild the whole open_issues table from reports in one transaction.
+
+    Returns:
+        int: Number of open issues
+    """
+    with get_db_cursor() as cursor:
+        cursor.execute("DELETE FROM open_issues")
+        cursor.execute(LATEST_PENDING_SQL)
+        count = cursor.rowcount
+
+    logger.info(f'Open issues rebuilt: {count} open')
+    return count
@@ -0,0 +1,248 @@
+"""
+Password hashing service for CLAIMS backend.
+Runs pbkdf2 hashing and verification in a bounded process pool.
+
+Werkzeug's pbkdf2:sha256 costs hundreds of milliseconds of CPU per call.
+Run on the request thread it holds the GIL-bound worker for that long, so
+a burst of logins starves every other endpoint. Here each gunicorn worker
+sends hashing to its own small process pool instead:
+
+- at most PASSWORD_HASH_WORKERS hashes run at once (one process each),
+- at most PASSWORD_HASH_QUEUE_SIZE more may wait; beyond that callers get
+  PasswordHashingBusyError immediately (mapped to 503 + Retry-After),
+- a caller waits at most PASSWORD_HASH_TIMEOUT seconds for its result.
+  A hash that times out keeps its slot until its process finishes, so
+  abandoned work still counts against the limit.
+
+The pool is created lazily per process from a forkserver, so it is never
+inherited across gunicorn's fork and never forks a multi-threaded worker.
+Setting PASSWORD_HASH_WORKERS to 0 hashes inline (e.g. for testing).
+"""
+import bisect
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import check_password_hash, generate_password_hash
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+HASH_METHOD = 'pbkdf2:sha256'
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the hashing pool is saturated or too slow to answer."""
+
+
+class HashingExecutor:
+    """
+    Process pool with an admission limit and latency metrics.
+
+    Args:
+        workers: Hashing processes (0 runs hashes inline)
+        queue_size: Requests allowed to wait for a free process
+        timeout: Seconds a caller waits for its result
+    """
+
+    def __init__(self, workers=2, queue_size=8, timeout=10):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._pool = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Counters
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._abandoned = 0
+        self._latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def capacity(self):
+        return self.workers + self.queue_size
+
+    def run(self, fn, *args):
+        """
+        Run fn(*args) in the pool and wait for the result.
+
+        Raises:
+            PasswordHashingBusyError: If the pool is saturated or the result
+                did not arrive within the timeout
+        """
+        with self._lock:
+            if self.workers and self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise PasswordHashingBusyError(
+                    f'Password hashing saturated ({self._in_flight} in flight)'
+                )
+            self._in_flight += 1
+
+        started = time.monotonic()
+        if not self.workers:
+            try:
+                result = fn(*args)
+            finally:
+                self._release()
+        else:
+            try:
+                future = self._get_pool().submit(fn, *args)
+            except Exception:
+                self._release()
+                raise
+            # The slot is held until the task is done (or cancelled), not
+            # until the caller stops waiting for it
+            future.add_done_callback(self._release)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                abandoned = not future.cancel()
+                with self._lock:
+                    self._timeouts += 1
+                    if abandoned:
+                        # Already running: it keeps its process and slot
+                        self._abandoned += 1
+                raise PasswordHashingBusyError(f'Password hashing took longer than {self.timeout}s')
+            except BrokenProcessPool:
+                # A pool process died (e.g. OOM killed); start a fresh pool next time
+                logger.error('Password hashing pool broke, restarting it')
+                self.shutdown()
+                raise PasswordHashingBusyError('Password hashing pool restarting')
+
+        self._record(time.monotonic() - started)
+        return result
+
+    def _release(self, future=None):
+        """Free an admission slot (also used as a future done callback)."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context('forkserver')
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def _record(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self._completed += 1
+            self._latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            self._latency_total += ms
+            self._latency_max = max(self._latency_max, ms)
+
+    def stats(self):
+        """
+        Get a snapshot of executor usage.
+
+        Returns:
+            dict: Limits, in-flight count (abandoned hashes included until
+                they finish), counters and latency histogram
+        """
+        with self._lock:
+            labels = [f'<={b}ms' for b in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+                'abandoned': self._abandoned,
+                'latency_ms': {
+                    'avg': round(self._latency_total / self._completed, 3) if self._completed else 0.0,
+                    'max': round(self._latency_max, 3),
+                    'histogram': dict(zip(labels, self._latency_histogram)),
+                },
+            }
+
+    def shutdown(self):
+        """Stop the pool's processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_settings = {}
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def init_password_hashing(app):
+    """
+    Configure the hashing executor.
+
+    Args:
+        app: Flask application instance
+    """
+    _settings.update({
+        'workers': app.config['PASSWORD_HASH_WORKERS'],
+        'queue_size': app.config['PASSWORD_HASH_QUEUE_SIZE'],
+        'timeout': app.config['PASSWORD_HASH_TIMEOUT'],
+    })
+    logger.info(
+        f'Password hashing: {_settings["workers"]} processes, '
+        f'{_settings["queue_size"]} queued per worker'
+    )
+
+
+def get_executor():
+    """
+    Get this process's hashing executor, creating it on first use.
+
+    Returns:
+        HashingExecutor
+    """
+    global _executor
+
+    if _executor is not None and _executor.pid == os.getpid():
+        return _executor
+    with _executor_lock:
+        if _executor is None or _executor.pid != os.getpid():
+            _executor = HashingExecutor(**_settings)
+    return _executor
+
+
+def hash_password(password):
+    """
+    Hash a password off the request thread.
+
+    Returns:
+        str: Werkzeug password hash
+
+    Raises:
+        PasswordHashingBusyError: If hashing capacity is exhausted
+    """
+    return get_executor().run(generate_password_hash, password, HASH_METHOD)
+
+
+def verify_password(password_hash, password):
+    """
+    Check a password against its hash off the request thread.
+
+    Returns:
+        bool: True if the password matches
+
+    Raises:
+        PasswordHashingBusyError: If hashing capacity is exhausted
+    """
+    if not password_hash or password is None:
+        return False
+    return get_executor().run(check_password_hash, password_hash, password)
+
+
+def get_hashing_stats():
+    """Get this worker's hashing executor statistics."""
+    return get_executor().stats()
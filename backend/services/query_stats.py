@@ -0,0 +1,294 @@
+"""
+Query instrumentation for CLAIMS backend.
+Per-request statement statistics, slow-query log and N+1 detection.
+
+services.database reports every statement it runs (record_statement) and
+every pool checkout (record_pool_wait). Inside a request the figures are
+collected on flask.g; at the end of the request:
+
+- statements slower than SLOW_QUERY_THRESHOLD_MS have already been logged
+  as one `slow_query` line each (normalized SQL, duration, rows, endpoint),
+- a normalized statement that ran more than QUERY_N_PLUS_ONE_THRESHOLD
+  times is logged as a `n_plus_one` warning,
+- a `query_stats` debug line summarizes the request, and with
+  QUERY_STATS_SERVER_TIMING the totals are sent in a Server-Timing header.
+
+capture_queries() records statements regardless of request boundaries,
+for tests and benchmarks (see utils.testing).
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from flask import g, has_request_context, request
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_settings = {
+    'enabled': True,
+    'slow_ms': 200.0,
+    'n_plus_one': 10,
+    'server_timing': False,
+}
+
+_captures = threading.local()
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%(?:\(\w+\))?s')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'\bVALUES\s*\([^()]*\)(?:\s*,\s*\([^()]*\))*', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query):
+    """
+    Reduce a statement to its shape: literals and placeholders become ?,
+    IN lists and multi-row VALUES collapse, whitespace is folded.
+
+    Args:
+        query: SQL statement
+
+    Returns:
+        str: Normalized statement
+    """
+    sql = _STRING.sub('?', query)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_LIST.sub('VALUES (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class RequestQueryStats:
+    """Statements, time, rows and pool waits for one request."""
+
+    __slots__ = ('statements', 'total_seconds', 'rows', 'pool_wait_seconds', 'checkouts', 'by_statement')
+
+    def __init__(self):
+        self.statements = 0
+        self.total_seconds = 0.0
+        self.rows = 0
+        self.pool_wait_seconds = 0.0
+        self.checkouts = 0
+        self.by_statement = Counter()
+
+    def as_dict(self):
+        return {
+            'statements': self.statements,
+            'db_ms': round(self.total_seconds * 1000, 3),
+            'rows': self.rows,
+            'pool_wait_ms': round(self.pool_wait_seconds * 1000, 3),
+            'checkouts': self.checkouts,
+            'by_statement': dict(self.by_statement),
+        }
+
+
+def init_query_stats(app):
+    """
+    Configure instrumentation and register the end-of-request summary.
+
+    Args:
+        app: Flask application instance
+    """
+    _settings.update({
+        'enabled': app.config['QUERY_STATS_ENABLED'],
+        'slow_ms': app.config['SLOW_QUERY_THRESHOLD_MS'],
+        'n_plus_one': app.config['QUERY_N_PLUS_ONE_THRESHOLD'],
+        'server_timing': app.config['QUERY_STATS_SERVER_TIMING'],
+    })
+    if not _settings['enabled']:
+        return
+
+    app.after_request(_add_server_timing)
+    app.teardown_request(_finish_request)
+
+
+def _endpoint():
+    if has_request_context():
+        return f'{request.method} {request.endpoint or request.path}'
+    return '-'
+
+
+def _current():
+    """Stats of the current request, or None outside a request."""
+    if not has_request_context():
+        return None
+    stats = g.get('_query_stats')
+    if stats is None:
+        stats = g._query_stats = RequestQueryStats()
+    return stats
+
+
+def record_statement(query, seconds, rows=None):
+    """
+    Record one executed statement.
+
+    Args:
+        query: SQL statement as executed (with placeholders)
+        seconds: Execution time
+        rows: Rows fetched or affected, if known
+    """
+    if not _settings['enabled']:
+        return
+
+    if rows is not None and rows < 0:
+        rows = None
+    normalized = normalize_sql(query)
+    captured = getattr(_captures, 'stack', None)
+    if captured:
+        for capture in captured:
+            capture.append((normalized, seconds, rows))
+
+    stats = _current()
+    if stats is not None:
+        stats.statements += 1
+        stats.total_seconds += seconds
+        stats.rows += rows or 0
+        stats.by_statement[normalized] += 1
+
+    duration_ms = seconds * 1000
+    if duration_ms >= _settings['slow_ms']:
+        logger.warning(
+            f'slow_query duration_ms={duration_ms:.1f} rows={rows if rows is not None else "-"} '
+            f'endpoint="{_endpoint()}" sql="{normalized}"'
+        )
+
+
+def record_pool_wait(seconds):
+    """
+    Record the time spent checking a connection out of the pool.
+
+    Args:
+        seconds: Checkout wait
+    """
+    if not _settings['enabled']:
+        return
+    stats = _current()
+    if stats is not None:
+        stats.checkouts += 1
+        stats.pool_wait_seconds += seconds
+
+
+@contextmanager
+def timed_statement(query):
+    """
+    Time a statement executed inside the block and record it.
+
+    Yields:
+        list: Set item 0 to the row count once known
+
+    Example:
+        with timed_statement(query) as rows:
+            cursor.execute(query)
+            rows[0] = cursor.rowcount
+    """
+    rows = [None]
+    started = time.perf_counter()
+    try:
+        yield rows
+    finally:
+        record_statement(query, time.perf_counter() - started, rows[0])
+
+
+class InstrumentedCursor:
+    """
+    Cursor wrapper that records every execute()/executemany() call.
+
+    Everything else (fetch*, rowcount, lastrowid, iteration) is delegated
+    to the wrapped cursor.
+
+    Args:
+        cursor: DB-API cursor
+    """
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None, *args, **kwargs):
+        with timed_statement(query) as rows:
+            result = self._cursor.execute(query, params, *args, **kwargs)
+            rows[0] = self._rowcount()
+        return result
+
+    def executemany(self, query, seq_params, *args, **kwargs):
+        with timed_statement(query) as rows:
+            result = self._cursor.executemany(query, seq_params, *args, **kwargs)
+            rows[0] = self._rowcount()
+        return result
+
+    def _rowcount(self):
+        rowcount = getattr(self._cursor, 'rowcount', -1)
+        return rowcount if rowcount is not None and rowcount >= 0 else None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+def get_request_query_stats():
+    """
+    Get the current request's statistics so far.
+
+    Returns:
+        dict: Counters (empty outside a request)
+    """
+    stats = _current()
+    return stats.as_dict() if stats is not None else {}
+
+
+def _add_server_timing(response):
+    """Expose the request's database totals in a Server-Timing header."""
+    stats = g.get('_query_stats')
+    if _settings['server_timing'] and stats is not None:
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.statements} queries", '
+            f'dbpool;dur={stats.pool_wait_seconds * 1000:.1f}'
+        )
+    return response
+
+
+def _finish_request(exc=None):
+    """Log the request summary and any N+1 statements."""
+    stats = g.pop('_query_stats', None)
+    if stats is None:
+        return
+
+    endpoint = _endpoint()
+    threshold = _settings['n_plus_one']
+    for normalized, count in stats.by_statement.items():
+        if count > threshold:
+            logger.warning(f'n_plus_one count={count} endpoint="{endpoint}" sql="{normalized}"')
+
+    logger.debug(
+        f'query_stats endpoint="{endpoint}" statements={stats.statements} '
+        f'db_ms={stats.total_seconds * 1000:.1f} rows={stats.rows} '
+        f'pool_wait_ms={stats.pool_wait_seconds * 1000:.1f} checkouts={stats.checkouts}'
+    )
+
+
+@contextmanager
+def capture_queries():
+    """
+    Collect every statement recorded in this thread inside the block.
+
+    Yields:
+        list: (normalized_sql, seconds, rows) tuples, filled as statements run
+    """
+    stack = getattr(_captures, 'stack', None)
+    if stack is None:
+        stack = _captures.stack = []
+    captured = []
+    stack.append(captured)
+    try:
+        yield captured
+    finally:
+        stack.remove(captured)
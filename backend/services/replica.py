@@ -0,0 +1,169 @@
+"""
+Read replica support for CLAIMS backend.
+Tracks whether the replica is reachable and close enough to the primary.
+
+services.database routes read-only queries to the replica pool only while
+ReplicaMonitor.available() is true. Health is re-checked at most every
+DB_REPLICA_CHECK_INTERVAL seconds by whichever thread asks first (the rest
+keep using the last result), so routing costs no extra round trip per
+query. The replica is treated as unavailable when:
+
+- SHOW REPLICA STATUS reports a lag above DB_REPLICA_MAX_LAG,
+- replication is stopped or not configured (no lag reported),
+- a check or a routed query failed to connect (until the next check).
+"""
+import threading
+import time
+from mysql.connector import errors
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Errors meaning the replica itself is unusable (as opposed to a bad query)
+CONNECTION_ERRORS = (errors.InterfaceError, errors.OperationalError)
+
+
+class ReplicaMonitor:
+    """
+    Lag and reachability tracking for the replica pool.
+
+    Args:
+        pool: ClaimsConnectionPool connected to the replica
+        max_lag: Seconds of replication lag above which reads go to the primary
+        check_interval: Seconds between health checks
+    """
+
+    def __init__(self, pool, max_lag=5, check_interval=5):
+        self.pool = pool
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._healthy = False
+        self._lag = None
+        self._reason = 'not checked yet'
+        self._next_check = 0.0
+        self._last_check = None
+
+        # Counters
+        self._checks = 0
+        self._failures = 0
+        self._fallbacks = 0
+
+    def available(self):
+        """
+        Check whether reads may go to the replica, refreshing the health
+        check if it is due.
+
+        Returns:
+            bool: True if the replica is reachable and within max_lag
+        """
+        if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                if time.monotonic() >= self._next_check:
+                    self._check()
+            finally:
+                self._lock.release()
+        return self._healthy
+
+    def _check(self):
+        """Query the replica's replication status and update the health state."""
+        self._checks += 1
+        self._last_check = time.time()
+        self._next_check = time.monotonic() + self.check_interval
+
+        conn = None
+        try:
+            conn = self.pool.get_connection(timeout=min(self.pool.timeout, 1))
+            lag = self._read_lag(conn)
+        except Exception as e:
+            self._set_state(False, None, f'health check failed: {str(e)}')
+            return
+        finally:
+            if conn is not None:
+                conn.close()
+
+        if lag is None:
+            self._set_state(False, None, 'replication is not running')
+        elif lag > self.max_lag:
+            self._set_state(False, lag, f'lag {lag}s exceeds {self.max_lag}s')
+        else:
+            self._set_state(True, lag, 'ok')
+
+    @staticmethod
+    def _read_lag(conn):
+        """
+        Get the replica's lag in seconds.
+
+        Returns:
+            int or None: Seconds behind the primary; None if replication is
+                stopped or the server is not a replica
+        """
+        cursor = conn.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except errors.ProgrammingError:
+                # MySQL < 8.0.22 / MariaDB
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+        if not status:
+            return None
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        return None if lag is None else int(lag)
+
+    def _set_state(self, healthy, lag, reason):
+        if healthy != self._healthy:
+            if healthy:
+                logger.info(f'Read replica available (lag {lag}s), routing reads to it')
+            else:
+                logger.warning(f'Read replica unavailable ({reason}), reading from the primary')
+        self._healthy = healthy
+        self._lag = lag
+        self._reason = reason
+
+    def reset_after_fork(self):
+        """Reset the pool and lock in a forked child; health is re-checked on first use."""
+        self.pool.reset_after_fork()
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+
+    def mark_failed(self, error):
+        """
+        Stop routing to the replica until the next health check, after a
+        routed query could not reach it.
+
+        Args:
+            error: The connection error
+        """
+        self._failures += 1
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            self._set_state(False, None, f'query failed: {str(error)}')
+
+    def record_fallback(self):
+        """Count a read that was meant for the replica but ran on the primary."""
+        self._fallbacks += 1
+
+    def stats(self):
+        """
+        Get a snapshot of replica health and routing.
+
+        Returns:
+            dict: Health state, last lag, counters and the replica pool stats
+        """
+        return {
+            'healthy': self._healthy,
+            'lag_seconds': self._lag,
+            'max_lag_seconds': self.max_lag,
+            'reason': self._reason,
+            'last_check': self._last_check,
+            'checks': self._checks,
+            'failures': self._failures,
+            'fallbacks': self._fallbacks,
+            'pool': self.pool.stats(),
+        }
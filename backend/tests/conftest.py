@@ -0,0 +1,142 @@
+"""
+Shared fixtures for CLAIMS backend tests.
+
+The app is created with the testing config. Database access goes through
+FakePool, an in-memory stand-in for ClaimsConnectionPool that answers
+queries by table, so endpoint tests exercise the real request path
+(unit of work, instrumentation, streaming) without a MySQL server.
+"""
+import os
+import re
+import tempfile
+
+# Before config is imported: keep shared state and logs out of the tree
+_state_dir = tempfile.mkdtemp(prefix='claims-test-')
+os.environ.setdefault('SHARED_STATE_DIR', _state_dir)
+os.environ.setdefault('LOG_FILE', os.path.join(_state_dir, 'claims.log'))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from services import database
+
+_TABLE = re.compile(r'\bFROM\s+(\w+)', re.IGNORECASE)
+
+
+class FakeCursor:
+    """DB-API cursor returning the rows registered for the queried table."""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._rows = []
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        self._pool.executed.append((query, params))
+        match = _TABLE.search(query)
+        self._rows = list(self._pool.tables.get(match.group(1) if match else None, []))
+        self.rowcount = len(self._rows)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Pooled connection stand-in."""
+
+    in_transaction = False
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def cursor(self, dictionary=False, buffered=None):
+        return FakeCursor(self._pool)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._pool.in_use -= 1
+
+    def discard(self):
+        self._pool.in_use -= 1
+
+
+class FakePool:
+    """
+    ClaimsConnectionPool stand-in.
+
+    Args:
+        tables: {table name: list of row tuples} returned by SELECTs
+
+    Statements run are recorded in `executed` as (query, params).
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.executed = []
+        self.in_use = 0
+
+    def get_connection(self, timeout=None):
+        self.in_use += 1
+        return FakeConnection(self)
+
+    def stats(self):
+        return {'in_use': self.in_use}
+
+
+@pytest.fixture(scope='session')
+def app():
+    return create_app('testing')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """
+    Route all database access to a FakePool.
+
+    Returns:
+        FakePool: Set rows with fake_db.tables['laboratories'] = [...]
+    """
+    pool = FakePool({})
+    monkeypatch.setattr(database, 'connection_pool', pool)
+    monkeypatch.setattr(database, 'stream_pool', None)
+    monkeypatch.setattr(database, 'replica', None)
+    return pool
+
+
+@pytest.fixture
+def auth_headers(app):
+    """
+    Build request headers carrying an access token.
+
+    Returns:
+        callable: auth_headers(role, email) -> headers dict
+    """
+    def build(role, email):
+        with app.app_context():
+            token = create_access_token(
+                identity='1',
+                additional_claims={'role': role, 'name': 'Test User', 'email': email, 'year': None}
+            )
+        return {'Authorization': f'Bearer {token}'}
+    return build
@@ -0,0 +1,21 @@
+"""
+Dashboard payload and its ETag.
+"""
+
+
+def test_unchanged_dashboard_keeps_its_etag(client, fake_db):
+    # TOTALS_QUERY's first subquery reads users
+    fake_db.tables['users'] = [(3, 10, 20, 2)]
+    fake_db.tables['computer_parts'] = [('Monitor', 'operational', 18), ('monitor', 'damaged', 2)]
+    fake_db.tables['laboratories'] = [(1, 'Lab A', 20, 2, 0)]
+
+    first = client.get('/get_data')
+    # Rebuilt from the same data
+    second = client.get('/get_data')
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert set(first.get_json()) == {'stats', 'computerPartStatus', 'labEquipments', 'damageMissing'}
+
+    revalidated = client.get('/get_data', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
@@ -0,0 +1,37 @@
+"""
+The default admin credentials rule behind must_change_credentials.
+"""
+from werkzeug.security import generate_password_hash
+from services.admin_init import (
+    DEFAULT_ADMIN_EMAIL, DEFAULT_ADMIN_ID, DEFAULT_ADMIN_PASSWORD, create_default_admin, has_default_credentials
+)
+
+DEFAULT_HASH = generate_password_hash(DEFAULT_ADMIN_PASSWORD)
+
+
+def test_only_default_id_email_and_password_match(fake_db):
+    assert has_default_credentials(DEFAULT_ADMIN_ID, DEFAULT_ADMIN_EMAIL, password=DEFAULT_ADMIN_PASSWORD)
+    assert has_default_credentials(DEFAULT_ADMIN_ID, DEFAULT_ADMIN_EMAIL, password_hash=DEFAULT_HASH)
+    assert not has_default_credentials(DEFAULT_ADMIN_ID, 'it@school.edu', password=DEFAULT_ADMIN_PASSWORD)
+    assert not has_default_credentials(DEFAULT_ADMIN_ID, DEFAULT_ADMIN_EMAIL, password='s3cure-pass')
+    assert not has_default_credentials('7', DEFAULT_ADMIN_EMAIL, password=DEFAULT_ADMIN_PASSWORD)
+    assert fake_db.executed == []
+
+
+def test_missing_values_are_read_from_the_account(fake_db):
+    fake_db.tables['users'] = [(DEFAULT_ADMIN_EMAIL, DEFAULT_HASH)]
+
+    # Email changed, password kept: no longer flagged
+    assert not has_default_credentials(DEFAULT_ADMIN_ID, 'it@school.edu')
+    # Password kept, email unchanged
+    assert has_default_credentials(DEFAULT_ADMIN_ID)
+
+
+def test_created_admin_is_flagged_only_with_default_password(app, fake_db, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_INIT_PASSWORD', 'from-secret-store')
+    with app.app_context():
+        assert create_default_admin()
+
+    query, params = fake_db.executed[-1]
+    assert query.strip().startswith('INSERT INTO users')
+    assert params[4] is False
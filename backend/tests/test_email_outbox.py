@@ -0,0 +1,33 @@
+"""
+Access to queued email state.
+"""
+import pytest
+
+ENTRY = (
+    7, 'Lab Report Summary: Week 3', '["tech@example.com"]', 'report.html', '{}',
+    'sent', 1, None, '2026-01-05 10:00:00', '2026-01-05 10:00:05', 'Tech@example.com'
+)
+
+
+@pytest.fixture
+def outbox(fake_db):
+    fake_db.tables['email_outbox'] = [ENTRY]
+    return fake_db
+
+
+@pytest.mark.parametrize('role, email', [
+    ('admin', 'admin@example.com'),
+    ('technician', 'tech@example.com'),
+])
+def test_admin_and_requester_can_read_entry(client, outbox, auth_headers, role, email):
+    response = client.get('/email_outbox/7', headers=auth_headers(role, email))
+
+    assert response.status_code == 200
+    assert response.get_json()['recipients'] == ['tech@example.com']
+
+
+def test_other_users_entries_are_not_found(client, outbox, auth_headers):
+    response = client.get('/email_outbox/7', headers=auth_headers('itsd', 'itsd@example.com'))
+
+    assert response.status_code == 404
+    assert 'recipients' not in response.get_data(as_text=True)
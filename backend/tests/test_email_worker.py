@@ -0,0 +1,113 @@
+"""
+Email outbox delivery against a local SMTP server.
+"""
+import json
+import socket
+import pytest
+from services.email_outbox import process_batch, retry_delay
+from services.email_service import SMTPBatchSender, mail
+
+controller = pytest.importorskip('aiosmtpd.controller')
+
+CONTEXT = json.dumps({'title': 'Week 3', 'summary': [], 'name': 'Tech One', 'position': 'technician'})
+
+
+def outbox_row(outbox_id, subject, recipient, attempts):
+    # Columns selected by claim_batch
+    return (outbox_id, subject, json.dumps([recipient]), 'report.html', CONTEXT, attempts)
+
+
+class RecordingHandler:
+    """Accepts mail, refusing recipients at bounce.example.com."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.endswith('@bounce.example.com'):
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content.decode()))
+        return '250 Message accepted'
+
+
+@pytest.fixture
+def smtp_server(app, monkeypatch):
+    """Point Flask-Mail at an aiosmtpd server on a free local port."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+
+    handler = RecordingHandler()
+    server = controller.Controller(handler, hostname='127.0.0.1', port=port)
+    server.start()
+
+    settings = {
+        'MAIL_SERVER': '127.0.0.1', 'MAIL_PORT': port, 'MAIL_USE_TLS': False, 'MAIL_USE_SSL': False,
+        'MAIL_USERNAME': None, 'MAIL_PASSWORD': None, 'MAIL_DEFAULT_SENDER': 'claims@example.com',
+        'MAIL_SUPPRESS_SEND': False,
+        'EMAIL_MAX_ATTEMPTS': 3, 'EMAIL_RETRY_BASE_DELAY': 30, 'EMAIL_RETRY_MAX_DELAY': 3600,
+    }
+    for name, value in settings.items():
+        monkeypatch.setitem(app.config, name, value)
+    monkeypatch.setitem(app.extensions, 'mail', mail.init_mail(app.config))
+
+    yield handler
+    server.stop()
+
+
+def outbox_updates(fake_db):
+    """(SET clause, params) of the UPDATEs run against email_outbox."""
+    return [
+        (' '.join(query.split()), params) for query, params in fake_db.executed
+        if query.lstrip().startswith('UPDATE email_outbox')
+    ]
+
+
+def test_batch_records_sent_retry_and_failed(app, fake_db, smtp_server):
+    fake_db.tables['email_outbox'] = [
+        outbox_row(1, 'Delivered', 'tech@example.com', attempts=0),
+        outbox_row(2, 'Bounces, retried', 'tech@bounce.example.com', attempts=1),
+        outbox_row(3, 'Bounces, last attempt', 'tech@bounce.example.com', attempts=2),
+    ]
+
+    with app.app_context(), SMTPBatchSender.from_config(app.config) as sender:
+        assert process_batch(app.config, sender) == 3
+
+    # Only the deliverable email reached the server
+    assert [(rcpt, 'Subject: Delivered' in content) for rcpt, content in smtp_server.messages] == [
+        (['tech@example.com'], True)
+    ]
+
+    claim, sent, retried, failed = outbox_updates(fake_db)
+    assert "SET status = 'sending', attempts = attempts + 1" in claim[0]
+    assert claim[1] == (app.config['EMAIL_SEND_LEASE'], 1, 2, 3)
+
+    assert "SET status = 'sent', sent_at = NOW()" in sent[0]
+    assert sent[1] == (1,)
+
+    # Second attempt failed: pending again, due after 30s * 2
+    assert "SET status = 'pending'" in retried[0]
+    assert 'next_attempt_at = NOW() + INTERVAL %s SECOND' in retried[0]
+    error, delay, outbox_id = retried[1]
+    assert (delay, outbox_id) == (60, 2)
+    assert '550' in error and 'No such user' in error
+
+    # Third of EMAIL_MAX_ATTEMPTS failed: given up
+    assert "SET status = 'failed'" in failed[0]
+    assert failed[1][1] == 3
+
+
+def test_nothing_due_sends_nothing(app, fake_db, smtp_server):
+    with app.app_context():
+        assert process_batch(app.config) == 0
+
+    assert smtp_server.messages == []
+    assert len(outbox_updates(fake_db)) == 0
+
+
+def test_retry_delay_backs_off_up_to_the_maximum():
+    assert [retry_delay(attempts, 30, 3600) for attempts in (1, 2, 3, 8, 20)] == [30, 60, 120, 3600, 3600]
@@ -0,0 +1,30 @@
+"""
+Server-Sent Events stream subscriptions.
+"""
+from werkzeug.test import EnvironBuilder
+from services.events import get_broadcaster
+
+
+def test_subscription_released_when_client_leaves_before_first_chunk(app, auth_headers):
+    broadcaster = get_broadcaster()
+    before = broadcaster.subscriber_count
+    environ = EnvironBuilder('/events', headers=auth_headers('admin', 'admin@example.com')).get_environ()
+    statuses = []
+
+    # Called as a WSGI server would; the test client pulls the first chunk itself
+    body = app(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    assert statuses == ['200 OK']
+    assert broadcaster.subscriber_count == before + 1
+
+    # Closed without pulling a chunk: the generator never starts
+    body.close()
+
+    assert broadcaster.subscriber_count == before
+
+
+def test_unsubscribe_is_idempotent():
+    broadcaster = get_broadcaster()
+    subscription = broadcaster.subscribe()
+
+    assert broadcaster.unsubscribe(subscription)
+    assert not broadcaster.unsubscribe(subscription)
@@ -0,0 +1,16 @@
+"""
+Health endpoints.
+"""
+
+
+def test_liveness_is_public(client):
+    assert client.get('/health').status_code == 200
+
+
+def test_pool_statistics_require_admin(client, fake_db, auth_headers):
+    assert client.get('/health/db').status_code == 401
+    assert client.get('/health/db', headers=auth_headers('technician', 'tech@example.com')).status_code == 403
+
+    response = client.get('/health/db', headers=auth_headers('admin', 'admin@example.com'))
+    assert response.status_code == 200
+    assert response.get_json()['pool'] == {'in_use': 0}
@@ -0,0 +1,38 @@
+"""
+Response encoding and raw JSON passthrough.
+"""
+import json
+import pytest
+from utils.json_provider import ClaimsJSONProvider, raw_json
+
+PAYLOAD = {'b': 'Café', 'a': [1, 2], 'specs': raw_json('{"cpu": "i5"}')}
+
+
+@pytest.fixture
+def provider(app):
+    return ClaimsJSONProvider(app)
+
+
+def test_raw_json_is_embedded_verbatim(provider):
+    assert provider.dumps(PAYLOAD) == '{"a":[1,2],"b":"Café","specs":{"cpu": "i5"}}'
+
+
+def test_ensure_ascii_is_honoured(provider):
+    provider.ensure_ascii = True
+
+    encoded = provider.dumps(PAYLOAD)
+
+    assert '"b": "Caf\\u00e9"' in encoded
+    assert json.loads(encoded)['specs'] == {'cpu': 'i5'}
+
+
+def test_sort_keys_can_be_disabled(provider):
+    provider.sort_keys = False
+
+    assert list(json.loads(provider.dumps(PAYLOAD))) == ['b', 'a', 'specs']
+
+
+@pytest.mark.parametrize('stored', ['{"cpu": ', 'not json', b'\xff', None, ''])
+def test_invalid_stored_json_falls_back_to_empty(provider, stored):
+    assert json.loads(provider.dumps({'specs': raw_json(stored)})) == {'specs': {}}
+    assert json.loads(provider.dumps({'parts': raw_json(stored, empty='[]')})) == {'parts': []}
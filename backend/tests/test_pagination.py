@@ -0,0 +1,48 @@
+"""
+Keyset pagination of list endpoints.
+"""
+from datetime import datetime, timedelta
+
+START = datetime(2026, 1, 1, 12)
+
+LOGS = [
+    # Selected columns, then the sort column and id that ListQuery appends
+    (i, i, 'tech-1', 'Tech One', 'Replaced cable', 'operational', START + timedelta(minutes=i))
+    + (START + timedelta(minutes=i), i)
+    for i in range(60, 0, -1)
+]
+
+
+def test_list_without_limit_is_bounded(client, fake_db, auth_headers):
+    fake_db.tables['technician_logs'] = LOGS[:51]
+
+    response = client.get('/get_technician_logs', headers=auth_headers('technician', 'tech@example.com'))
+
+    assert response.status_code == 200
+    page = response.get_json()
+    assert len(page['items']) == 50
+    assert page['next_cursor']
+    query, params = fake_db.executed[-1]
+    assert query.endswith('LIMIT %s') and params[-1] == 51
+
+
+def test_next_cursor_continues_after_last_item(client, fake_db, auth_headers):
+    headers = auth_headers('technician', 'tech@example.com')
+    fake_db.tables['technician_logs'] = LOGS[:3]
+    first = client.get('/get_technician_logs?limit=2', headers=headers).get_json()
+
+    fake_db.tables['technician_logs'] = LOGS[2:3]
+    second = client.get(f"/get_technician_logs?limit=2&cursor={first['next_cursor']}", headers=headers).get_json()
+
+    assert [log['id'] for log in first['items']] == [60, 59]
+    assert [log['id'] for log in second['items']] == [58]
+    assert second['next_cursor'] is None
+    query, params = fake_db.executed[-1]
+    assert 'created_at < %s OR (created_at = %s AND id < %s)' in query
+    assert params[-1] == 3 and params[-2] == 59
+
+
+def test_limit_above_maximum_is_rejected(client, fake_db, auth_headers):
+    response = client.get('/get_technician_logs?limit=501', headers=auth_headers('technician', 'tech@example.com'))
+
+    assert response.status_code == 400
@@ -0,0 +1,35 @@
+"""
+Admission control of the password hashing pool.
+"""
+import time
+import pytest
+from services.password_hashing import HashingExecutor, PasswordHashingBusyError
+
+
+@pytest.fixture
+def executor():
+    executor = HashingExecutor(workers=1, queue_size=0, timeout=10)
+    # Start the pool process before timing anything
+    executor.run(time.sleep, 0)
+    yield executor
+    executor.shutdown()
+
+
+def test_timed_out_hash_keeps_its_slot_until_done(executor):
+    executor.timeout = 0.2
+    with pytest.raises(PasswordHashingBusyError, match='took longer'):
+        executor.run(time.sleep, 1)
+
+    # Still running in the pool process: no new work is admitted
+    with pytest.raises(PasswordHashingBusyError, match='saturated'):
+        executor.run(time.sleep, 0)
+    stats = executor.stats()
+    assert stats['in_flight'] == 1
+    assert stats['abandoned'] == 1
+
+    deadline = time.monotonic() + 5
+    while executor.stats()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    executor.timeout = 10
+    executor.run(time.sleep, 0)
+    assert executor.stats()['in_flight'] == 0
@@ -0,0 +1,48 @@
+"""
+Statement budgets and per-request query statistics.
+"""
+import logging
+import pytest
+from utils.testing import TooManyQueriesError
+
+LABS = [(1, 'Lab A', 'Building 1', 12), (2, 'Lab B', 'Building 2', 0)]
+COMPUTERS = [(f'pc-{i}', f'PC-{i:03d}', 'Lab A', 1, '{}', '[]') for i in range(50)]
+
+
+def test_get_laboratory_within_budget(client, fake_db, max_queries):
+    fake_db.tables['laboratories'] = LABS
+
+    with max_queries(1) as captured:
+        response = client.get('/get_laboratory')
+
+    assert response.status_code == 200
+    assert [lab['lab_name'] for lab in response.get_json()] == ['Lab A', 'Lab B']
+    assert captured[0][0].startswith('SELECT l.id, l.name, l.location')
+    # Counts are grouped by lab_id before the join; lab columns are not grouped
+    assert captured[0][0].count('GROUP BY') == 1 and 'GROUP BY lab_id' in captured[0][0]
+    assert fake_db.in_use == 0
+
+
+def test_max_queries_reports_excess_statements(client, fake_db, max_queries):
+    fake_db.tables['laboratories'] = LABS
+
+    with pytest.raises(TooManyQueriesError, match='1 statements run, at most 0 expected'):
+        with max_queries(0):
+            client.get('/get_laboratory')
+
+
+def test_stream_closed_early_is_counted(app, fake_db, caplog, monkeypatch):
+    fake_db.tables['computers'] = COMPUTERS
+    monkeypatch.setattr('services.database.stream_batch_size', 10)
+    caplog.set_level(logging.DEBUG, logger='services.query_stats')
+
+    response = app.test_client().get('/get_computers', buffered=False)
+    body = iter(response.response)
+    next(body)
+    # Client goes away after the first chunk
+    response.close()
+
+    summaries = [r.getMessage() for r in caplog.records if r.getMessage().startswith('query_stats')]
+    assert summaries == [summaries[0]]
+    assert 'endpoint="GET computers.get_computers" statements=1' in summaries[0]
+    assert fake_db.in_use == 0
@@ -0,0 +1,35 @@
+"""
+Request unit of work: commit callbacks.
+"""
+from flask import Flask
+from services import database
+
+
+def make_app(status):
+    app = Flask(__name__)
+    app.after_request(database.finish_unit_of_work)
+    calls = []
+
+    @app.route('/')
+    def index():
+        # No statement runs, so no connection is checked out
+        database.on_commit(lambda: calls.append('committed'))
+        return '', status
+
+    return app, calls
+
+
+def test_callbacks_run_without_a_connection():
+    app, calls = make_app(204)
+
+    app.test_client().get('/')
+
+    assert calls == ['committed']
+
+
+def test_callbacks_dropped_for_failed_response():
+    app, calls = make_app(409)
+
+    app.test_client().get('/')
+
+    assert calls == []
@@ -1,19 +1,95 @@
 """
 Decorators for CLAIMS backend.
-Provides JWT authentication and role-based access control decorators.
+Provides JWT authentication, role-based access control and conditional
+response decorators.
 """
+from collections import namedtuple
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+from types import MappingProxyType
+from flask import g, jsonify, request, current_app
+from flask_jwt_extended import verify_jwt_in_request
+from services.data_versions import compute_etag
+from services.database import read_from_primary
 from services.logger import get_logger
 
 logger = get_logger(__name__)
 
+# One bit per role; decorators precompute the mask of roles they allow
+ROLE_BITS = {
+    'admin': 1,
+    'dean': 2,
+    'itsd': 4,
+    'technician': 8,
+}
+
+# Authenticated user for the current request, built once from the JWT
+Principal = namedtuple('Principal', ['id', 'role', 'name', 'email', 'year', 'permissions', 'claims'])
+
+
+def roles_mask(roles):
+    """
+    Combine role names into a permission bitmask.
+    
+    Args:
+        roles: Iterable of role names
+        
+    Returns:
+        int: Bitmask with the bit of every known role set
+    """
+    mask = 0
+    for role in roles:
+        mask |= ROLE_BITS.get(role, 0)
+    return mask
+
+
+def load_principal():
+    """
+    Verify the request's JWT once and cache the resulting principal on g.
+    
+    Later calls in the same request (stacked decorators, helpers) reuse the
+    cached principal or the cached verification error instead of decoding
+    and verifying the token again. flask_jwt_extended's get_jwt() and
+    get_jwt_identity() keep working, reading the token verified here.
+    
+    Returns:
+        Principal: Authenticated user, or None for methods exempt from
+        JWT checks (e.g. OPTIONS)
+        
+    Raises:
+        Exception: The verification error if the token is missing or invalid
+    """
+    if '_auth_principal' in g:
+        return g._auth_principal
+    if '_auth_error' in g:
+        raise g._auth_error
+    
+    try:
+        verified = verify_jwt_in_request()
+    except Exception as e:
+        g._auth_error = e
+        raise
+    
+    principal = None
+    if verified is not None:
+        claims = verified[1]
+        role = claims.get('role', '')
+        principal = Principal(
+            id=claims.get(current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')),
+            role=role,
+            name=claims.get('name'),
+            email=claims.get('email'),
+            year=claims.get('year'),
+            permissions=ROLE_BITS.get(role, 0),
+            claims=MappingProxyType(claims)
+        )
+    g._auth_principal = principal
+    return principal
+
 
 def jwt_required_custom(fn):
     """
     Decorator to require JWT authentication for endpoints.
-    Wraps flask_jwt_extended's jwt_required with custom error handling.
+    Verifies the token through load_principal with custom error handling.
     
     Usage:
         @jwt_required_custom
@@ -23,8 +99,7 @@ def jwt_required_custom(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         try:
-            verify_jwt_in_request()
-            return fn(*args, **kwargs)
+            load_principal()
         except Exception as e:
             logger.warning(f'JWT verification failed: {str(e)}')
             return jsonify({
@@ -32,9 +107,20 @@ def jwt_required_custom(fn):
                 "message": "Authentication required",
                 "error": str(e)
             }), 401
+        return fn(*args, **kwargs)
     return wrapper
 
 
+def _deny(message, error=None):
+    response = {
+        "success": False,
+        "message": message
+    }
+    if error is not None:
+        response["error"] = str(error)
+    return jsonify(response), 403
+
+
 def admin_required(fn):
     """
     Decorator to require admin role for endpoints.
@@ -46,28 +132,22 @@ def admin_required(fn):
         def admin_only_route():
             ...
     """
+    required = ROLE_BITS['admin']
+    
     @wraps(fn)
     def wrapper(*args, **kwargs):
         try:
-            verify_jwt_in_request()
-            claims = get_jwt()
-            user_role = claims.get('role', '')
-            
-            if user_role != 'admin':
-                logger.warning(f'Admin access denied for user with role: {user_role}')
-                return jsonify({
-                    "success": False,
-                    "message": "Admin access required"
-                }), 403
-            
-            return fn(*args, **kwargs)
+            principal = load_principal()
         except Exception as e:
             logger.error(f'Admin check failed: {str(e)}')
-            return jsonify({
-                "success": False,
-                "message": "Access denied",
-                "error": str(e)
-            }), 403
+            return _deny("Access denied", e)
+        
+        if principal is None or not principal.permissions & required:
+            user_role = principal.role if principal else ''
+            logger.warning(f'Admin access denied for user with role: {user_role}')
+            return _deny("Admin access required")
+        
+        return fn(*args, **kwargs)
     return wrapper
 
 
@@ -85,47 +165,94 @@ def role_required(*allowed_roles):
         def multi_role_route():
             ...
     """
+    required = roles_mask(allowed_roles)
+    
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             try:
-                verify_jwt_in_request()
-                claims = get_jwt()
-                user_role = claims.get('role', '')
-                
-                if user_role not in allowed_roles:
-                    logger.warning(f'Access denied for user with role: {user_role}. Required: {allowed_roles}')
-                    return jsonify({
-                        "success": False,
-                        "message": f"Access denied. Required roles: {', '.join(allowed_roles)}"
-                    }), 403
-                
-                return fn(*args, **kwargs)
+                principal = load_principal()
             except Exception as e:
                 logger.error(f'Role check failed: {str(e)}')
-                return jsonify({
-                    "success": False,
-                    "message": "Access denied",
-                    "error": str(e)
-                }), 403
+                return _deny("Access denied", e)
+            
+            if principal is None or not principal.permissions & required:
+                user_role = principal.role if principal else ''
+                logger.warning(f'Access denied for user with role: {user_role}. Required: {allowed_roles}')
+                return _deny(f"Access denied. Required roles: {', '.join(allowed_roles)}")
+            
+            return fn(*args, **kwargs)
         return wrapper
     return decorator
 
 
-def get_current_user_id():
+def conditional_on(*tables):
     """
-    Get the current user's ID from JWT token.
+    Decorator to serve a read endpoint with a strong ETag derived from the
+    versions of the tables it reads, answering 304 Not Modified (without
+    calling the endpoint) when the client's If-None-Match still matches.
+    
+    The endpoint reads from the primary: the table versions advance when
+    the primary commits, so a body from a lagging replica would be cached
+    under the new ETag.
+    
+    Args:
+        *tables: Tables the response depends on
+    
+    Usage:
+        @computers_bp.route('/get_computers')
+        @conditional_on('computers', 'laboratories')
+        def get_computers():
+            ...
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            read_from_primary()
+            etag = compute_etag(tables, variant=request.query_string.decode('latin-1'))
+            if etag is None:
+                return fn(*args, **kwargs)
+            
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            # Always revalidate, so clients never use a stale copy
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def get_current_principal():
+    """
+    Get the current request's principal.
     
     Returns:
-        str: User's ID or None
+        Principal: Authenticated user or None
     """
     try:
-        return get_jwt_identity()
+        return load_principal()
     except Exception as e:
-        logger.error(f'Failed to get current user ID: {str(e)}')
+        logger.error(f'Failed to load current principal: {str(e)}')
         return None
 
 
+def get_current_user_id():
+    """
+    Get the current user's ID from JWT token.
+    
+    Returns:
+        str: User's ID or None
+    """
+    principal = get_current_principal()
+    return principal.id if principal else None
+
+
 def get_current_user_claims():
     """
     Get the current user's JWT claims.
@@ -133,8 +260,5 @@ def get_current_user_claims():
     Returns:
         dict: JWT claims or empty dict
     """
-    try:
-        return get_jwt()
-    except Exception as e:
-        logger.error(f'Failed to get current user claims: {str(e)}')
-        return {}
+    principal = get_current_principal()
+    return principal.claims if principal else {}
@@ -0,0 +1,123 @@
+"""
+Sparse fieldset utilities for CLAIMS backend.
+Lets clients pick response fields with ?fields=a,b,c.
+
+An endpoint declares each response field once with the SQL columns it is
+built from. Only the columns of the requested fields are selected, and
+builders (e.g. status code mapping) only run for requested fields:
+
+    COMPUTER_FIELDS = FieldSet({
+        'id': Field(['c.id']),
+        'specs': Field(['c.specs'], raw_json),
+    })
+
+    selection = COMPUTER_FIELDS.select(request.args)
+    rows = execute_query(f"SELECT {', '.join(selection.columns)} FROM ...")
+    items = [selection.serialize(row) for row in rows]
+
+Without ?fields every field is returned, as before.
+"""
+from collections import namedtuple
+from utils.validators import parse_list_param
+
+
+class Field(namedtuple('Field', ['columns', 'build'])):
+    """
+    Response field built from SQL columns.
+
+    Args:
+        columns: Column expressions the field needs
+        build: Called with the column values to produce the field value;
+            None returns the single column's value unchanged
+    """
+    __slots__ = ()
+
+    def __new__(cls, columns, build=None):
+        return super().__new__(cls, tuple(columns), build)
+
+
+class FieldSetError(ValueError):
+    """Raised when ?fields names an unknown field."""
+
+
+class Selection:
+    """
+    Fields chosen for one request and the columns they need.
+
+    Attributes:
+        names: Selected field names, in declaration order
+        columns: Unique column expressions to select, in first-use order
+    """
+
+    def __init__(self, fields, names):
+        self.names = names
+        self.columns = []
+        for name in names:
+            for column in fields[name].columns:
+                if column not in self.columns:
+                    self.columns.append(column)
+
+        self._getters = [
+            (name, [self.columns.index(column) for column in fields[name].columns], fields[name].build)
+            for name in names
+        ]
+
+    def uses(self, prefix):
+        """Check whether any selected column starts with prefix (e.g. a join alias 'l.')."""
+        return any(column.startswith(prefix) for column in self.columns)
+
+    def serialize(self, row):
+        """
+        Build the response dict for one row of `columns`.
+
+        Args:
+            row: Tuple of values in `columns` order
+
+        Returns:
+            dict: Selected fields
+        """
+        item = {}
+        for name, indexes, build in self._getters:
+            if build is None:
+                item[name] = row[indexes[0]]
+            else:
+                item[name] = build(*(row[i] for i in indexes))
+        return item
+
+
+class FieldSet:
+    """
+    The fields an endpoint can return.
+
+    Args:
+        fields: Map of field name -> Field, in response order
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._all = Selection(fields, list(fields))
+
+    def select(self, args, param='fields'):
+        """
+        Resolve the fields requested in args.
+
+        Args:
+            args: Request args
+            param: Query parameter holding the comma-separated field names
+
+        Returns:
+            Selection
+
+        Raises:
+            FieldSetError: If an unknown field is requested
+        """
+        requested = parse_list_param(args, param)
+        if not requested:
+            return self._all
+
+        unknown = [name for name in requested if name not in self.fields]
+        if unknown:
+            raise FieldSetError(
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}"
+            )
+        return Selection(self.fields, [name for name in self.fields if name in requested])
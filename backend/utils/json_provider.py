@@ -0,0 +1,152 @@
+"""
+JSON provider for CLAIMS backend.
+Fast response encoding and raw JSON passthrough for jsonify.
+
+ClaimsJSONProvider encodes with orjson when it is installed and falls
+back to the standard library otherwise. Both encoders produce the same
+output: sorted keys (sort_keys), HTTP dates for datetimes, str for
+Decimal/UUID, and non-ASCII text as UTF-8. Unlike Flask's default
+provider, ensure_ascii is False, because orjson cannot escape non-ASCII
+text; setting it back to True (or passing other dumps options) uses the
+standard library encoder.
+
+RawJSON wraps text that is already JSON (e.g. the json_valid() checked
+computers.specs column) so it is spliced into the response as is, instead
+of being decoded with json.loads only to be encoded again. raw_json still
+validates the text, so one corrupt stored value cannot break a response.
+"""
+import json
+import re
+import uuid
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson >= 3.9 splices fragments natively; older versions use placeholders
+_FRAGMENT = getattr(orjson, 'Fragment', None)
+
+
+class RawJSON:
+    """
+    Already-serialized JSON to embed verbatim in a response.
+
+    Args:
+        text: Valid JSON text (str or bytes)
+    """
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text.decode() if isinstance(text, bytes) else text
+
+    def __repr__(self):
+        return f'RawJSON({self.text!r})'
+
+
+def raw_json(value, empty='{}'):
+    """
+    Wrap a JSON column value for passthrough.
+
+    Args:
+        value: JSON text from the database, or None/empty
+        empty: JSON text used for missing or invalid values
+
+    Returns:
+        RawJSON
+    """
+    if not value:
+        return RawJSON(empty)
+    try:
+        # Parsing only validates; the text itself is what gets embedded
+        (orjson.loads if orjson is not None else json.loads)(value)
+    except ValueError:
+        return RawJSON(empty)
+    return RawJSON(value)
+
+
+class ClaimsJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with RawJSON support."""
+
+    # orjson always emits UTF-8; True switches to the standard library
+    ensure_ascii = False
+
+    # Unique per process, so no real string value can look like a placeholder
+    _placeholder = f'__raw_json_{uuid.uuid4().hex}_'
+    _placeholder_re = re.compile(f'"{_placeholder}(\\d+)"')
+
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string."""
+        if self._use_orjson() and not kwargs:
+            return self._orjson_dumps(obj, self.sort_keys).decode()
+        return self._stdlib_dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """
+        Serialize the given arguments as JSON and return a Response.
+
+        Same behaviour as DefaultJSONProvider.response, but the orjson
+        output bytes go straight into the response body.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if self.compact is False or (self.compact is None and self._app.debug):
+            indent = 2
+
+        if not self._use_orjson():
+            body = self._stdlib_dumps(obj, indent=indent) + '\n'
+        else:
+            body = self._orjson_dumps(obj, self.sort_keys, indent=indent) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _use_orjson(self):
+        return orjson is not None and not self.ensure_ascii
+
+    def _orjson_dumps(self, obj, sort_keys, indent=None):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        if _FRAGMENT is not None:
+            def default(o):
+                if isinstance(o, RawJSON):
+                    return _FRAGMENT(o.text)
+                return _default(o)
+            return orjson.dumps(obj, default=default, option=option)
+
+        fragments = []
+        encoded = orjson.dumps(obj, default=self._placeholder_default(fragments), option=option)
+        if not fragments:
+            return encoded
+        return self._splice(encoded.decode(), fragments).encode()
+
+    def _stdlib_dumps(self, obj, **kwargs):
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        fragments = []
+        kwargs['default'] = self._placeholder_default(fragments)
+        encoded = json.dumps(obj, **kwargs)
+        if not fragments:
+            return encoded
+        return self._splice(encoded, fragments)
+
+    def _placeholder_default(self, fragments):
+        """Encoder hook that stands RawJSON values in with numbered placeholders."""
+        def default(o):
+            if isinstance(o, RawJSON):
+                fragments.append(o.text)
+                return f'{self._placeholder}{len(fragments) - 1}'
+            return _default(o)
+        return default
+
+    def _splice(self, encoded, fragments):
+        return self._placeholder_re.sub(lambda match: fragments[int(match.group(1))], encoded)
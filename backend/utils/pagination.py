@@ -0,0 +1,222 @@
+"""
+List query utilities for CLAIMS backend.
+Keyset (cursor) pagination with whitelisted filters and sort keys.
+
+An endpoint declares a ListQuery once (columns, FROM clause, allowed
+filters and sort keys) and runs it against request.args:
+
+    ?limit=50&sort=-created_at&status=damaged&created_from=2025-01-01
+
+Pages are fetched with a keyset condition on (sort column, unique id)
+instead of OFFSET, so every page is an index range scan of `limit` rows
+regardless of table size. The response envelope is
+
+    {"items": [...], "next_cursor": "<opaque>" | null}
+
+and the next page is requested with ?cursor=<next_cursor> (filters and
+sort must stay the same; the cursor records the sort it was made for).
+Every request is paged: without limit, the query's default_limit applies,
+so no list endpoint returns an unbounded result.
+"""
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import date, datetime, time
+from flask import jsonify
+from services.database import execute_query
+from utils.validators import parse_list_param
+
+# Filter on a request arg: 'eq' accepts one or more values (IN), 'gte'/'lte' one value
+Filter = namedtuple('Filter', ['column', 'op', 'parse'])
+
+
+class ListQueryError(ValueError):
+    """Raised for invalid list parameters (filters, sort, limit, cursor)."""
+
+
+def date_value(value):
+    """Parse a YYYY-MM-DD or ISO datetime filter value."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ListQueryError(f'Invalid date: {value}')
+
+
+def end_date_value(value):
+    """Parse an inclusive upper date bound; a bare date covers the whole day."""
+    parsed = date_value(value)
+    if len(value) == 10:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed
+
+
+def int_value(value):
+    """Parse an integer filter value."""
+    try:
+        return int(value)
+    except ValueError:
+        raise ListQueryError(f'Invalid integer: {value}')
+
+
+def choice_value(*choices):
+    """Build a parser accepting only the given values."""
+    def parse(value):
+        if value not in choices:
+            raise ListQueryError(f"Invalid value '{value}'. Must be one of: {', '.join(choices)}")
+        return value
+    return parse
+
+
+def encode_cursor(sort, value, row_id):
+    """Encode the position after a row as an opaque cursor."""
+    if isinstance(value, (datetime, date)):
+        value = str(value)
+    raw = json.dumps([sort, value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor.
+
+    Returns:
+        tuple: (sort, value, row_id)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort, value, row_id = json.loads(raw)
+        return sort, value, row_id
+    except (binascii.Error, ValueError, TypeError):
+        raise ListQueryError('Invalid cursor')
+
+
+class ListQuery:
+    """
+    Keyset-paginated, filterable list query.
+
+    Args:
+        columns: Column expressions selected for each item
+        from_clause: FROM clause, including any joins
+        id_column: Unique column used as the ordering tiebreaker
+        sort_keys: Map of sort name -> column expression (should be indexed
+            together with id_column)
+        default_sort: Sort used when none is given, e.g. '-created_at'
+        filters: Map of request arg -> Filter
+        default_limit: Page size when limit is not given
+        max_limit: Largest accepted page size
+    """
+
+    def __init__(self, columns, from_clause, id_column, sort_keys, default_sort,
+                 filters=None, default_limit=50, max_limit=500):
+        self.columns = list(columns)
+        self.from_clause = from_clause
+        self.id_column = id_column
+        self.sort_keys = sort_keys
+        self.default_sort = default_sort
+        self.filters = filters or {}
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def _parse_sort(self, args):
+        sort = args.get('sort') or self.default_sort
+        name = sort.lstrip('-')
+        if name not in self.sort_keys:
+            raise ListQueryError(f"Invalid sort '{sort}'. Must be one of: {', '.join(sorted(self.sort_keys))}")
+        return sort, self.sort_keys[name], sort.startswith('-')
+
+    def _parse_limit(self, args):
+        limit = args.get('limit')
+        if limit is None:
+            return self.default_limit
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ListQueryError(f'Invalid limit: {limit}')
+        if not 1 <= limit <= self.max_limit:
+            raise ListQueryError(f'limit must be between 1 and {self.max_limit}')
+        return limit
+
+    def _filter_conditions(self, args):
+        conditions, params = [], []
+        for name, spec in self.filters.items():
+            if spec.op == 'eq':
+                values = [spec.parse(value) for value in parse_list_param(args, name)]
+                if values:
+                    conditions.append(f"{spec.column} IN ({', '.join(['%s'] * len(values))})")
+                    params.extend(values)
+            elif name in args:
+                conditions.append(f"{spec.column} {'>=' if spec.op == 'gte' else '<='} %s")
+                params.append(spec.parse(args[name]))
+        return conditions, params
+
+    def fetch(self, args, where=None, params=(), columns=None):
+        """
+        Run the query for a request's args.
+
+        Args:
+            args: Request args (filters, sort, limit, cursor)
+            where: Extra SQL condition the caller always applies (e.g. scoping)
+            params: Parameters for `where`
+            columns: Column expressions to select instead of the declared
+                ones (e.g. a sparse fieldset Selection's columns)
+
+        Returns:
+            tuple: (rows, next_cursor); rows hold only the selected columns
+
+        Raises:
+            ListQueryError: If a parameter is invalid
+        """
+        sort, sort_column, descending = self._parse_sort(args)
+        conditions, query_params = self._filter_conditions(args)
+        if where:
+            conditions.insert(0, where)
+            query_params[:0] = params
+
+        limit = self._parse_limit(args)
+        cursor = args.get('cursor')
+        if cursor:
+            cursor_sort, value, row_id = decode_cursor(cursor)
+            if cursor_sort != sort:
+                raise ListQueryError('Cursor does not match the requested sort')
+            op = '<' if descending else '>'
+            conditions.append(
+                f"({sort_column} {op} %s OR ({sort_column} = %s AND {self.id_column} {op} %s))"
+            )
+            query_params.extend([value, value, row_id])
+
+        direction = 'DESC' if descending else 'ASC'
+        query = (
+            f"SELECT {', '.join(columns or self.columns)}, {sort_column}, {self.id_column} "
+            f"FROM {self.from_clause}"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else '')
+            + f" ORDER BY {sort_column} {direction}, {self.id_column} {direction}"
+        )
+        # One extra row tells whether another page exists
+        query += ' LIMIT %s'
+        query_params.append(limit + 1)
+
+        rows = execute_query(query, tuple(query_params), fetch_all=True, commit=False)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, rows[-1][-2], rows[-1][-1])
+        return [row[:-2] for row in rows], next_cursor
+
+
+def list_response(items, next_cursor):
+    """
+    Build a list endpoint response.
+
+    Args:
+        items: Serialized items of one page
+        next_cursor: Cursor for the next page, or None on the last page
+
+    Returns:
+        tuple: (JSON response, status code)
+    """
+    return jsonify({
+        "items": items,
+        "next_cursor": next_cursor
+    }), 200
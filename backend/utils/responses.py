@@ -2,7 +2,9 @@
 Response utilities for CLAIMS backend.
 Provides standardized response formats for success, errors, and exceptions.
 """
-from flask import jsonify
+from itertools import chain
+from flask import current_app, jsonify, stream_with_context
+from services.connection_pool import PoolTimeoutError
 from services.logger import get_logger
 
 logger = get_logger(__name__)
@@ -69,6 +71,10 @@ def database_error_response(error, message="Database error occurred"):
     """
     logger.error(f'Database error: {str(error)}')
     
+    if isinstance(error, PoolTimeoutError):
+        # Pool exhausted: tell the client to back off instead of failing hard
+        return busy_response(error)
+    
     return jsonify({
         "success": False,
         "message": message,
@@ -76,6 +82,78 @@ def database_error_response(error, message="Database error occurred"):
     }), 500
 
 
+def busy_response(error, retry_after=1, message="Server is busy, please retry shortly"):
+    """
+    Return a 503 response asking the client to retry later.
+    
+    Args:
+        error: Exception that caused the rejection
+        retry_after: Seconds the client should wait (Retry-After header)
+        message: Error message
+        
+    Returns:
+        tuple: (JSON response, status code)
+    """
+    logger.warning(f'Service busy: {str(error)}')
+    
+    response = jsonify({
+        "success": False,
+        "message": message,
+        "error": str(error)
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 503
+
+
+def stream_json_array(batches, serialize=None):
+    """
+    Return a streaming response with a JSON array, encoded batch by batch.
+    
+    Peak memory is one batch of rows and items however long the array is.
+    The first batch is fetched before returning, so errors in running the
+    query still produce a normal error response; an error later on can only
+    cut the stream short.
+    
+    Args:
+        batches: Iterable of row lists (e.g. services.database.stream_query)
+        serialize: Function turning a row into a JSON-serializable item;
+            rows are encoded as they are if omitted
+        
+    Returns:
+        Response: Streaming application/json response
+    """
+    batches = iter(batches)
+    first = next(batches, None)
+    dumps = current_app.json.dumps
+    close = getattr(batches, 'close', None)
+    
+    def generate():
+        try:
+            yield '['
+            separator = ''
+            for batch in chain([first] if first else [], batches):
+                items = [serialize(row) for row in batch] if serialize else batch
+                if items:
+                    # Encode the batch as one array and drop its brackets
+                    yield separator + dumps(items)[1:-1]
+                    separator = ','
+            yield ']\n'
+        except Exception as e:
+            logger.error(f'Streaming response aborted: {str(e)}')
+            raise
+        finally:
+            # Still inside the request context, so a stream closed early
+            # (client gone) is counted in the request's query stats
+            if close is not None:
+                close()
+    
+    response = current_app.response_class(stream_with_context(generate()), mimetype=current_app.json.mimetype)
+    if close is not None:
+        # Release the query's connection even if the body is never iterated
+        response.call_on_close(close)
+    return response
+
+
 def validation_error_response(errors):
     """
     Return a validation error response.
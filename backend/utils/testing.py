@@ -0,0 +1,46 @@
+"""
+Test helpers for CLAIMS backend.
+Statement-count assertions built on services.query_stats.
+
+pytest.ini loads this module as a plugin (-p utils.testing), so tests
+can use the max_queries fixture directly:
+
+    def test_get_laboratory(client, fake_db, max_queries):
+        with max_queries(1):
+            client.get('/get_laboratory')
+"""
+from contextlib import contextmanager
+import pytest
+from services.query_stats import capture_queries
+
+
+class TooManyQueriesError(AssertionError):
+    """Raised when a block runs more statements than allowed."""
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """
+    Fail if the block runs more than `limit` statements.
+
+    Args:
+        limit: Maximum number of statements
+
+    Yields:
+        list: (normalized_sql, seconds, rows) tuples of the statements run
+
+    Raises:
+        TooManyQueriesError: If the limit is exceeded
+    """
+    with capture_queries() as captured:
+        yield captured
+
+    if len(captured) > limit:
+        statements = '\n'.join(f'  {i}. {sql}' for i, (sql, _, _) in enumerate(captured, 1))
+        raise TooManyQueriesError(f'{len(captured)} statements run, at most {limit} expected:\n{statements}')
+
+
+@pytest.fixture
+def max_queries():
+    """Fixture form of assert_max_queries."""
+    return assert_max_queries
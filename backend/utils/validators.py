@@ -131,3 +131,25 @@ def validate_file_extension(filename, allowed_extensions):
     
     ext = filename.rsplit('.', 1)[1].lower()
     return ext in allowed_extensions
+
+
+def parse_list_param(args, name):
+    """
+    Read a multi-valued query parameter.
+    
+    Accepts both repeated (?id=1&id=2) and comma-separated (?id=1,2) forms.
+    
+    Args:
+        args: Request args (MultiDict)
+        name: Parameter name
+        
+    Returns:
+        list: Unique non-empty values in request order
+    """
+    values = []
+    for raw in args.getlist(name):
+        for value in raw.split(','):
+            value = value.strip()
+            if value and value not in values:
+                values.append(value)
+    return values
@@ -28,11 +28,15 @@ CREATE TABLE `users` (
   `role` ENUM('admin', 'dean', 'itsd', 'technician') NOT NULL DEFAULT 'technician',
   `year` varchar(50) DEFAULT NULL,
   `password_hash` varchar(255) NOT NULL,
+  `must_change_credentials` tinyint(1) NOT NULL DEFAULT 0,
   `profile_image` varchar(255) DEFAULT '',
   `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
   `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
   PRIMARY KEY (`id`),
-  UNIQUE KEY `email` (`email`)
+  UNIQUE KEY `email` (`email`),
+  KEY `name` (`name`),
+  KEY `role_name` (`role`, `name`),
+  KEY `created_at` (`created_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 -- --------------------------------------------------------
@@ -45,6 +49,7 @@ CREATE TABLE `laboratories` (
   `id` int(11) NOT NULL AUTO_INCREMENT,
   `name` varchar(255) NOT NULL,
   `location` varchar(255) NOT NULL,
+  `pc_count` int(11) UNSIGNED NOT NULL DEFAULT 0, -- Maintained when LAB_PC_COUNT_COLUMN is enabled
   `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -86,7 +91,7 @@ CREATE TABLE `computer_parts` (
   `notes` text DEFAULT NULL,
   `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
   PRIMARY KEY (`id`),
-  KEY `computer_id` (`computer_id`),
+  KEY `computer_status` (`computer_id`, `status`),
   CONSTRAINT `fk_parts_computer` FOREIGN KEY (`computer_id`) REFERENCES `computers` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
@@ -105,12 +110,31 @@ CREATE TABLE `reports` (
   `submitted_by` varchar(255) DEFAULT 'System',
   `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
   PRIMARY KEY (`id`),
-  KEY `computer_id` (`computer_id`),
+  KEY `issue_lookup` (`computer_id`, `part_name`, `status`),
   CONSTRAINT `fk_reports_computer` FOREIGN KEY (`computer_id`) REFERENCES `computers` (`id`) ON DELETE SET NULL ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `open_issues`
+-- Latest pending report per computer/part, maintained by the backend
+--
+
+CREATE TABLE `open_issues` (
+  `computer_id` varchar(255) NOT NULL,
+  `part_name` varchar(255) NOT NULL,
+  `report_id` int(11) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`computer_id`, `part_name`),
+  KEY `created_report` (`created_at`, `report_id`),
+  KEY `report_id` (`report_id`),
+  CONSTRAINT `fk_open_issues_computer` FOREIGN KEY (`computer_id`) REFERENCES `computers` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT `fk_open_issues_report` FOREIGN KEY (`report_id`) REFERENCES `reports` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `technician_logs`
 --
@@ -124,10 +148,37 @@ CREATE TABLE `technician_logs` (
   `status_after` ENUM('operational', 'not_operational', 'damaged', 'missing') NOT NULL,
   `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
   PRIMARY KEY (`id`),
-  KEY `report_id` (`report_id`),
+  KEY `created_at` (`created_at`),
+  KEY `report_created` (`report_id`, `created_at`),
+  KEY `technician_created` (`technician_id`, `created_at`),
+  KEY `status_created` (`status_after`, `created_at`),
   CONSTRAINT `fk_logs_report` FOREIGN KEY (`report_id`) REFERENCES `reports` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `email_outbox`
+-- Emails queued by the API and delivered by the email worker
+--
+
+CREATE TABLE `email_outbox` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `subject` varchar(255) NOT NULL,
+  `recipients` text NOT NULL, -- JSON list
+  `template_name` varchar(255) NOT NULL,
+  `template_context` longtext NOT NULL, -- JSON
+  `status` ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `next_attempt_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `last_error` text DEFAULT NULL,
+  `created_by` varchar(255) DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `sent_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `due` (`status`, `next_attempt_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
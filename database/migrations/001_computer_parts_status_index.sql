@@ -0,0 +1,12 @@
+-- CLAIMS Migration 001
+-- Composite (computer_id, status) index on computer_parts for the filtered
+-- /get_computer_statuses lookups. It also serves the foreign key, so the
+-- single-column computer_id index it replaces is dropped.
+--
+-- Lab filters reach computer_parts through computers.lab_id, which is
+-- already indexed (InnoDB secondary indexes include the primary key, so
+-- that index covers the lab_id -> id lookup).
+
+ALTER TABLE `computer_parts`
+  ADD KEY `computer_status` (`computer_id`, `status`),
+  DROP KEY `computer_id`;
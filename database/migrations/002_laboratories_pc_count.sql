@@ -0,0 +1,13 @@
+-- CLAIMS Migration 002
+-- Denormalized computer count on laboratories, read by /get_laboratory and
+-- /labs-pc-count and kept up to date by the computer write paths when
+-- LAB_PC_COUNT_COLUMN is enabled.
+--
+-- The UPDATE below backfills the counts. Re-run it if the column was
+-- left unmaintained (LAB_PC_COUNT_COLUMN disabled) while computers changed.
+
+ALTER TABLE `laboratories`
+  ADD COLUMN `pc_count` int(11) UNSIGNED NOT NULL DEFAULT 0 AFTER `location`;
+
+UPDATE `laboratories` l
+SET l.`pc_count` = (SELECT COUNT(*) FROM `computers` c WHERE c.`lab_id` = l.`id`);
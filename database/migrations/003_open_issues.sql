@@ -0,0 +1,38 @@
+-- CLAIMS Migration 003
+-- open_issues: latest pending report per computer/part, read by
+-- /get_admin_computer_reports and maintained by the report write paths.
+-- The reports index replaces the single-column computer_id index and
+-- serves both the foreign key and the per-part refresh lookups.
+--
+-- Backfilled here; `flask --app wsgi rebuild-open-issues` recomputes it
+-- the same way at any time.
+
+ALTER TABLE `reports`
+  ADD KEY `issue_lookup` (`computer_id`, `part_name`, `status`),
+  DROP KEY `computer_id`;
+
+CREATE TABLE `open_issues` (
+  `computer_id` varchar(255) NOT NULL,
+  `part_name` varchar(255) NOT NULL,
+  `report_id` int(11) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`computer_id`, `part_name`),
+  KEY `created_at` (`created_at`),
+  KEY `report_id` (`report_id`),
+  CONSTRAINT `fk_open_issues_computer` FOREIGN KEY (`computer_id`) REFERENCES `computers` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT `fk_open_issues_report` FOREIGN KEY (`report_id`) REFERENCES `reports` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT INTO `open_issues` (`computer_id`, `part_name`, `report_id`, `created_at`)
+SELECT r.`computer_id`, r.`part_name`, r.`id`, r.`created_at`
+FROM `reports` r
+WHERE r.`status` = 'pending'
+  AND r.`computer_id` IS NOT NULL
+  AND r.`part_name` IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM `reports` n
+      WHERE n.`computer_id` = r.`computer_id`
+        AND n.`part_name` = r.`part_name`
+        AND n.`status` = 'pending'
+        AND (n.`created_at` > r.`created_at` OR (n.`created_at` = r.`created_at` AND n.`id` > r.`id`))
+  );
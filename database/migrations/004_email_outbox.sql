@@ -0,0 +1,19 @@
+-- CLAIMS Migration 004
+-- Transactional email outbox drained by backend/email_worker.py.
+
+CREATE TABLE `email_outbox` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `subject` varchar(255) NOT NULL,
+  `recipients` text NOT NULL, -- JSON list
+  `template_name` varchar(255) NOT NULL,
+  `template_context` longtext NOT NULL, -- JSON
+  `status` ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `next_attempt_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `last_error` text DEFAULT NULL,
+  `created_by` varchar(255) DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `sent_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `due` (`status`, `next_attempt_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
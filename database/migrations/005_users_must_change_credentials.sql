@@ -0,0 +1,10 @@
+-- CLAIMS Migration 005
+-- Persisted "must change credentials" flag for the default admin account,
+-- read by /check_default_credentials instead of re-hashing "changeme" on
+-- every admin page load.
+--
+-- The flag depends on the stored password, which SQL cannot check; after
+-- applying this migration run `flask --app wsgi backfill-credential-flags`.
+
+ALTER TABLE `users`
+  ADD COLUMN `must_change_credentials` tinyint(1) NOT NULL DEFAULT 0 AFTER `password_hash`;
@@ -0,0 +1,25 @@
+-- CLAIMS Migration 006
+-- Indexes for keyset pagination of the list endpoints (utils/pagination.py).
+-- Each page is read as a range on (sort column, id) after the filters, so
+-- every filter + sort combination gets a (filter, sort column) index.
+-- InnoDB appends the primary key to secondary indexes, which provides the
+-- id tiebreaker on users and technician_logs.
+--
+-- report_created also serves the fk_logs_report foreign key, so the
+-- single-column report_id index it replaces is dropped.
+
+ALTER TABLE `users`
+  ADD KEY `name` (`name`),
+  ADD KEY `role_name` (`role`, `name`),
+  ADD KEY `created_at` (`created_at`);
+
+ALTER TABLE `technician_logs`
+  ADD KEY `created_at` (`created_at`),
+  ADD KEY `report_created` (`report_id`, `created_at`),
+  ADD KEY `technician_created` (`technician_id`, `created_at`),
+  ADD KEY `status_created` (`status_after`, `created_at`),
+  DROP KEY `report_id`;
+
+ALTER TABLE `open_issues`
+  ADD KEY `created_report` (`created_at`, `report_id`),
+  DROP KEY `created_at`;
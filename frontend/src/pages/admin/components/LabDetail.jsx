@@ -207,7 +207,9 @@ export default function LabDetail({ lab, computers, back, addComputer }) {
   useEffect(() => {
     const fetchComputerStatuses = async () => {
       try {
-        const response = await api.get('/get_computer_statuses');
+        const response = await api.get('/get_computer_statuses', {
+          params: { lab_id: lab.lab_id }
+        });
         const data = response.data;
 
         const newStatuses = {};
@@ -236,7 +238,7 @@ export default function LabDetail({ lab, computers, back, addComputer }) {
     };
 
     fetchComputerStatuses();
-  }, []);
+  }, [lab.lab_id]);
 
   const partIcons = {
     monitor: FaDesktop,
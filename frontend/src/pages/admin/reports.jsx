@@ -4,7 +4,7 @@ import "bootstrap/dist/css/bootstrap.min.css";
 import { useNavigate } from "react-router-dom";
 import { FaPaperPlane } from "react-icons/fa";
 import { useAuth } from "../../context/AuthContext";
-import api from "../../utils/api";
+import api, { getAllPages } from "../../utils/api";
 import { toast } from "react-toastify";
 import "./components/labs.css";
 
@@ -39,9 +39,9 @@ export default function Reports() {
   // --- Fetch reports ---
   const fetchReports = async () => {
     try {
-      const response = await api.get('/get_admin_computer_reports');
+      const reports = await getAllPages('/get_admin_computer_reports');
       // Map backend keys to frontend structure
-      const mappedData = response.data.map(r => ({
+      const mappedData = reports.map(r => ({
         ...r,
         item: r.pc_name !== "Unknown" ? r.pc_name : (r.computer_id || "Unknown"),
         lab: r.lab_name,
@@ -128,7 +128,7 @@ export default function Reports() {
       });
 
       setEmailStatus("success");
-      toast.success('Report email sent successfully');
+      toast.success('Report email queued for sending');
       fetchReports();
     } catch (error) {
       console.error('Error sending email:', error);
@@ -3,7 +3,7 @@ import DataTable from "react-data-table-component";
 import { FaEdit, FaTrash, FaPlus, FaUserShield } from "react-icons/fa";
 import { Modal, Button, Form } from "react-bootstrap";
 import { toast } from "react-toastify";
-import api from "../../utils/api";
+import api, { getAllPages } from "../../utils/api";
 import { useAuth } from "../../context/AuthContext";
 
 export default function Users() {
@@ -28,8 +28,7 @@ export default function Users() {
     // Fetch users
     const fetchUsers = async () => {
         try {
-            const response = await api.get("/get_users");
-            setUsers(response.data);
+            setUsers(await getAllPages("/get_users"));
         } catch (error) {
             console.error("Error fetching users:", error);
             toast.error("Failed to load users");
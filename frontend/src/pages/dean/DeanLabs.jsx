@@ -210,7 +210,9 @@ function LabDetail({ lab, computers, back, addComputer }) {
   useEffect(() => {
     const fetchStatuses = async () => {
       try {
-        const response = await api.get('/get_computer_statuses');
+        const response = await api.get('/get_computer_statuses', {
+          params: { lab_id: lab.id }
+        });
         const newStatuses = {};
         response.data.forEach((row) => {
           newStatuses[row.com_id] = {
@@ -232,7 +234,7 @@ function LabDetail({ lab, computers, back, addComputer }) {
     };
 
     fetchStatuses();
-  }, []);
+  }, [lab.id]);
 
   useEffect(() => {
     const fetchOtherParts = async () => {
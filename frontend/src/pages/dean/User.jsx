@@ -11,7 +11,7 @@ import {
   Form,
 } from "react-bootstrap";
 import "bootstrap/dist/css/bootstrap.min.css";
-import api, { uploadFile } from "../../utils/api";
+import api, { uploadFile, getAllPages } from "../../utils/api";
 import { toast } from "react-toastify";
 import AddUserModal from "./AddUserModal";
 import "./dean.css";
@@ -29,8 +29,7 @@ export default function Users() {
   useEffect(() => {
     const fetchUsers = async () => {
       try {
-        const response = await api.get('/get_users');
-        setUsers(response.data);
+        setUsers(await getAllPages('/get_users'));
       } catch (error) {
         console.error('Error fetching users:', error);
         toast.error('Failed to load users');
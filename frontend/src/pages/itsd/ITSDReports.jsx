@@ -3,7 +3,7 @@ import DataTable from "react-data-table-component";
 import "bootstrap/dist/css/bootstrap.min.css";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../../context/AuthContext";
-import api from "../../utils/api";
+import { getAllPages } from "../../utils/api";
 import { toast } from "react-toastify";
 import "../admin/components/labs.css";
 
@@ -24,9 +24,9 @@ export default function ITSDReports() {
     // --- Fetch reports ---
     const fetchReports = async () => {
         try {
-            const response = await api.get('/get_admin_computer_reports');
+            const reports = await getAllPages('/get_admin_computer_reports');
             // Map backend keys to frontend structure
-            const mappedData = response.data.map(r => ({
+            const mappedData = reports.map(r => ({
                 ...r,
                 item: r.pc_name,
                 lab: r.lab_name,
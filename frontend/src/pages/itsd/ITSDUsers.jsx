@@ -9,7 +9,7 @@ import {
     Form,
 } from "react-bootstrap";
 import "bootstrap/dist/css/bootstrap.min.css";
-import api, { uploadFile } from "../../utils/api";
+import api, { uploadFile, getAllPages } from "../../utils/api";
 import { toast } from "react-toastify";
 import ITSDAddUserModal from "./ITSDAddUserModal";
 import "../dean/dean.css"; // Reuse dean styles
@@ -27,9 +27,9 @@ export default function ITSDUsers() {
     useEffect(() => {
         const fetchUsers = async () => {
             try {
-                const response = await api.get('/get_users');
+                const users = await getAllPages('/get_users', { role: 'technician' });
                 // Filter for technicians only
-                const technicians = response.data.filter(u => u.role === 'technician');
+                const technicians = users.filter(u => u.role === 'technician');
                 setUsers(technicians);
             } catch (error) {
                 console.error('Error fetching users:', error);
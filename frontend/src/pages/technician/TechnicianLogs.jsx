@@ -33,32 +33,46 @@ export default function TechnicianLogs() {
   }, [isAuthenticated, user, navigate]);
 
   // --- Fetch logs ---
+  // One page at a time (newest first); "Load more" follows next_cursor
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchLogs = async (cursor = null) => {
+    try {
+      const response = await api.get('/get_technician_logs', {
+        params: cursor ? { cursor } : {},
+      });
+      // Map backend keys to frontend structure
+      const mappedLogs = response.data.items.map(log => ({
+        fix_id: log.id,
+        report_id: log.report_id,
+        solution: log.action_taken,
+        technician_email: log.technician_name, // Assuming name/email is stored here
+        timestamp: log.created_at,
+        status: log.status_after,
+        issue_found: {
+          lab: log.lab_name,
+          PC_Number: log.pc_name,
+          notes: log.issue_description,
+          status: log.initial_status
+        },
+        sent: 0 // 'sent' column removed, default to 0 or handle differently
+      }));
+      setTechnicianLogs(prev => (cursor ? [...prev, ...mappedLogs] : mappedLogs));
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error fetching logs:', error);
+      toast.error('Failed to load technician logs');
+    }
+  };
+
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    await fetchLogs(nextCursor);
+    setLoadingMore(false);
+  };
+
   useEffect(() => {
-    const fetchLogs = async () => {
-      try {
-        const response = await api.get('/get_technician_logs');
-        // Map backend keys to frontend structure
-        const mappedLogs = response.data.map(log => ({
-          fix_id: log.id,
-          report_id: log.report_id,
-          solution: log.action_taken,
-          technician_email: log.technician_name, // Assuming name/email is stored here
-          timestamp: log.created_at,
-          status: log.status_after,
-          issue_found: {
-            lab: log.lab_name,
-            PC_Number: log.pc_name,
-            notes: log.issue_description,
-            status: log.initial_status
-          },
-          sent: 0 // 'sent' column removed, default to 0 or handle differently
-        }));
-        setTechnicianLogs(mappedLogs);
-      } catch (error) {
-        console.error('Error fetching logs:', error);
-        toast.error('Failed to load technician logs');
-      }
-    };
     fetchLogs();
   }, []);
 
@@ -112,7 +126,7 @@ export default function TechnicianLogs() {
         },
       });
 
-      toast.success("Logs email sent successfully!");
+      toast.success("Logs email queued for sending!");
     } catch (error) {
       console.error('Error sending email:', error);
       const errorMessage = error.response?.data?.message || 'Failed to send email';
@@ -205,6 +219,14 @@ export default function TechnicianLogs() {
         customStyles={customStyles}
       />
 
+      {nextCursor && (
+        <div className="text-center mt-3">
+          <button className="btn btn-outline-success" onClick={handleLoadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more logs"}
+          </button>
+        </div>
+      )}
+
       {/* Floating Send Button */}
       <button
         className="btn btn-success rounded-circle p-3"
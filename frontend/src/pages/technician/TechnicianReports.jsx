@@ -4,7 +4,7 @@ import "bootstrap/dist/css/bootstrap.min.css";
 import { useNavigate } from "react-router-dom";
 import { FaTimes, FaDesktop } from "react-icons/fa";
 import { useAuth } from "../../context/AuthContext";
-import api from "../../utils/api";
+import api, { getAllPages } from "../../utils/api";
 import { toast } from "react-toastify";
 
 export default function TechnicianAndQuickUpdate() {
@@ -36,9 +36,9 @@ export default function TechnicianAndQuickUpdate() {
 
   const loadReports = async () => {
     try {
-      const response = await api.get('/get_admin_computer_reports');
+      const reports = await getAllPages('/get_admin_computer_reports');
       // Map backend keys to frontend keys
-      const mappedData = response.data.map(r => ({
+      const mappedData = reports.map(r => ({
         ...r,
         item: r.pc_name,
         lab: r.lab_name,
@@ -176,4 +176,22 @@ export const uploadFile = (url, formData, method = 'POST', onUploadProgress) =>
   }
 };
 
+// Fetch every page of a paginated list endpoint
+// List endpoints answer { items, next_cursor }; each request is bounded by
+// `limit`, and the next page is requested with ?cursor=<next_cursor>
+export const getAllPages = async (url, params = {}, limit = 500) => {
+  const items = [];
+  let cursor = null;
+
+  do {
+    const response = await api.get(url, {
+      params: { ...params, limit, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+
+  return items;
+};
+
 export default api;